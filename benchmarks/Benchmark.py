@@ -0,0 +1,287 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest.mock
+from datetime import datetime
+
+from pyprint.ConsolePrinter import ConsolePrinter
+
+from benchmarks.SyntheticProject import (
+    DEFAULT_LANGUAGES, LANGUAGE_FILES, generate_project)
+from coala_quickstart.coala_quickstart import _get_arg_parser
+from coala_quickstart.Profiling import Profiler, get_peak_rss
+from coala_quickstart.generation.BearCatalog import BearCatalog
+from coala_quickstart.generation.Bears import (
+    filter_relevant_bears, get_non_optional_settings_bears,
+    remove_unusable_bears)
+from coala_quickstart.generation.FileGlobs import get_project_files
+from coala_quickstart.generation.InfoCollector import collect_required_info
+from coala_quickstart.generation.Project import get_used_languages
+from coala_quickstart.generation.Settings import generate_settings
+
+DEFAULT_SIZES = (1000, 10000, 100000, 1000000)
+
+RESULTS_VERSION = 1
+
+# The command line coala-quickstart is benchmarked with.
+QUICKSTART_ARGV = ['coala-quickstart', '--ci', '--no-cache']
+
+
+def run_stages(project_dir, catalog, jobs=1):
+    """
+    Runs the stages of coala-quickstart in non-interactive mode on the given
+    project, without writing the ``.coafile``.
+
+    :param project_dir: The project directory.
+    :param catalog:     The ``BearCatalog`` to select the bears from. It is
+                        loaded beforehand so the stages don't include the
+                        collection of the bears.
+    :param jobs:        The number of threads sniffing the files.
+    :return:            A dict mapping the name of every stage to its wall
+                        and CPU time.
+    """
+    # The files touched aren't counted, so the counting doesn't add to
+    # the times.
+    profiler = Profiler(count_files=False)
+    printer = ConsolePrinter()
+    arg_parser = _get_arg_parser()
+
+    with unittest.mock.patch.object(sys, 'argv', QUICKSTART_ARGV), \
+            contextlib.redirect_stdout(io.StringIO()):
+        with profiler.stage('get_project_files'):
+            project_index, ignore_globs = get_project_files(
+                None, printer, project_dir, None, True)
+
+        with profiler.stage('get_used_languages'):
+            used_languages = list(get_used_languages(project_index, jobs))
+
+        with profiler.stage('collect_info'):
+            extracted_info = collect_required_info(
+                catalog, [language for language, _ in used_languages],
+                project_dir, project_index)
+
+        with profiler.stage('filter_relevant_bears'):
+            relevant_bears = filter_relevant_bears(
+                used_languages, printer, arg_parser, extracted_info,
+                catalog=catalog)
+
+        with profiler.stage('get_non_optional_settings_bears'):
+            remove_unusable_bears(
+                relevant_bears,
+                get_non_optional_settings_bears(relevant_bears))
+
+        with profiler.stage('generate_settings'):
+            generate_settings(project_dir, project_index, ignore_globs,
+                              relevant_bears, extracted_info)
+
+    return {stage.name: {'wall_time': stage.wall_time,
+                         'cpu_time': stage.cpu_time}
+            for stage in profiler.stages}
+
+
+def benchmark_size(work_dir, files, catalog, repeat=1, jobs=1,
+                   **project_options):
+    """
+    Generates a synthetic project with the given number of files and times
+    the stages of coala-quickstart on it.
+
+    :param work_dir:        The directory to generate the project in.
+    :param files:           The number of source files of the project.
+    :param catalog:         The ``BearCatalog`` to select the bears from.
+    :param repeat:          The number of runs. The fastest wall and CPU
+                            time of every stage are kept.
+    :param jobs:            The number of threads sniffing the files.
+    :param project_options: Keyword arguments passed to
+                            ``generate_project``.
+    :return:                A dict with the description of the project, the
+                            time taken to generate it and the time of every
+                            stage.
+    """
+    project_dir = tempfile.mkdtemp(prefix='project-{}-'.format(files),
+                                   dir=work_dir)
+    try:
+        start = time.perf_counter()
+        project = generate_project(project_dir, files, **project_options)
+        generation_time = time.perf_counter() - start
+
+        stages = {}
+        for _ in range(repeat):
+            for name, times in run_stages(project_dir, catalog,
+                                          jobs).items():
+                best = stages.setdefault(name, times)
+                for key, value in times.items():
+                    best[key] = min(best[key], value)
+    finally:
+        shutil.rmtree(project_dir)
+
+    return {'files': files,
+            'project': project,
+            'generation_time': generation_time,
+            'stages': stages,
+            'total_wall_time': sum(times['wall_time']
+                                   for times in stages.values()),
+            'peak_rss': get_peak_rss()}
+
+
+def get_commit():
+    """
+    :return: The commit of the coala-quickstart checkout being benchmarked,
+             or ``None`` if it isn't a git checkout.
+    """
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL,
+            universal_newlines=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_results(old_results, new_results):
+    """
+    Compares the wall times of the stages of two benchmark runs.
+
+    >>> old = {'results': [{'files': 10, 'stages': {
+    ...     'collect_info': {'wall_time': 2.0}}}]}
+    >>> new = {'results': [{'files': 10, 'stages': {
+    ...     'collect_info': {'wall_time': 3.0}}}]}
+    >>> compare_results(old, new)
+    [(10, 'collect_info', 2.0, 3.0, 1.5)]
+
+    :param old_results: The results of the reference run, as written by
+                        ``main``.
+    :param new_results: The results of the compared run.
+    :return:            A list of tuples of the number of files, the stage,
+                        the old and new wall times and their ratio, for
+                        every stage run on a project size in both runs.
+    """
+    old_sizes = {result['files']: result for result in
+                 old_results['results']}
+    comparison = []
+    for new in new_results['results']:
+        old = old_sizes.get(new['files'])
+        if old is None:
+            continue
+        for name, times in new['stages'].items():
+            if name not in old['stages']:
+                continue
+            old_time = old['stages'][name]['wall_time']
+            new_time = times['wall_time']
+            ratio = new_time / old_time if old_time else None
+            comparison.append((new['files'], name, old_time, new_time, ratio))
+    return comparison
+
+
+def _get_arg_parser_benchmark():
+    arg_parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.Benchmark',
+        description='Times the stages of coala-quickstart on synthetic '
+                    'projects of growing sizes.')
+
+    arg_parser.add_argument(
+        '-s', '--sizes', nargs='+', type=int, default=list(DEFAULT_SIZES),
+        metavar='N', help='numbers of source files of the projects')
+
+    arg_parser.add_argument(
+        '--depth', type=int, default=3,
+        help='depth of the directories holding the source files')
+
+    arg_parser.add_argument(
+        '--languages', nargs='+', default=list(DEFAULT_LANGUAGES),
+        choices=sorted(LANGUAGE_FILES), metavar='LANGUAGE',
+        help='languages of the source files')
+
+    arg_parser.add_argument(
+        '--gitignores', type=int, default=10,
+        help='number of directories with a .gitignore file')
+
+    arg_parser.add_argument(
+        '--no-context-files', action='store_const', const=True,
+        help='do not generate .editorconfig, package.json, Gemfile and '
+             'Gruntfile.js files')
+
+    arg_parser.add_argument(
+        '-r', '--repeat', type=int, default=1,
+        help='number of runs per project, the fastest one is kept')
+
+    arg_parser.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help='number of threads sniffing the files')
+
+    arg_parser.add_argument(
+        '--work-dir', metavar='DIR',
+        help='directory to generate the projects in, defaults to the '
+             'temporary directory')
+
+    arg_parser.add_argument(
+        '-o', '--output', metavar='PATH',
+        help='file to write the results to as JSON')
+
+    arg_parser.add_argument(
+        '--compare', metavar='PATH',
+        help='results of an earlier run to compare the wall times with')
+
+    return arg_parser
+
+
+def main(argv=None):
+    args = _get_arg_parser_benchmark().parse_args(argv)
+    printer = ConsolePrinter()
+
+    with unittest.mock.patch.object(sys, 'argv', QUICKSTART_ARGV):
+        catalog = BearCatalog.load(_get_arg_parser(), use_cache=False)
+
+    project_options = {'depth': args.depth,
+                       'languages': tuple(args.languages),
+                       'gitignores': args.gitignores}
+    if args.no_context_files:
+        project_options.update(editorconfig=False, package_json=False,
+                               gemfile=False, gruntfile=False)
+
+    results = {'version': RESULTS_VERSION,
+               'commit': get_commit(),
+               'date': datetime.utcnow().isoformat(),
+               'python': platform.python_version(),
+               'platform': platform.platform(),
+               'jobs': args.jobs,
+               'results': []}
+
+    for files in args.sizes:
+        result = benchmark_size(args.work_dir, files, catalog, args.repeat,
+                                args.jobs, **project_options)
+        results['results'].append(result)
+        printer.print('{} files:'.format(files), color='green')
+        for name, times in result['stages'].items():
+            printer.print('    {:<34}{:>10.3f} s'.format(
+                name, times['wall_time']))
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+
+    if args.compare:
+        with open(args.compare) as old_output:
+            old_results = json.load(old_output)
+        printer.print('\nCompared with {}:'.format(
+            old_results.get('commit') or args.compare), color='green')
+        for files, name, old_time, new_time, ratio in compare_results(
+                old_results, results):
+            printer.print('{:>9} {:<34}{:>10.3f} s{:>10.3f} s{:>8}'.format(
+                files, name, old_time, new_time,
+                '{:.2f}x'.format(ratio) if ratio is not None else '-'),
+                color='red' if ratio is not None and ratio > 1.1 else None)
+
+    return results
+
+
+if __name__ == '__main__':
+    main()
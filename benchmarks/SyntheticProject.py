@@ -0,0 +1,179 @@
+import json
+import math
+import os
+import random
+
+# Language -> (extension, content of its files). Files without an extension
+# start with a hashbang so their language is only known after sniffing.
+LANGUAGE_FILES = {
+    'C': ('.c', 'int main(void)\n{\n    return 0;\n}\n'),
+    'CSS': ('.css', 'body {\n    margin: 0;\n}\n'),
+    'Java': ('.java', 'class Main {\n}\n'),
+    'JavaScript': ('.js', "'use strict';\nmodule.exports = {};\n"),
+    'Markdown': ('.md', '# Title\n\nSome text.\n'),
+    'Python': ('.py', 'def main():\n    return 0\n'),
+    'Ruby': ('.rb', 'def main\n  0\nend\n'),
+    'Shell': ('', '#!/bin/sh\nexit 0\n'),
+}
+
+DEFAULT_LANGUAGES = tuple(sorted(LANGUAGE_FILES))
+
+# Number of files generated in each directory of the project.
+FILES_PER_DIR = 50
+
+GITIGNORE = 'build/\n*.log\n'
+
+EDITORCONFIG = """[*]
+indent_style = space
+indent_size = 4
+end_of_line = lf
+insert_final_newline = true
+trim_trailing_whitespace = true
+"""
+
+PACKAGE_JSON = {
+    'name': 'synthetic-project',
+    'version': '1.0.0',
+    'dependencies': {'eslint': '~4', 'csslint': '~1', 'jshint': '~2'},
+}
+
+GEMFILE = """source 'https://rubygems.org'
+
+gem "reek"
+gem "rubocop"
+gem "scss_lint"
+"""
+
+GRUNTFILE = """'use strict';
+
+module.exports = function ( grunt ) {
+    grunt.loadNpmTasks( 'grunt-contrib-csslint' );
+    grunt.loadNpmTasks( 'grunt-contrib-jshint' );
+    grunt.initConfig( {
+        jshint: {
+            all: [
+                '*.js',
+                'src/**/*.js'
+            ]
+        },
+        csslint: {
+            all: [
+                'css/**/*.css'
+            ]
+        }
+    } );
+    grunt.registerTask( 'default', [ 'jshint', 'csslint' ] );
+};
+"""
+
+
+def get_directories(directory_count, depth):
+    """
+    Spreads the given number of directories over a tree of the given depth.
+
+    >>> get_directories(4, 2)
+    ['d0/d0', 'd0/d1', 'd1/d0', 'd1/d1']
+
+    :param directory_count: The number of leaf directories.
+    :param depth:           The number of path components of every leaf
+                            directory.
+    :return:                A list of relative directory paths.
+    """
+    branching = max(2, math.ceil(directory_count ** (1 / depth)))
+    directories = []
+    for index in range(directory_count):
+        components = []
+        for _ in range(depth):
+            index, digit = divmod(index, branching)
+            components.append('d{}'.format(digit))
+        directories.append('/'.join(reversed(components)))
+    return sorted(directories)
+
+
+def write_file(path, content):
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(content)
+
+
+def generate_project(project_dir,
+                     files=1000,
+                     depth=3,
+                     languages=DEFAULT_LANGUAGES,
+                     gitignores=10,
+                     editorconfig=True,
+                     package_json=True,
+                     gemfile=True,
+                     gruntfile=True,
+                     seed=0):
+    """
+    Generates a synthetic project to benchmark coala-quickstart with.
+
+    :param project_dir:  The directory to generate the project in.
+    :param files:        The number of source files, not counting the
+                         context files and the files ignored by the
+                         ``.gitignore`` files.
+    :param depth:        The depth of the directories holding the source
+                         files.
+    :param languages:    The names of the languages of the source files, as
+                         found in ``LANGUAGE_FILES``.
+    :param gitignores:   The number of directories with a ``.gitignore``
+                         file, including the project directory. Each of
+                         these directories also gets an ignored ``build``
+                         directory and an ignored log file.
+    :param editorconfig: Whether to generate an ``.editorconfig`` file.
+    :param package_json: Whether to generate a ``package.json`` file.
+    :param gemfile:      Whether to generate a ``Gemfile``.
+    :param gruntfile:    Whether to generate a ``Gruntfile.js`` file.
+    :param seed:         The seed choosing the language of every file, so
+                         the same arguments always generate the same
+                         project.
+    :return:             A dict describing the generated project.
+    """
+    rand = random.Random(seed)
+    directories = get_directories(max(1, math.ceil(files / FILES_PER_DIR)),
+                                  depth)
+    gitignore_dirs = [''] + directories[:max(0, gitignores - 1)]
+    language_counts = dict.fromkeys(languages, 0)
+
+    for index in range(files):
+        directory = os.path.join(project_dir,
+                                 directories[index // FILES_PER_DIR])
+        if index % FILES_PER_DIR == 0:
+            os.makedirs(directory, exist_ok=True)
+        language = rand.choice(languages)
+        extension, content = LANGUAGE_FILES[language]
+        write_file(os.path.join(directory, 'file{}{}'.format(index,
+                                                             extension)),
+                   content)
+        language_counts[language] += 1
+
+    ignored_files = 0
+    for directory in gitignore_dirs[:gitignores]:
+        directory = os.path.join(project_dir, directory)
+        os.makedirs(os.path.join(directory, 'build'), exist_ok=True)
+        write_file(os.path.join(directory, '.gitignore'), GITIGNORE)
+        write_file(os.path.join(directory, 'build', 'output.c'), '')
+        write_file(os.path.join(directory, 'debug.log'), '')
+        ignored_files += 2
+
+    context_files = []
+    if editorconfig:
+        context_files.append(('.editorconfig', EDITORCONFIG))
+    if package_json:
+        context_files.append(('package.json',
+                              json.dumps(PACKAGE_JSON, indent=2)))
+    if gemfile:
+        context_files.append(('Gemfile', GEMFILE))
+    if gruntfile:
+        context_files.append(('Gruntfile.js', GRUNTFILE))
+    for name, content in context_files:
+        write_file(os.path.join(project_dir, name), content)
+
+    return {'files': files,
+            'depth': depth,
+            'directories': len(directories),
+            'languages': language_counts,
+            'gitignores': min(gitignores, len(gitignore_dirs)),
+            'ignored_files': ignored_files,
+            'context_files': [name for name, _ in context_files],
+            'seed': seed}
@@ -0,0 +1,318 @@
+import argparse
+import json
+import os
+import sys
+import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_all_start_methods, get_context
+
+from pyprint.ConsolePrinter import ConsolePrinter
+
+from coala_quickstart.Session import QuickstartSession
+from coalib.parsing.Globbing import glob_escape
+
+SUMMARY_VERSION = 1
+
+# The session used by the workers. It is set by ``run_projects`` before the
+# workers are forked, so they share its bear catalog instead of loading it
+# again.
+_session = None
+
+# The ``ProjectIndex`` and the ignore globs of the subprojects handled by
+# ``run_monorepo``, by project directory. The workers use them instead of
+# scanning the subprojects again.
+_project_indexes = {}
+
+
+def read_repos_file(path):
+    """
+    Reads the project directories listed in a file, one per line. Empty
+    lines and lines starting with ``#`` are skipped.
+
+    :param path: The path of the file.
+    :return:     A list of the absolute paths of the project directories.
+    """
+    with open(path) as repos_file:
+        return [os.path.abspath(os.path.expanduser(line.strip()))
+                for line in repos_file
+                if line.strip() and not line.lstrip().startswith('#')]
+
+
+def quickstart_project(project_dir):
+    """
+    Generates the ``.coafile`` of a project with the session given to
+    ``run_projects``. A subproject given to ``run_monorepo`` isn't scanned
+    again. Nothing is printed.
+
+    :param project_dir: Full path of the project directory.
+    :return:            A dict with the project directory, the status of
+                        the generation, the error if it failed and the wall
+                        time of every stage.
+    """
+    result = {'project_dir': project_dir,
+              'status': 'generated',
+              'error': None,
+              'wall_time': None,
+              'stages': {}}
+    try:
+        if not os.path.isdir(project_dir):
+            raise FileNotFoundError(
+                'The project directory {} does not exist.'.format(
+                    project_dir))
+        project_index, ignore_globs = _project_indexes.get(
+            project_dir, (None, None))
+        timings = _session.generate(project_dir, project_index,
+                                    ignore_globs, write=True).timings
+        result['wall_time'] = timings['total']['wall_time']
+        result['stages'] = {stage['name']: stage['wall_time']
+                            for stage in timings['stages']}
+    except Exception as exception:
+        result['status'] = 'failed'
+        result['error'] = ''.join(traceback.format_exception_only(
+            type(exception), exception)).strip()
+    return result
+
+
+def run_projects(project_dirs, session, jobs, printer):
+    """
+    Generates the ``.coafile`` of every project with ``quickstart_project``
+    in ``jobs`` worker processes. The workers are forked after the bear
+    catalog of the session is loaded and share it. Where processes can't
+    be forked, the projects are handled one after the other in this
+    process.
+
+    :param project_dirs: A list of the full paths of the project
+                         directories.
+    :param session:      The ``QuickstartSession`` generating the settings.
+    :param jobs:         The number of worker processes.
+    :param printer:      A ``ConsolePrinter`` object used to report the
+                         progress.
+    :return:             The list of the results of ``quickstart_project``,
+                         in the order of ``project_dirs``.
+    """
+    global _session
+    _session = session
+    session.load_catalog()
+    results = [None] * len(project_dirs)
+    done = [0]
+
+    def report(index, result):
+        results[index] = result
+        done[0] += 1
+        printer.print('[{}/{}] {}: {}'.format(
+            done[0], len(project_dirs), result['project_dir'],
+            result['error'] or result['status']),
+            color='green' if result['status'] == 'generated' else 'red')
+
+    if jobs > 1 and 'fork' in get_all_start_methods():
+        # The context can only be chosen from Python 3.7 on, where it
+        # isn't the default on every platform.
+        executor_kwargs = ({'mp_context': get_context('fork')}
+                           if sys.version_info >= (3, 7) else {})
+        with ProcessPoolExecutor(jobs, **executor_kwargs) as executor:
+            futures = {executor.submit(quickstart_project, project_dir):
+                       index
+                       for index, project_dir in enumerate(project_dirs)}
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    result = future.result()
+                except Exception as exception:
+                    result = {'project_dir': project_dirs[index],
+                              'status': 'failed',
+                              'error': 'The worker process failed: '
+                                       '{}'.format(exception),
+                              'wall_time': None,
+                              'stages': {}}
+                report(index, result)
+    else:
+        for index, project_dir in enumerate(project_dirs):
+            report(index, quickstart_project(project_dir))
+
+    return results
+
+
+def get_session(args, catalog=None):
+    """
+    :param args:    The parsed arguments of coala-quickstart or of a batch
+                    run.
+    :param catalog: The ``BearCatalog`` to select the bears from, if it is
+                    already loaded.
+    :return:        A ``QuickstartSession`` with the matching options.
+    """
+    return QuickstartSession(
+        incomplete_sections=bool(args.incomplete_sections),
+        filter_by_capabilities=not args.no_filter_by_capabilities,
+        use_cache=not args.no_cache,
+        scan_cache=bool(args.cache),
+        rebuild_cache=bool(args.rebuild_cache),
+        catalog=catalog)
+
+
+def run_batch(project_dirs, args, printer):
+    """
+    Generates the ``.coafile`` of every project, loading the bear catalog
+    only once.
+
+    :param project_dirs: A list of the full paths of the project
+                         directories.
+    :param args:         The parsed arguments of the batch run.
+    :param printer:      A ``ConsolePrinter`` object used to report the
+                         progress.
+    :return:             A dict with the results of every project, in the
+                         order of ``project_dirs``, and their totals.
+    """
+    start = time.perf_counter()
+    session = get_session(args)
+    session.load_catalog()
+    catalog_time = time.perf_counter() - start
+
+    results = run_projects(project_dirs, session, args.jobs, printer)
+
+    return {'version': SUMMARY_VERSION,
+            'jobs': args.jobs,
+            'catalog_load_time': catalog_time,
+            'total_wall_time': time.perf_counter() - start,
+            'generated': sum(result['status'] == 'generated'
+                             for result in results),
+            'failed': sum(result['status'] == 'failed'
+                          for result in results),
+            'repos': results}
+
+
+def get_subproject_ignore_globs(ignore_globs, subproject_dir):
+    """
+    Keeps the ignore globs of a monorepo which apply to the files of a
+    subproject, so its coafile doesn't ignore paths outside of it. The
+    globs matching at any depth below a directory containing the
+    subproject, like ``<dir>/**/build``, are moved to the subproject
+    directory.
+
+    :param ignore_globs:   The absolute ignore glob expressions of the
+                           monorepo.
+    :param subproject_dir: Full path of the subproject directory.
+    :return:               A list of absolute glob expressions, without
+                           duplicates.
+    """
+    prefix = os.path.join(subproject_dir, '')
+    any_depth = os.path.join('', '**', '')
+    subproject_globs = OrderedDict()
+    for glob in ignore_globs:
+        if glob.startswith(prefix):
+            subproject_globs[glob] = None
+            continue
+        dir_name, separator, rest = glob.partition(any_depth)
+        if separator and prefix.startswith(os.path.join(dir_name, '')):
+            subproject_globs[os.path.join(subproject_dir, '**', rest)] = None
+    return list(subproject_globs)
+
+
+def run_monorepo(project_index, ignore_globs, catalog, args, printer):
+    """
+    Generates one ``.coafile`` per subproject of a monorepo. The languages,
+    the information and the bears of every subproject are found from its
+    own files only, and its coafile ignores the subprojects nested in it
+    and the paths ignored by the monorepo inside of it. The bears are
+    selected non-interactively.
+
+    :param project_index: The ``ProjectIndex`` of the monorepo. The
+                          hashbangs of its files should be sniffed
+                          already, so the workers don't sniff them again.
+    :param ignore_globs:  The ignore glob expressions of the monorepo.
+    :param catalog:       The ``BearCatalog`` to select the bears from.
+    :param args:          The parsed arguments of coala-quickstart.
+    :param printer:       A ``ConsolePrinter`` object used to report the
+                          progress.
+    :return:              The list of the results of
+                          ``quickstart_project``, one per subproject.
+    """
+    subprojects = project_index.split_subprojects()
+    for subproject in subprojects:
+        _project_indexes[subproject.project_dir] = (
+            subproject,
+            get_subproject_ignore_globs(ignore_globs or (),
+                                        subproject.project_dir) +
+            [os.path.join(glob_escape(subproject_dir), '**')
+             for subproject_dir in subproject.subproject_dirs])
+    try:
+        return run_projects(
+            [subproject.project_dir for subproject in subprojects],
+            get_session(args, catalog), args.jobs, printer)
+    finally:
+        _project_indexes.clear()
+
+
+def _get_batch_arg_parser():
+    arg_parser = argparse.ArgumentParser(
+        prog='coala-quickstart batch',
+        description='Generates the .coafile of many projects in '
+                    'non-interactive mode, loading the bears only once.')
+
+    arg_parser.add_argument(
+        '--repos-file', required=True, metavar='PATH',
+        help='file listing the project directories, one per line')
+
+    arg_parser.add_argument(
+        '-j', '--jobs', type=int, default=os.cpu_count() or 1, metavar='N',
+        help='number of worker processes, defaults to the number of CPUs')
+
+    arg_parser.add_argument(
+        '--summary', default='quickstart-summary.json', metavar='PATH',
+        help='file to write the status and timings of every project to as '
+             'JSON')
+
+    arg_parser.add_argument(
+        '--allow-incomplete-sections', action='store_const',
+        dest='incomplete_sections', const=True,
+        help='generate coafiles with only `bears` and `files` field in '
+             'sections')
+
+    arg_parser.add_argument(
+        '--no-filter-by-capabilities', action='store_const',
+        dest='no_filter_by_capabilities', const=True,
+        help='disable filtering of bears by their capabilties.')
+
+    arg_parser.add_argument(
+        '--cache', action='store_const', dest='cache', const=True,
+        help='read and write the caches of the project scans, so unchanged '
+             'directories are not listed again')
+
+    arg_parser.add_argument(
+        '--no-cache', action='store_const', dest='no_cache', const=True,
+        help='do not read or write the caches of the installed bears and '
+             'the information found in the project files, nor the ones '
+             'of the project scans even with --cache')
+
+    arg_parser.add_argument(
+        '--rebuild-cache', action='store_const', dest='rebuild_cache',
+        const=True,
+        help='ignore the cached project scans, bears and information and '
+             'replace them')
+
+    return arg_parser
+
+
+def main(argv=None):
+    """
+    Runs ``coala-quickstart batch``.
+
+    :param argv: The arguments following ``batch``, defaults to the ones
+                 given on the command line.
+    :return:     The summary of the run, as written to the summary file.
+    """
+    args = _get_batch_arg_parser().parse_args(argv)
+    printer = ConsolePrinter()
+    project_dirs = read_repos_file(args.repos_file)
+
+    summary = run_batch(project_dirs, args, printer)
+
+    with open(args.summary, 'w') as summary_file:
+        json.dump(summary, summary_file, indent=2)
+
+    printer.print('{} coafiles generated, {} failed. The summary was written '
+                  'to {}.'.format(summary['generated'], summary['failed'],
+                                  args.summary),
+                  color='red' if summary['failed'] else 'green')
+    return summary
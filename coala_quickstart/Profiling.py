@@ -0,0 +1,214 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows.
+    resource = None
+
+
+def get_peak_rss():
+    """
+    Returns the peak resident set size of the process so far in bytes, or
+    ``None`` if it can't be determined on this platform.
+    """
+    if resource is None:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is given in bytes on macOS and in kilobytes elsewhere.
+    return peak_rss if sys.platform == 'darwin' else peak_rss * 1024
+
+
+# The ``FileAccessCounter`` objects active in every thread.
+_local = threading.local()
+
+
+def _get_active_counters():
+    return getattr(_local, 'counters', [])
+
+
+def record_file_access(path):
+    """
+    Records that the given path was opened, listed or stat-ed in the
+    ``FileAccessCounter`` objects active in the current thread. The stages
+    call it wherever they touch a file, nothing is patched.
+
+    :param path: The path of the file or directory.
+    """
+    for counter in _get_active_counters():
+        counter.paths.add(os.fspath(path))
+
+
+def count_file_accesses(function):
+    """
+    Returns a function calling the given one with the
+    ``FileAccessCounter`` objects active in the current thread, so the
+    files touched by a stage in worker threads are counted too.
+    """
+    counters = list(_get_active_counters())
+    if not counters:
+        return function
+
+    def wrapper(*args, **kwargs):
+        previous = _get_active_counters()
+        _local.counters = previous + counters
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _local.counters = previous
+    return wrapper
+
+
+class FileAccessCounter:
+    """
+    Records the paths given to ``record_file_access`` by the thread which
+    entered it, while it is active. Counters entered in different threads
+    don't see each other's paths.
+    """
+
+    def __init__(self):
+        self.paths = set()
+
+    def __enter__(self):
+        _local.counters = _get_active_counters() + [self]
+        return self
+
+    def __exit__(self, *exc_info):
+        _local.counters = [counter for counter in _get_active_counters()
+                           if counter is not self]
+
+
+class StageProfile:
+    """
+    The resources used by a stage of the generation.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.wall_time = None
+        self.cpu_time = None
+        self.files_touched = None
+        self.peak_rss = None
+
+    def as_dict(self):
+        return {'name': self.name,
+                'wall_time': self.wall_time,
+                'cpu_time': self.cpu_time,
+                'files_touched': self.files_touched,
+                'peak_rss': self.peak_rss}
+
+
+class Profiler:
+    """
+    Measures the wall time, CPU time, number of files touched and peak RSS
+    of the stages of the generation. A disabled profiler measures nothing.
+
+    Stages may run concurrently in different threads. The files touched
+    by a stage are the ones recorded by the thread running it and by the
+    functions it wraps with ``count_file_accesses``, but the CPU time and
+    the peak RSS are measured for the whole process: the CPU time of
+    overlapping stages is counted in each of them. The peak RSS is the
+    peak of the process up to the end of the stage. The wall time includes
+    the time spent waiting for the user's input in interactive mode. Files
+    touched by child processes aren't counted.
+    """
+
+    def __init__(self, enabled=True, count_files=True):
+        """
+        :param enabled:     Whether to measure the stages.
+        :param count_files: Whether to count the files touched by the
+                            stages. Their number is ``None`` otherwise.
+        """
+        self.enabled = enabled
+        self.count_files = count_files
+        self.stages = []
+        self._start = None
+        self._end = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Measures the code run in the ``with`` block as the stage with the
+        given name.
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        profile = StageProfile(name)
+        wall_start = time.perf_counter()
+        with self._lock:
+            if self._start is None:
+                self._start = wall_start
+        cpu_start = time.process_time()
+        counter = FileAccessCounter() if self.count_files else None
+        try:
+            if counter is None:
+                yield profile
+            else:
+                with counter:
+                    yield profile
+        finally:
+            wall_end = time.perf_counter()
+            profile.wall_time = wall_end - wall_start
+            profile.cpu_time = time.process_time() - cpu_start
+            if counter is not None:
+                profile.files_touched = len(counter.paths)
+            profile.peak_rss = get_peak_rss()
+            with self._lock:
+                self._end = (wall_end if self._end is None
+                             else max(self._end, wall_end))
+                self.stages.append(profile)
+
+    def as_dict(self):
+        """
+        :return: A dict with the measures of every stage, in the order the
+                 stages ended, and their totals. The total wall time is the
+                 time from the start of the first stage to the end of the
+                 last one.
+        """
+        return {
+            'stages': [stage.as_dict() for stage in self.stages],
+            'total': {
+                'wall_time': (self._end - self._start
+                              if self.stages else 0),
+                'cpu_time': sum(stage.cpu_time for stage in self.stages),
+                'files_touched': (sum(stage.files_touched
+                                      for stage in self.stages)
+                                  if self.count_files else None),
+                'peak_rss': get_peak_rss(),
+            },
+        }
+
+    def print_report(self, printer):
+        """
+        Prints the measures of every stage as a table.
+
+        :param printer: A ``ConsolePrinter`` object used for console
+                        interactions.
+        """
+        printer.print('\nTime and resources used by each stage:')
+        printer.print('{:<32}{:>10}{:>10}{:>8}{:>16}'.format(
+            'Stage', 'Wall (s)', 'CPU (s)', 'Files', 'Peak RSS (MiB)'))
+        data = self.as_dict()
+        for stage in data['stages'] + [dict(data['total'], name='Total')]:
+            peak_rss = ('{:.1f}'.format(stage['peak_rss'] / 2 ** 20)
+                        if stage['peak_rss'] is not None else '-')
+            files_touched = (stage['files_touched']
+                             if stage['files_touched'] is not None else '-')
+            printer.print('{:<32}{:>10.3f}{:>10.3f}{:>8}{:>16}'.format(
+                stage['name'], stage['wall_time'], stage['cpu_time'],
+                files_touched, peak_rss), color='cyan')
+
+    def write_json(self, path):
+        """
+        Writes the measures of every stage to the given file as JSON.
+        """
+        with open(path, 'w') as json_file:
+            json.dump(self.as_dict(), json_file, indent=2)
@@ -0,0 +1,267 @@
+import argparse
+import os
+from collections import OrderedDict
+
+from pyprint.NullPrinter import NullPrinter
+
+from coala_quickstart.Profiling import Profiler
+from coala_quickstart.generation.BearCatalog import BearCatalog
+from coala_quickstart.generation.Bears import (
+    filter_relevant_bears, get_non_optional_settings_bears,
+    remove_unusable_bears)
+from coala_quickstart.generation.FileGlobs import get_project_files
+from coala_quickstart.generation.InfoCollector import collect_required_info
+from coala_quickstart.generation.Project import get_used_languages
+from coala_quickstart.generation.ScanCache import ScanCache
+from coala_quickstart.generation.Settings import (
+    generate_settings, write_coafile)
+from coala_quickstart.info_extraction.ExtractorResultCache import (
+    ExtractorResultCache, MemoryResultCache)
+
+
+class QuickstartResult:
+    """
+    The settings generated for a project by ``QuickstartSession.generate``.
+    """
+
+    def __init__(self, project_dir, languages, settings, ignore_globs,
+                 extracted_info, timings, coafile=None):
+        """
+        :param project_dir:    Full path of the project directory.
+        :param languages:      A list of tuples of the languages used in
+                               the project and their percentage of use,
+                               the most used first.
+        :param settings:       A dict with section name as key and a
+                               ``Section`` object as value.
+        :param ignore_globs:   The list of absolute ignore glob expressions.
+        :param extracted_info: The information found in the project files,
+                               as returned by ``collect_info``.
+        :param timings:        The measures of the stages, as returned by
+                               ``Profiler.as_dict``.
+        :param coafile:        The path of the written coafile, or ``None``
+                               if it wasn't written.
+        """
+        self.project_dir = project_dir
+        self.languages = languages
+        self.settings = settings
+        self.ignore_globs = ignore_globs
+        self.extracted_info = extracted_info
+        self.timings = timings
+        self.coafile = coafile
+
+    @property
+    def bears(self):
+        """
+        A dict with section name as key and the list of the names of the
+        bears of the section as value.
+        """
+        return OrderedDict((name, list(section['bears']))
+                           for name, section in self.settings.items())
+
+    def as_dict(self):
+        """
+        :return: The result as a dict which can be serialized to JSON. The
+                 extracted information is left out.
+        """
+        return {'project_dir': self.project_dir,
+                'languages': self.languages,
+                'bears': self.bears,
+                'settings': OrderedDict(
+                    (name, OrderedDict((key, str(setting)) for key, setting
+                                       in section.contents.items()))
+                    for name, section in self.settings.items()),
+                'ignore_globs': self.ignore_globs,
+                'timings': self.timings,
+                'coafile': self.coafile}
+
+
+class QuickstartSession:
+    """
+    Generates the settings of projects without reading the command line or
+    asking questions, e.g. from other tools:
+
+    >>> session = QuickstartSession(incomplete_sections=True)
+    >>> result = session.generate('path/to/project')  # doctest: +SKIP
+    >>> result.bears['all.python']  # doctest: +SKIP
+    ['PycodestyleBear', 'PyUnusedCodeBear']
+
+    A session keeps the bear catalog, the listings of the project
+    directories and the information found in the project files in memory,
+    so generating the settings of a project again only reads what changed.
+    The information found by the extractors running in child processes is
+    only kept in the on-disk cache.
+
+    The memory used stays bounded: only the listings of the
+    ``MAX_SCAN_CACHES`` project directories generated last and the
+    information of the ``MemoryResultCache.MAX_ENTRIES`` files read last
+    are kept. ``clear`` drops them all, e.g. between batches of projects.
+    """
+
+    # The number of project directories whose listings are kept in memory.
+    MAX_SCAN_CACHES = 16
+
+    def __init__(self,
+                 incomplete_sections=False,
+                 filter_by_capabilities=True,
+                 use_cache=True,
+                 scan_cache=False,
+                 rebuild_cache=False,
+                 jobs=1,
+                 cache_root=None,
+                 catalog=None,
+                 count_files=False):
+        """
+        :param incomplete_sections:    Whether to keep the bears whose
+                                       non-optional settings can't be
+                                       filled, without filling any
+                                       setting.
+        :param filter_by_capabilities: Whether to only keep the bears with
+                                       the default capabilities.
+        :param use_cache:              Whether to read and write the
+                                       on-disk caches of the bears and
+                                       the extracted information.
+        :param scan_cache:             Whether to read and write the
+                                       on-disk cache of the project
+                                       scans too. The listings are kept
+                                       in memory either way.
+        :param rebuild_cache:          Whether to ignore the contents of
+                                       the on-disk caches.
+        :param jobs:                   The number of threads reading the
+                                       files with unknown extensions.
+        :param cache_root:             The directory holding the on-disk
+                                       caches, defaults to
+                                       ``get_cache_root()``.
+        :param catalog:                The ``BearCatalog`` to select the
+                                       bears from, loaded on first use if
+                                       not given.
+        :param count_files:            Whether to count the files touched
+                                       by every stage in the timings, on
+                                       top of the wall and CPU time.
+        """
+        self.incomplete_sections = incomplete_sections
+        self.use_cache = use_cache
+        self.scan_cache = use_cache and scan_cache
+        self.rebuild_cache = rebuild_cache
+        self.jobs = jobs
+        self.cache_root = cache_root
+        self.count_files = count_files
+        # The options of filter_relevant_bears, as they would be parsed
+        # from the command line of a non-interactive run.
+        self.options = argparse.Namespace(
+            non_interactive=True,
+            green_mode=None,
+            incomplete_sections=incomplete_sections or None,
+            no_filter_by_capabilities=not filter_by_capabilities or None)
+        self._catalog = catalog
+        self._scan_caches = OrderedDict()
+        self._result_cache = MemoryResultCache(
+            ExtractorResultCache(cache_root, rebuild_cache)
+            if use_cache else None)
+
+    def load_catalog(self):
+        """
+        Loads the bear catalog the first time it is needed.
+
+        :return: The ``BearCatalog`` the bears are selected from.
+        """
+        if self._catalog is None:
+            self._catalog = BearCatalog.load(cache_root=self.cache_root,
+                                             use_cache=self.use_cache,
+                                             rebuild=self.rebuild_cache,
+                                             args=argparse.Namespace())
+        return self._catalog
+
+    def clear(self):
+        """
+        Drops the listings of the project directories and the information
+        found in the project files kept in memory. The bear catalog and the
+        on-disk caches are kept.
+        """
+        self._scan_caches.clear()
+        self._result_cache.clear()
+
+    def _get_scan_cache(self, project_dir):
+        if project_dir in self._scan_caches:
+            self._scan_caches.move_to_end(project_dir)
+        else:
+            # Without the on-disk cache, the listings are only kept in
+            # memory, starting from an empty cache. Only the ones used last
+            # are kept.
+            self._scan_caches[project_dir] = ScanCache(
+                project_dir, self.cache_root,
+                rebuild=self.rebuild_cache or not self.scan_cache)
+            while len(self._scan_caches) > self.MAX_SCAN_CACHES:
+                self._scan_caches.popitem(last=False)
+        return self._scan_caches[project_dir]
+
+    def generate(self, project_dir, project_index=None, ignore_globs=None,
+                 write=False):
+        """
+        Generates the settings of a project.
+
+        :param project_dir:   Path of the project directory.
+        :param project_index: The ``ProjectIndex`` of the project, if it is
+                              already built. The project directory is
+                              scanned if it isn't given.
+        :param ignore_globs:  The ignore glob expressions of the project,
+                              used with ``project_index``.
+        :param write:         Whether to write the settings to the
+                              ``.coafile`` of the project, or to
+                              ``.coafile.new`` if it exists.
+        :return:              A ``QuickstartResult`` object.
+        """
+        project_dir = os.path.abspath(project_dir)
+        printer = NullPrinter()
+        profiler = Profiler(count_files=self.count_files)
+        cache = None
+
+        with profiler.stage('load_bear_catalog'):
+            catalog = self.load_catalog()
+
+        if project_index is None:
+            cache = self._get_scan_cache(project_dir)
+            with profiler.stage('get_project_files'):
+                project_index, ignore_globs = get_project_files(
+                    None, printer, project_dir, None, True, cache)
+        ignore_globs = list(ignore_globs or ())
+
+        with profiler.stage('get_used_languages'):
+            used_languages = list(get_used_languages(project_index,
+                                                     self.jobs))
+            if cache is not None:
+                cache.store_hashbangs(project_index.files)
+                if self.scan_cache:
+                    cache.save()
+                else:
+                    cache.commit()
+
+        with profiler.stage('collect_info'):
+            extracted_info = collect_required_info(
+                catalog, [language for language, _ in used_languages],
+                project_dir, project_index,
+                result_cache=self._result_cache)
+
+        with profiler.stage('filter_relevant_bears'):
+            relevant_bears = filter_relevant_bears(
+                list(used_languages), printer, None, extracted_info,
+                catalog=catalog, args=self.options)
+
+        if not self.incomplete_sections:
+            with profiler.stage('get_non_optional_settings_bears'):
+                remove_unusable_bears(
+                    relevant_bears,
+                    get_non_optional_settings_bears(relevant_bears))
+
+        with profiler.stage('generate_settings'):
+            settings = generate_settings(
+                project_dir, project_index, ignore_globs, relevant_bears,
+                extracted_info, self.incomplete_sections)
+
+        coafile = None
+        if write:
+            with profiler.stage('write_coafile'):
+                coafile = write_coafile(printer, project_dir, settings)
+
+        return QuickstartResult(project_dir, used_languages, settings,
+                                ignore_globs, extracted_info,
+                                profiler.as_dict(), coafile)
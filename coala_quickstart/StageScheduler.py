@@ -0,0 +1,144 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from coala_quickstart.Profiling import Profiler
+
+
+class StageScheduler:
+    """
+    Runs the stages of the generation as a dependency graph. A stage added
+    with ``add`` starts in a background thread as soon as the stages it
+    requires are done, so independent stages overlap. A stage run with
+    ``run`` is executed in the calling thread, which is where the stages
+    asking the user questions must run.
+
+    Stages can be started speculatively and cancelled if their result
+    isn't needed after all.
+
+    >>> with StageScheduler() as scheduler:
+    ...     numbers = scheduler.add('numbers', range, 4)
+    ...     total = scheduler.add('total', sum, requires=('numbers',))
+    ...     scheduler.run('double', lambda total: 2 * total,
+    ...                   scheduler.result('total'))
+    12
+    """
+
+    def __init__(self, profiler=None, max_workers=4):
+        """
+        :param profiler:    A ``Profiler`` measuring the stages.
+        :param max_workers: The maximal number of stages running in the
+                            background at the same time.
+        """
+        self.profiler = profiler or Profiler(enabled=False)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._futures = {}
+        self._cancel_events = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def shutdown(self):
+        """
+        Cancels the stages which haven't started, tells the cancellable
+        stages to stop and waits for the running ones to end.
+        """
+        for name in self._futures:
+            self.cancel(name)
+        self._executor.shutdown(wait=True)
+
+    def cancel(self, name):
+        """
+        Cancels a stage added with ``add``. The stage doesn't start if it
+        didn't yet. A running cancellable stage is told to stop, other
+        running stages run to the end.
+
+        :param name: The name of the stage.
+        """
+        self._futures[name].cancel()
+        if name in self._cancel_events:
+            self._cancel_events[name].set()
+
+    def add(self, name, function, *args, requires=(), cancellable=False,
+            **kwargs):
+        """
+        Adds a stage running in the background.
+
+        :param name:        The name of the stage.
+        :param function:    The function run by the stage. It is called
+                            with the results of the required stages, in the
+                            order of ``requires``, followed by ``args`` and
+                            ``kwargs``.
+        :param requires:    The names of the stages which must be done
+                            before this one starts. If one of them fails,
+                            this stage fails with the same exception.
+        :param cancellable: Whether the function accepts a ``cancel_event``
+                            keyword argument, a ``threading.Event`` which is
+                            set when the stage is cancelled.
+        :return:            A ``Future`` holding the result of the stage.
+        """
+        if name in self._futures:
+            raise ValueError('The stage {} was already added.'.format(name))
+        if cancellable:
+            kwargs['cancel_event'] = self._cancel_events[name] = (
+                threading.Event())
+        dependencies = [self._futures[required] for required in requires]
+        future = Future()
+        self._futures[name] = future
+        pending = [len(dependencies)]
+
+        def run_stage():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                results = [dependency.result()
+                           for dependency in dependencies]
+                with self.profiler.stage(name):
+                    result = function(*results, *args, **kwargs)
+            except BaseException as exception:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+
+        def dependency_done(dependency):
+            with self._lock:
+                pending[0] -= 1
+                ready = pending[0] == 0
+            if ready:
+                try:
+                    self._executor.submit(run_stage)
+                except RuntimeError:
+                    # The scheduler was shut down in the meantime.
+                    future.cancel()
+
+        if dependencies:
+            for dependency in dependencies:
+                dependency.add_done_callback(dependency_done)
+        else:
+            self._executor.submit(run_stage)
+        return future
+
+    def run(self, name, function, *args, **kwargs):
+        """
+        Runs a stage in the calling thread.
+
+        :param name:     The name of the stage.
+        :param function: The function run by the stage, called with
+                         ``args`` and ``kwargs``.
+        :return:         The result of the stage.
+        """
+        with self.profiler.stage(name):
+            return function(*args, **kwargs)
+
+    def result(self, name):
+        """
+        Waits for a stage added with ``add`` to be done.
+
+        :param name: The name of the stage.
+        :return:     The result of the stage. The exception raised by the
+                     stage is raised again.
+        """
+        return self._futures[name].result()
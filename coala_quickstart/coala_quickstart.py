@@ -3,28 +3,14 @@ import logging
 import os
 import sys
 
-from pyprint.ConsolePrinter import ConsolePrinter
-
-from coala_utils.FilePathCompleter import FilePathCompleter
-from coala_utils.Question import ask_question
-
 from coala_quickstart import __version__
-from coala_quickstart.interaction.Logo import print_welcome_message
-from coala_quickstart.generation.InfoCollector import collect_info
-from coala_quickstart.generation.Project import (
-    valid_path, get_used_languages, print_used_languages)
-from coala_quickstart.generation.FileGlobs import get_project_files
-from coala_quickstart.Strings import PROJECT_DIR_HELP
-from coala_quickstart.generation.Bears import (
-    filter_relevant_bears,
-    print_relevant_bears,
-    get_non_optional_settings_bears,
-    remove_unusable_bears,
-)
-from coala_quickstart.generation.Settings import (
-    generate_settings, write_coafile)
-from coala_quickstart.generation.SettingsClass import (
-    collect_bear_settings)
+from coala_quickstart.Profiling import Profiler
+from coala_quickstart.StageScheduler import StageScheduler
+
+# Only the modules needed to parse the arguments are imported with this
+# module, so ``--help`` and ``--version`` answer right away. The stages of
+# ``main`` import coalib, the extractors and the console utilities on first
+# use.
 
 
 def _get_arg_parser():
@@ -34,6 +20,8 @@ coala-quickstart automatically creates a .coafile for use by coala.
     arg_parser = argparse.ArgumentParser(
         prog='coala-quickstart',
         description=description,
+        epilog='Run `coala-quickstart batch --help` to generate the '
+               '.coafile of many projects at once.',
         add_help=True
     )
 
@@ -64,13 +52,57 @@ coala-quickstart automatically creates a .coafile for use by coala.
              'don\'t generate any error in the project and match the coala'
              'configuration as closely as possible to your project.')
 
+    arg_parser.add_argument(
+        '--cache', action='store_const', dest='cache', const=True,
+        help='read and write the cache of the project scan, so unchanged '
+             'directories are not listed again')
+
+    arg_parser.add_argument(
+        '--no-cache', action='store_const', dest='no_cache', const=True,
+        help='do not read or write the caches of the installed bears and '
+             'the information found in the project files, nor the one '
+             'of the project scan even with --cache')
+
+    arg_parser.add_argument(
+        '--rebuild-cache', action='store_const', dest='rebuild_cache',
+        const=True,
+        help='ignore the cached project scan, bears and information and '
+             'replace them')
+
+    arg_parser.add_argument(
+        '--monorepo', action='store_const', const=True,
+        help='generate a .coafile in every subproject, i.e. every directory '
+             'with a package.json, Gemfile, setup.py or .editorconfig file, '
+             'with the bears selected non-interactively for its own files')
+
+    arg_parser.add_argument(
+        '-j', '--jobs', type=int, default=1, metavar='N',
+        help='number of threads reading the files with unknown extensions, '
+             'and of processes handling the subprojects in monorepo mode')
+
+    arg_parser.add_argument(
+        '--profile', action='store_const', const=True,
+        help='print the time and resources used by each stage')
+
+    arg_parser.add_argument(
+        '--profile-json', metavar='PATH',
+        help='write the time and resources used by each stage to PATH as '
+             'JSON')
+
     return arg_parser
 
 
 def main():
+    if sys.argv[1:2] == ['batch']:
+        from coala_quickstart.Batch import main as batch_main
+        batch_main(sys.argv[2:])
+        return
+
     arg_parser = _get_arg_parser()
     args = arg_parser.parse_args()
 
+    from pyprint.ConsolePrinter import ConsolePrinter
+
     logging.basicConfig(stream=sys.stdout)
     printer = ConsolePrinter()
     logging.getLogger(__name__)
@@ -82,49 +114,173 @@ def main():
         args.non_interactive = None
         args.no_filter_by_capabilities = None
         args.incomplete_sections = None
+    interactive = not args.non_interactive and not args.green_mode
+
+    profiler = Profiler(enabled=bool(args.profile or args.profile_json))
+
+    from coala_quickstart.generation.ScanCache import ScanCache
+    from coala_quickstart.info_extraction.ExtractorResultCache import (
+        ExtractorResultCache)
+
+    cache = None
+    result_cache = None
+    if not args.no_cache:
+        if args.cache:
+            cache = ScanCache(project_dir, rebuild=args.rebuild_cache)
+        result_cache = ExtractorResultCache(rebuild=args.rebuild_cache)
+
+    with StageScheduler(profiler) as scheduler:
+        # The bears are collected in the background while the user is
+        # asked questions and the project directory is scanned. The
+        # information is only extracted once the used languages are known,
+        # so it overlaps the rest of the collection of the bears, not the
+        # scan.
+        from coala_quickstart.generation.BearCatalog import BearCatalog
+        scheduler.add('load_bear_catalog', BearCatalog.load, arg_parser,
+                      use_cache=not args.no_cache,
+                      rebuild=args.rebuild_cache)
+
+        from coala_quickstart.generation.FileGlobs import (
+            build_project_index, get_project_files)
+        from coala_quickstart.generation.Project import (
+            valid_path, get_used_languages, print_used_languages)
+
+        project_index = None
+        if interactive:
+            from coala_utils.FilePathCompleter import FilePathCompleter
+            from coala_utils.Question import ask_question
+            from coala_quickstart.interaction.Logo import (
+                print_welcome_message)
+            from coala_quickstart.Strings import PROJECT_DIR_HELP
+
+            # The default project directory is scanned while the user is
+            # asked for the project directory, and the scan is thrown away
+            # if another one is given.
+            scheduler.add('prefetch_project_index', build_project_index,
+                          project_dir, cache, args.jobs, cancellable=True)
 
-    if not args.non_interactive and not args.green_mode:
-        fpc = FilePathCompleter()
-        fpc.activate()
-        print_welcome_message(printer)
-        printer.print(PROJECT_DIR_HELP)
-        project_dir = ask_question(
-            'What is your project directory?',
-            default=project_dir,
-            typecast=valid_path)
-        fpc.deactivate()
+            fpc = FilePathCompleter()
+            # The default seed directory of activate is the working
+            # directory when FilePathCompleter was first imported.
+            fpc.activate(seed_dir=os.getcwd())
+            print_welcome_message(printer)
+            printer.print(PROJECT_DIR_HELP)
+            default_project_dir = project_dir
+            project_dir = ask_question(
+                'What is your project directory?',
+                default=project_dir,
+                typecast=valid_path)
+            fpc.deactivate()
 
-    project_files, ignore_globs = get_project_files(
-        None,
-        printer,
-        project_dir,
-        fpc,
-        args.non_interactive)
+            if project_dir == default_project_dir:
+                project_index = scheduler.result('prefetch_project_index')
+            else:
+                scheduler.cancel('prefetch_project_index')
+                if cache is not None:
+                    cache = ScanCache(project_dir,
+                                      rebuild=args.rebuild_cache)
 
-    used_languages = list(get_used_languages(project_files))
-    print_used_languages(printer, used_languages)
+        project_index, ignore_globs = scheduler.run(
+            'get_project_files',
+            get_project_files,
+            None,
+            printer,
+            project_dir,
+            fpc,
+            args.non_interactive,
+            cache,
+            project_index)
 
-    extracted_information = collect_info(project_dir)
+        if args.monorepo:
+            from coala_quickstart.Batch import run_monorepo
 
-    relevant_bears = filter_relevant_bears(
-        used_languages, printer, arg_parser, extracted_information)
+            # The files are sniffed once for all the subprojects.
+            with profiler.stage('sniff_project_files'):
+                project_index.sniff(args.jobs)
+                if cache is not None:
+                    cache.store_hashbangs(project_index.files)
+                    cache.save()
+            results = scheduler.run(
+                'run_monorepo', run_monorepo, project_index, ignore_globs,
+                scheduler.result('load_bear_catalog'), args, printer)
+            printer.print('{} coafiles generated, {} failed.'.format(
+                sum(result['status'] == 'generated' for result in results),
+                sum(result['status'] == 'failed' for result in results)))
+            _report_profile(args, profiler, printer)
+            return
+
+        with profiler.stage('get_used_languages'):
+            used_languages = list(get_used_languages(project_index,
+                                                     args.jobs))
+            if cache is not None:
+                cache.store_hashbangs(project_index.files)
+                cache.save()
+        print_used_languages(printer, used_languages)
+
+        # Only the extractors finding information the bears of the used
+        # languages can use are run.
+        from coala_quickstart.generation.InfoCollector import (
+            collect_required_info)
+        scheduler.add('collect_info', collect_required_info,
+                      [language for language, _ in used_languages],
+                      project_dir, project_index,
+                      result_cache=result_cache,
+                      requires=('load_bear_catalog',))
+
+        if interactive:
+            # The bears are imported while the user selects them.
+            scheduler.add('import_bears', BearCatalog.import_bears,
+                          [language for language, _ in used_languages],
+                          requires=('load_bear_catalog',))
+
+        extracted_information = scheduler.result('collect_info')
+        bear_catalog = scheduler.result('load_bear_catalog')
+
+        from coala_quickstart.generation.Bears import (
+            filter_relevant_bears,
+            print_relevant_bears,
+            get_non_optional_settings_bears,
+            remove_unusable_bears,
+        )
+        relevant_bears = scheduler.run(
+            'filter_relevant_bears',
+            filter_relevant_bears,
+            used_languages, printer, arg_parser, extracted_information,
+            catalog=bear_catalog)
 
     if args.green_mode:
-        collect_bear_settings(relevant_bears)
+        from coala_quickstart.generation.SettingsClass import (
+            collect_bear_settings)
+        with profiler.stage('collect_bear_settings'):
+            collect_bear_settings(relevant_bears, bear_catalog)
 
     print_relevant_bears(printer, relevant_bears)
 
     if args.non_interactive and not args.incomplete_sections:
-        unusable_bears = get_non_optional_settings_bears(relevant_bears)
-        remove_unusable_bears(relevant_bears, unusable_bears)
+        with profiler.stage('get_non_optional_settings_bears'):
+            unusable_bears = get_non_optional_settings_bears(relevant_bears)
+            remove_unusable_bears(relevant_bears, unusable_bears)
         print_relevant_bears(printer, relevant_bears, 'usable')
 
-    settings = generate_settings(
-        project_dir,
-        project_files,
-        ignore_globs,
-        relevant_bears,
-        extracted_information,
-        args.incomplete_sections)
+    from coala_quickstart.generation.Settings import (
+        generate_settings, write_coafile)
+    with profiler.stage('generate_settings'):
+        settings = generate_settings(
+            project_dir,
+            project_index,
+            ignore_globs,
+            relevant_bears,
+            extracted_information,
+            args.incomplete_sections)
+
+    with profiler.stage('write_coafile'):
+        write_coafile(printer, project_dir, settings)
+
+    _report_profile(args, profiler, printer)
+
 
-    write_coafile(printer, project_dir, settings)
+def _report_profile(args, profiler, printer):
+    if args.profile:
+        profiler.print_report(printer)
+    if args.profile_json:
+        profiler.write_json(args.profile_json)
@@ -0,0 +1,495 @@
+import hashlib
+import inspect
+import json
+import logging
+import os
+import sys
+from collections import defaultdict, namedtuple
+
+import pkg_resources
+
+from coala_quickstart.Profiling import record_file_access
+from coala_quickstart.generation.LanguageDetection import (
+    get_canonical_language)
+from coala_quickstart.generation.ScanCache import get_cache_root
+from coala_quickstart.generation.SettingsClass import BearSettings
+from coalib.bearlib.abstractions.LinterClass import LinterClass
+from coalib.bears.BEAR_KIND import BEAR_KIND
+from coalib.collecting.Collectors import collect_bears
+from coalib.collecting.Importers import iimport_objects
+from coalib.parsing.Globbing import iglob
+from coalib.settings.ConfigurationGathering import load_configuration
+
+
+CATALOG_VERSION = 1
+
+# The metadata of the bears of the pinned coala-bears release, built by
+# ``python setup.py build_bear_snapshot`` and shipped with the package.
+SNAPSHOT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'bear_snapshot.json')
+
+# Written to the snapshot instead of the path of the Python interpreter
+# building it, for the bears running ``sys.executable``.
+SNAPSHOT_PYTHON = '<python>'
+
+CatalogRequirement = namedtuple('CatalogRequirement',
+                                ['package', 'version', 'type'])
+
+# The catalogs loaded by this process, by cache location, configuration
+# and versions.
+_loaded_catalogs = {}
+
+
+def get_distribution_version(name):
+    """
+    Returns the installed version of the given distribution or ``None`` if
+    it isn't installed.
+    """
+    try:
+        return pkg_resources.get_distribution(name).version
+    except pkg_resources.DistributionNotFound:
+        return None
+
+
+def get_bear_dirs(arg_parser=None, args=None):
+    """
+    Returns the globs of the bear directories coala would collect the bears
+    from.
+
+    :param arg_parser: ``argparse.ArgumentParser`` object containing the
+                       arguments passed.
+    :param args:       Pre-parsed arguments used instead of parsing the
+                       command line.
+    :return:           A list of glob expressions.
+    """
+    sections, _ = load_configuration(arg_list=None,
+                                     arg_parser=arg_parser,
+                                     args=args,
+                                     silent=True)
+    bear_dirs = []
+    for section in sections.values():
+        for bear_dir in section.bear_dirs():
+            if bear_dir not in bear_dirs:
+                bear_dirs.append(bear_dir)
+    return bear_dirs
+
+
+def get_coala_bears_dir():
+    """
+    Returns the directory of the bears of the installed coala-bears
+    distribution, found without importing them.
+
+    :return: The path of the directory or ``None`` if coala-bears isn't
+             installed.
+    """
+    try:
+        distribution = pkg_resources.get_distribution('coala-bears')
+    except pkg_resources.DistributionNotFound:
+        return None
+    for entry_point in distribution.get_entry_map('coalabears').values():
+        return os.path.join(distribution.location,
+                            *entry_point.module_name.split('.'))
+    return None
+
+
+def get_versions_key():
+    """
+    Returns the versions the catalogs depend on which are known without
+    looking at the bear files: the version of the catalog format and the
+    installed versions of coala and coala-bears.
+    """
+    return (CATALOG_VERSION,
+            get_distribution_version('coala'),
+            get_distribution_version('coala-bears'))
+
+
+def _get_configuration_key(args):
+    # The bear directories depend on the command line and on the coafiles
+    # found from the working directory, unless the arguments are given.
+    if args is None:
+        return os.getcwd(), tuple(sys.argv)
+    return repr(sorted(vars(args).items()))
+
+
+def get_catalog_key(bear_dirs):
+    """
+    Computes a key which changes whenever coala or coala-bears are upgraded
+    or a bear is added, removed or modified in the given bear directories.
+
+    :param bear_dirs: A list of glob expressions of bear directories.
+    :return:          A hexadecimal string.
+    """
+    stamps = []
+    for bear_dir in bear_dirs:
+        for path in iglob(bear_dir):
+            if os.path.isdir(path) or path.endswith('.py'):
+                record_file_access(path)
+                try:
+                    stamps.append((path, os.stat(path).st_mtime))
+                except OSError:
+                    continue
+    data = json.dumps(list(get_versions_key()) + [sorted(stamps)])
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+class CatalogBear:
+    """
+    The metadata of a bear as recorded in a ``BearCatalog``. It provides
+    the attributes of bear classes needed to select bears, while the bear
+    class itself is only imported by ``load``.
+    """
+
+    def __init__(self, record):
+        """
+        :param record: A dict as created by ``CatalogBear.create_record``.
+        """
+        self.name = record['name']
+        self.source = record['source']
+        self.LANGUAGES = set(record['languages'])
+        self.CAN_DETECT = set(record['can_detect'])
+        self.CAN_FIX = set(record['can_fix'])
+        self.REQUIREMENTS = tuple(CatalogRequirement(**requirement)
+                                  for requirement in record['requirements'])
+        self.bear_deps = tuple(record['bear_deps'])
+        self.non_optional_settings = dict(record['non_optional_settings'])
+        self.executable = record['executable']
+        self.settings = record['settings']
+        self.record = record
+        self._bear_class = None
+
+    @staticmethod
+    def create_record(bear):
+        """
+        Extracts the metadata of the given bear class.
+
+        :param bear: A bear class.
+        :return:     A dict which can be serialized to JSON.
+        """
+        executable = None
+        if issubclass(bear, LinterClass):
+            executable = bear.get_executable()
+
+        try:
+            bear_settings = BearSettings(bear)
+        except Exception:
+            # The settings are then found from the bear class on demand.
+            settings = None
+        else:
+            settings = {
+                kind: [setting_types.settings_bool,
+                       setting_types.settings_others]
+                for kind, setting_types in (
+                    ('non_optional', bear_settings.non_optional_settings),
+                    ('optional', bear_settings.optional_settings))}
+
+        return {
+            'name': bear.name,
+            'source': inspect.getfile(bear),
+            'languages': sorted(bear.LANGUAGES),
+            'can_detect': sorted(bear.CAN_DETECT),
+            'can_fix': sorted(bear.CAN_FIX),
+            'requirements': [
+                {'package': requirement.package,
+                 'version': getattr(requirement, 'version', ''),
+                 'type': getattr(requirement, 'type', None)}
+                for requirement in bear.REQUIREMENTS],
+            'bear_deps': sorted(dep.name for dep in bear.BEAR_DEPS),
+            'non_optional_settings': [
+                [name, value[0]]
+                for name, value in bear.get_non_optional_settings().items()],
+            'executable': executable,
+            'settings': settings,
+        }
+
+    def load(self):
+        """
+        Imports the bear class.
+
+        :return: The bear class, the same object coala collects.
+        """
+        if self._bear_class is None:
+            for bear_class in iimport_objects(self.source,
+                                              names=self.name,
+                                              attributes='kind',
+                                              local=True):
+                self._bear_class = bear_class
+                break
+            else:
+                raise ImportError('Unable to import {} from {}'.format(
+                    self.name, self.source))
+        return self._bear_class
+
+    def check_prerequisites(self):
+        return self.load().check_prerequisites()
+
+    def __repr__(self):
+        return '<{} {!r}>'.format(self.__class__.__name__, self.name)
+
+
+class BearCatalog:
+    """
+    The metadata of all the installed bears, stored under
+    ``~/.cache/coala-quickstart`` so the bears don't have to be imported
+    on every run.
+
+    The bears are indexed by the lower case names of their languages and
+    of the canonical names of these languages, e.g. a bear for ``bash`` is
+    found for ``Shell`` too. Finding the bears of a language is a
+    dictionary lookup.
+    """
+
+    def __init__(self, records=()):
+        """
+        :param records: An iterable of dicts as created by
+                        ``CatalogBear.create_record``.
+        """
+        self.bears = {}
+        for record in records:
+            if record['name'] not in self.bears:
+                self.bears[record['name']] = CatalogBear(record)
+
+        bears_by_language = defaultdict(set)
+        for bear in self.bears.values():
+            for language in bear.LANGUAGES:
+                bears_by_language[language.lower()].add(bear)
+                canonical_language = get_canonical_language(language)
+                if canonical_language:
+                    bears_by_language[canonical_language.lower()].add(bear)
+        self._bears_by_language = {
+            language: frozenset(bears)
+            for language, bears in bears_by_language.items()}
+
+    @classmethod
+    def load(cls,
+             arg_parser=None,
+             cache_root=None,
+             use_cache=True,
+             rebuild=False,
+             args=None):
+        """
+        Loads the catalog of the bears coala would collect. The bears are
+        collected at most once per process: a catalog loaded before with
+        the same configuration and versions of coala and coala-bears is
+        returned without looking at the bear files. Otherwise the snapshot
+        shipped with the package is used if the bears come from the
+        coala-bears release it was built from, and the bears are only
+        collected if the catalog isn't cached yet or is outdated.
+
+        :param arg_parser: ``argparse.ArgumentParser`` object containing the
+                           arguments passed.
+        :param cache_root: The directory holding the catalog, defaults to
+                           ``get_cache_root()``.
+        :param use_cache:  Whether to read and write the cached catalog.
+        :param rebuild:    Whether to ignore the cached catalog.
+        :param args:       Pre-parsed arguments used instead of parsing the
+                           command line with ``arg_parser``.
+        :return:           A ``BearCatalog`` object.
+        """
+        memo_key = (cache_root, use_cache,
+                    _get_configuration_key(args),
+                    get_versions_key())
+        if not rebuild and memo_key in _loaded_catalogs:
+            return _loaded_catalogs[memo_key]
+
+        bear_dirs = get_bear_dirs(arg_parser, args)
+        catalog = None
+        if not rebuild:
+            catalog = cls.load_snapshot(bear_dirs)
+            if catalog is not None:
+                _loaded_catalogs[memo_key] = catalog
+                return catalog
+
+        # The bear files are only stat-ed when neither the catalogs loaded
+        # before nor the snapshot match.
+        key = get_catalog_key(bear_dirs)
+        path = None
+        if use_cache:
+            path = os.path.join(
+                cache_root or get_cache_root(),
+                'bears-' + hashlib.sha1(
+                    json.dumps(bear_dirs).encode('utf-8')).hexdigest())
+
+        if use_cache and not rebuild:
+            record_file_access(path)
+            try:
+                with open(path, 'r') as catalog_file:
+                    data = json.load(catalog_file)
+                if data['key'] == key:
+                    catalog = cls(data['bears'])
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+
+        if catalog is None:
+            catalog = cls.collect(bear_dirs)
+            if use_cache:
+                catalog.save(path, key)
+
+        _loaded_catalogs[memo_key] = catalog
+        return catalog
+
+    @classmethod
+    def collect(cls, bear_dirs):
+        """
+        Creates a catalog by importing all the bears.
+
+        :param bear_dirs: A list of glob expressions of bear directories.
+        :return:          A ``BearCatalog`` object.
+        """
+        local_bears, global_bears = collect_bears(
+            bear_dirs, ['**'], [BEAR_KIND.LOCAL, BEAR_KIND.GLOBAL],
+            warn_if_unused_glob=False)
+        catalog = cls(CatalogBear.create_record(bear)
+                      for bear in local_bears + global_bears)
+        for bear in local_bears + global_bears:
+            catalog_bear = catalog.bears[bear.name]
+            if catalog_bear._bear_class is None:
+                catalog_bear._bear_class = bear
+        return catalog
+
+    @classmethod
+    def load_snapshot(cls, bear_dirs, path=None):
+        """
+        Loads the catalog from a snapshot written by ``save_snapshot``,
+        without importing any bear. The snapshot is only used if the bears
+        are collected from the coala-bears directory alone, and the
+        installed coala-bears has the version the snapshot was built from.
+        The bear files aren't looked at, so bears changed in a development
+        install of coala-bears are only collected with ``rebuild``.
+
+        :param bear_dirs: A list of glob expressions of bear directories.
+        :param path:      Path of the snapshot file, defaults to
+                          ``SNAPSHOT_PATH``.
+        :return:          A ``BearCatalog`` object, or ``None`` if the
+                          snapshot doesn't match the installed bears.
+        """
+        bears_dir = get_coala_bears_dir()
+        if bears_dir is None or [os.path.normcase(bear_dir)
+                                 for bear_dir in bear_dirs] != [
+                os.path.normcase(os.path.join(bears_dir, '**'))]:
+            return None
+
+        record_file_access(path or SNAPSHOT_PATH)
+        try:
+            with open(path or SNAPSHOT_PATH, 'r') as snapshot_file:
+                data = json.load(snapshot_file)
+            if (data['version'] != CATALOG_VERSION or
+                    data['coala_bears'] !=
+                    get_distribution_version('coala-bears')):
+                return None
+            records = data['bears']
+            for record in records:
+                record['source'] = os.path.join(
+                    bears_dir, *record['source'].split('/'))
+                if record['executable'] == SNAPSHOT_PYTHON:
+                    record['executable'] = sys.executable
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+        return cls(records)
+
+    @classmethod
+    def save_snapshot(cls, path=None, bears_dir=None):
+        """
+        Collects the bears of the installed coala-bears and writes their
+        metadata to a snapshot which can be shipped with the package. The
+        paths of the bears are written relative to their directory.
+
+        :param path:      Path of the snapshot file, defaults to
+                          ``SNAPSHOT_PATH``.
+        :param bears_dir: The directory of the bears, defaults to the one of
+                          the installed coala-bears.
+        :return:          The ``BearCatalog`` written.
+        """
+        bears_dir = bears_dir or get_coala_bears_dir()
+        if bears_dir is None:
+            raise ValueError('coala-bears is not installed.')
+
+        catalog = cls.collect([os.path.join(bears_dir, '**')])
+        records = []
+        for bear in catalog:
+            record = dict(bear.record)
+            record['source'] = os.path.relpath(
+                record['source'], bears_dir).replace(os.sep, '/')
+            if record['executable'] == sys.executable:
+                record['executable'] = SNAPSHOT_PYTHON
+            records.append(record)
+
+        data = {'version': CATALOG_VERSION,
+                'coala_bears': get_distribution_version('coala-bears'),
+                'bears': sorted(records, key=lambda record: record['name'])}
+        with open(path or SNAPSHOT_PATH, 'w') as snapshot_file:
+            json.dump(data, snapshot_file, indent=1, sort_keys=True)
+        return catalog
+
+    def save(self, path, key):
+        """
+        Writes the catalog to disk. Failures to write are only logged.
+
+        :param path: Path of the catalog file.
+        :param key:  The key as returned by ``get_catalog_key``.
+        """
+        data = {'key': key,
+                'bears': [bear.record for bear in self.bears.values()]}
+        temp_path = path + '.tmp'
+        record_file_access(path)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(temp_path, 'w') as catalog_file:
+                json.dump(data, catalog_file, separators=(',', ':'))
+            os.replace(temp_path, path)
+        except OSError:
+            logging.warning('Unable to write the bear catalog {}'.format(path))
+
+    def get_language_bears(self, language):
+        """
+        Returns the bears which list the given language in their
+        ``LANGUAGES``.
+
+        :param language: A language name, case insensitive. ``All`` gives
+                         the language independent bears.
+        :return:         A frozenset of ``CatalogBear`` objects.
+        """
+        return self._bears_by_language.get(language.lower(), frozenset())
+
+    def get_bears(self, languages):
+        """
+        Returns the bears supporting any of the given languages or all
+        languages, like ``coalib``'s ``get_filtered_bears``.
+
+        :param languages: A list of language names.
+        :return:          A set of ``CatalogBear`` objects.
+        """
+        bears = set(self.get_language_bears('All'))
+        for language in languages:
+            bears.update(self.get_language_bears(language))
+        return bears
+
+    def import_bears(self, languages):
+        """
+        Imports the classes of the bears supporting any of the given
+        languages or all languages, so they are ready when the bears the
+        user selected are loaded.
+
+        :param languages: A list of language names.
+        :return:          The number of bears imported.
+        """
+        imported = 0
+        for bear in self.get_bears(languages):
+            try:
+                bear.load()
+            except ImportError:
+                continue
+            imported += 1
+        return imported
+
+    def __getitem__(self, name):
+        return self.bears[name]
+
+    def __contains__(self, name):
+        return name in self.bears
+
+    def __iter__(self):
+        return iter(self.bears.values())
+
+    def __len__(self):
+        return len(self.bears)
@@ -1,4 +1,5 @@
 import copy
+import logging
 import random
 import re
 from collections import defaultdict
@@ -7,9 +8,9 @@ from collections import defaultdict
 from coala_quickstart.Constants import (
     IMPORTANT_BEAR_LIST, ALL_CAPABILITIES, DEFAULT_CAPABILTIES)
 from coala_quickstart.Strings import BEAR_HELP
+from coala_quickstart.generation.BearCatalog import BearCatalog, CatalogBear
 from coala_quickstart.generation.SettingsFilling import is_autofill_possible
 from coalib.bearlib.abstractions.LinterClass import LinterClass
-from coalib.settings.ConfigurationGathering import get_filtered_bears
 from coalib.misc.DictUtilities import inverse_dicts
 
 
@@ -17,7 +18,9 @@ def filter_relevant_bears(used_languages,
                           printer,
                           arg_parser,
                           extracted_info,
-                          log_printer=None):
+                          log_printer=None,
+                          catalog=None,
+                          args=None):
     """
     From the bear dict, filter the bears per relevant language.
 
@@ -32,40 +35,42 @@ def filter_relevant_bears(used_languages,
         passed.
     :param extracted_info:
         list of information extracted from ``InfoExtractor`` classes.
+    :param catalog:
+        The ``BearCatalog`` to select the bears from, loaded from the
+        cache if not given. Only the selected bears are imported.
+    :param args:
+        The options of coala-quickstart, as parsed by ``arg_parser``. The
+        command line is parsed with ``arg_parser`` if not given.
     :return:
         A dict with language name as key and bear classes as value.
     """
-    args = arg_parser.parse_args() if arg_parser else None
+    if args is None:
+        args = arg_parser.parse_args() if arg_parser else None
     used_languages.append(('All', 100))
 
-    bears_by_lang = {
-        lang: set(inverse_dicts(*get_filtered_bears([lang],
-                                                    log_printer,
-                                                    arg_parser,
-                                                    silent=True)).keys())
-        for lang, _ in used_languages
-    }
+    if catalog is None:
+        catalog = BearCatalog.load(arg_parser)
 
-    # Each language would also have the language independent bears. We remove
-    # those and put them in the "All" category.
-    all_lang_bears = bears_by_lang['All']
-    bears_by_lang = {lang: bears_by_lang[lang] - bears_by_lang['All']
+    # The language independent bears are put in the "All" category only.
+    all_lang_bears = catalog.get_language_bears('All')
+    bears_by_lang = {lang: set(catalog.get_language_bears(lang) -
+                               all_lang_bears)
                      for lang, _ in used_languages}
-    bears_by_lang['All'] = all_lang_bears
+    bears_by_lang['All'] = set(all_lang_bears)
 
     selected_bears = {}
     candidate_bears = copy.copy(bears_by_lang)
     to_propose_bears = {}
 
     if args.green_mode:
-        return candidate_bears
+        return load_bears(candidate_bears)
 
     # Initialize selected_bears with IMPORTANT_BEAR_LIST
     for lang, lang_bears in candidate_bears.items():
         if lang_bears and lang in IMPORTANT_BEAR_LIST:
             selected_bears[lang] = set()
             for bear in lang_bears:
-                if bear.__name__ in IMPORTANT_BEAR_LIST[lang]:
+                if bear.name in IMPORTANT_BEAR_LIST[lang]:
                     selected_bears[lang].add(bear)
         if lang_bears and lang not in IMPORTANT_BEAR_LIST:
             selected_bears[lang] = set(lang_bears)
@@ -114,7 +119,7 @@ def filter_relevant_bears(used_languages,
     for lang, lang_bears in to_propose_bears.items():
         for bear in lang_bears:
             # get the non-optional settings of the bears
-            settings = bear.get_non_optional_settings()
+            settings = bear.non_optional_settings
             if settings:
                 user_input_reqd = False
                 for setting in settings:
@@ -160,7 +165,31 @@ def filter_relevant_bears(used_languages,
             else:
                 selected_bears[lang].update(lang_bears)
 
-    return selected_bears
+    return load_bears(selected_bears)
+
+
+def load_bears(bears):
+    """
+    Imports the bear classes of the ``CatalogBear`` objects in the given
+    dict. The bears which can't be imported, e.g. bears of the shipped
+    snapshot whose dependencies are missing, are left out with a warning.
+
+    :param bears:
+        A dict with language name as key and ``CatalogBear`` objects as
+        value.
+    :return:
+        A dict with language name as key and bear classes as value.
+    """
+    loaded_bears = {}
+    for lang, lang_bears in bears.items():
+        loaded_bears[lang] = set()
+        for bear in lang_bears:
+            try:
+                loaded_bears[lang].add(bear.load())
+            except ImportError:
+                logging.warning('Unable to import the bear {}.'.format(
+                    bear.name))
+    return loaded_bears
 
 
 def get_non_optional_settings(bears):
@@ -314,7 +343,7 @@ def get_matching_linter_bears(bears, lint_tasks_info):
     that match the dependency requirements.
 
     :param bears:
-        list of Bears
+        list of Bears or ``CatalogBear`` objects
     :param dependency_info:
         list of ``LintTasksInfo`` instances.
     :return:
@@ -324,8 +353,13 @@ def get_matching_linter_bears(bears, lint_tasks_info):
     matched_bears = set()
     for task in lint_tasks_info:
         for bear in bears:
-            if (issubclass(bear, LinterClass) and
-                    bear.get_executable() == task.value):
+            if isinstance(bear, CatalogBear):
+                executable = bear.executable
+            elif issubclass(bear, LinterClass):
+                executable = bear.get_executable()
+            else:
+                executable = None
+            if executable is not None and executable == task.value:
                 matched_bears.add(bear)
                 break
             for req in bear.REQUIREMENTS:
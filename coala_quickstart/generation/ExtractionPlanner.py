@@ -0,0 +1,36 @@
+from coala_quickstart.generation.InfoMapping import INFO_SETTING_MAPS
+from coala_quickstart.info_extraction.Information import (
+    LintTaskInfo, ProjectDependencyInfo)
+
+# The kinds of information ``filter_relevant_bears`` proposes bears with,
+# whatever the settings of the bears are.
+BEAR_SELECTION_INFO_KINDS = (LintTaskInfo, ProjectDependencyInfo)
+
+
+def get_required_info_kinds(bears):
+    """
+    Finds the kinds of information needed to select the given bears and to
+    fill their non-optional settings.
+
+    :param bears: The candidate bears, as ``CatalogBear`` objects.
+    :return:      A set of ``Info`` classes.
+    """
+    info_kinds = set(BEAR_SELECTION_INFO_KINDS)
+    for bear in bears:
+        for setting in bear.non_optional_settings:
+            for mapping in INFO_SETTING_MAPS.get(setting, ()):
+                info_kinds.add(mapping['info_kind'])
+    return info_kinds
+
+
+def plan_extraction(registrations, info_kinds):
+    """
+    Selects the extractors finding any of the given kinds of information.
+
+    :param registrations: A list of ``ExtractorRegistration`` objects.
+    :param info_kinds:    A collection of ``Info`` classes.
+    :return:              The list of the ``ExtractorRegistration`` objects
+                          to run, in the given order.
+    """
+    return [registration for registration in registrations
+            if registration.provides(info_kinds)]
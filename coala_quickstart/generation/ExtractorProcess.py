@@ -0,0 +1,45 @@
+import os
+import pickle
+import sys
+
+
+def get_process_sys_path(sys_path=None):
+    """
+    Returns the ``sys.path`` of the processes running the extractors.
+
+    coala puts the directory of every bear it imports at the start of
+    ``sys.path``. Those are package directories, whose subpackages (like
+    ``bears/gettext``) would shadow the modules of the standard library in
+    a new process, so they are moved to the end.
+
+    :param sys_path: The list of paths, defaults to ``sys.path``.
+    :return:         A new list of paths.
+    """
+    if sys_path is None:
+        sys_path = sys.path
+    packages = [path for path in sys_path
+                if os.path.isfile(os.path.join(path or '.', '__init__.py'))]
+    return [path for path in sys_path if path not in packages] + packages
+
+
+def send_extracted_info(connection, sys_path, job):
+    """
+    Runs ``run_extractor`` in a child process and sends back its result or
+    the exception it raised through the given connection.
+
+    This module only imports the standard library, as it's imported before
+    the ``sys.path`` of the process is set up.
+
+    :param connection: The ``Connection`` to send the result through.
+    :param sys_path:   The ``sys.path`` of the process, as returned by
+                       ``get_process_sys_path``.
+    :param job:        The pickled arguments of ``run_extractor``.
+    """
+    sys.path[:] = sys_path
+    try:
+        from coala_quickstart.generation.InfoCollector import run_extractor
+        connection.send((True, run_extractor(*pickle.loads(job))))
+    except Exception as exception:
+        connection.send((False, exception))
+    finally:
+        connection.close()
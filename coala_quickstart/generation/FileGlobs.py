@@ -1,20 +1,51 @@
 import os
 
 from coalib.parsing.Globbing import glob_escape
-from coala_quickstart.generation.Utilities import get_gitignore_glob
+from coala_quickstart.generation.ProjectIndex import ProjectIndex
+from coala_quickstart.generation.Utilities import (
+    get_gitignore_glob, GitignoreMatcher)
 from coala_utils.Question import ask_question
 from coala_quickstart.Strings import GLOB_HELP
-from coalib.collecting.Collectors import collect_files
+
+
+def build_project_index(project_dir, cache=None, jobs=0, cancel_event=None):
+    """
+    Indexes the files of the project directory which aren't ignored by its
+    ``.gitignore`` files.
+
+    :param project_dir:  Absolute path of the project directory.
+    :param cache:        An optional ``ScanCache`` used to skip unchanged
+                         directories.
+    :param jobs:         The number of threads sniffing the files with an
+                         unknown extension right away. They are sniffed
+                         when their language is first needed if it is 0.
+    :param cancel_event: An optional ``threading.Event`` stopping the scan
+                         when it is set.
+    :raises CancelledError: If ``cancel_event`` was set.
+    :return:             A ``ProjectIndex`` object.
+    """
+    project_index = ProjectIndex.build(
+        project_dir,
+        ignore_matcher=GitignoreMatcher(project_dir),
+        cache=cache,
+        cancel_event=cancel_event)
+    if jobs:
+        project_index.sniff(jobs)
+    return project_index
 
 
 def get_project_files(log_printer,
                       printer,
                       project_dir,
                       file_path_completer,
-                      non_interactive=False):
+                      non_interactive=False,
+                      cache=None,
+                      project_index=None):
     """
     Gets the list of files matching files in the user's project directory
-    after prompting for glob expressions.
+    after prompting for glob expressions. The project directory is walked
+    only once and the directories ignored by ``.gitignore`` files are not
+    descended.
 
     :param log_printer:
         A ``LogPrinter`` object.
@@ -24,16 +55,20 @@ def get_project_files(log_printer,
         A ``file_path_completer`` object.
     :param non_interactive
         Whether coala-quickstart is in non-interactive mode
+    :param cache:
+        An optional ``ScanCache`` used to skip unchanged directories.
+    :param project_index:
+        The ``ProjectIndex`` of the project directory if it was already
+        built by ``build_project_index``, e.g. in the background.
     :return:
-        A list of file paths matching the files.
+        A tuple of a ``ProjectIndex`` of the files which are not ignored,
+        and the list of ignore glob expressions.
     """
-    file_globs = ['**']
+    if project_index is None:
+        project_index = build_project_index(project_dir, cache)
 
     ignore_globs = None
-    gitignore_dir_list = []
-    for dir_name, subdir_name, file_list in os.walk(project_dir):
-        if os.path.isfile(os.path.join(dir_name, '.gitignore')):
-            gitignore_dir_list += [dir_name]
+    gitignore_dir_list = project_index.gitignore_dirs
 
     if gitignore_dir_list:
         printer.print('The contents of your .gitignore file for the project '
@@ -56,17 +91,13 @@ def get_project_files(log_printer,
     printer.print()
 
     ignore_globs = list(ignore_globs)
+    if gitignore_dir_list:
+        # The index is already filtered by the gitignore rules, the globs
+        # are only needed for the ``ignore`` field of the coafile.
+        return project_index, ignore_globs
+
     escaped_project_dir = glob_escape(project_dir)
-    file_path_globs = [os.path.join(
-        escaped_project_dir, glob_exp) for glob_exp in file_globs]
     ignore_path_globs = [os.path.join(
         escaped_project_dir, glob_exp) for glob_exp in ignore_globs]
 
-    ignore_path_globs.append(os.path.join(escaped_project_dir, '.git/**'))
-
-    file_paths = collect_files(
-        file_path_globs,
-        log_printer,
-        ignored_file_paths=ignore_path_globs)
-
-    return file_paths, ignore_globs
+    return project_index.filter(ignore_path_globs), ignore_globs
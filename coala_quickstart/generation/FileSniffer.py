@@ -0,0 +1,52 @@
+import re
+from collections import namedtuple
+
+from coala_quickstart.Constants import HASHBANG_REGEX
+from coala_quickstart.Profiling import record_file_access
+
+
+# Number of bytes read from the beginning of a file to sniff it.
+SNIFF_SIZE = 1024
+
+FileHeader = namedtuple('FileHeader', ['first_line', 'is_binary'])
+
+
+def sniff_file(file_path):
+    """
+    Reads the beginning of the given file without ever reading more than
+    ``SNIFF_SIZE`` bytes. The result isn't cached here: the hashbang is
+    kept by the ``IndexedFile`` of the file and by the ``ScanCache``
+    along with the size and modification time the file was indexed with.
+
+    :param file_path: Path of the file to be sniffed.
+    :return:          A ``FileHeader`` with the first line of the file
+                      without its line terminator, and whether the file is
+                      binary, i.e. contains a NUL byte in its beginning.
+                      The first line is ``None`` for binary files and files
+                      which can't be read.
+    """
+    record_file_access(file_path)
+    try:
+        with open(file_path, 'rb') as data:
+            head = data.read(SNIFF_SIZE)
+    except OSError:
+        return FileHeader(None, False)
+
+    if b'\0' in head:
+        return FileHeader(None, True)
+    first_line = head.split(b'\n', 1)[0].rstrip(b'\r')
+    return FileHeader(first_line.decode('utf-8', 'replace'), False)
+
+
+def sniff_hashbang(file_path):
+    """
+    Returns the hashbang of the given file.
+
+    :param file_path: Path of the file to be sniffed.
+    :return:          The first line of the file if it is a hashbang,
+                      ``None`` otherwise.
+    """
+    first_line = sniff_file(file_path).first_line
+    if first_line is not None and re.match(HASHBANG_REGEX, first_line):
+        return first_line
+    return None
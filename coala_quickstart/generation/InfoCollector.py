@@ -1,34 +1,177 @@
-from coala_quickstart.info_extractors.EditorconfigInfoExtractor import (
-    EditorconfigInfoExtractor)
-from coala_quickstart.info_extractors.PackageJSONInfoExtractor import (
-    PackageJSONInfoExtractor)
-from coala_quickstart.info_extractors.GemfileInfoExtractor import (
-    GemfileInfoExtractor)
-from coala_quickstart.info_extractors.GruntfileInfoExtractor import (
-    GruntfileInfoExtractor)
+import logging
+import multiprocessing
+import os
+import pickle
+import time
 
+from coala_quickstart.Profiling import record_file_access
+from coala_quickstart.generation.ExtractionPlanner import (
+    get_required_info_kinds, plan_extraction)
+from coala_quickstart.generation.ExtractorProcess import (
+    get_process_sys_path, send_extracted_info)
+from coala_quickstart.info_extraction.ExtractorRegistry import (
+    get_registered_extractors)
+from coala_quickstart.info_extraction.InfoExtractor import InfoExtractor
 
-def collect_info(project_dir):
+# Seconds each extractor running in a child process may run before its
+# information is given up.
+EXTRACTOR_TIMEOUT = 30
+
+# Extractors reading less than this number of bytes run in the calling
+# process, as starting a process would take longer than parsing the files.
+# They can't be stopped there, so ``EXTRACTOR_TIMEOUT`` doesn't apply to
+# them: parsing such small files doesn't take long.
+IN_PROCESS_MAX_SIZE = 8 * 1024
+
+# The extractor processes are spawned rather than forked: collect_info runs
+# next to other threads importing modules and logging, and a forked child
+# would inherit the locks they hold and could wait for them forever. A
+# spawned child imports the modules it needs again, see
+# ``send_extracted_info``.
+_PROCESS_CONTEXT = multiprocessing.get_context('spawn')
+
+
+def run_extractor(extractor_class, target_globs, project_dir,
+                  result_cache=None):
+    """
+    Extracts the information of the given files with an ``InfoExtractor``.
+
+    :return: The ``information`` attribute of the extractor.
+    """
+    return extractor_class(target_globs, project_dir,
+                           result_cache).extract_information()
+
+
+def collect_info(project_dir, project_index=None, timeout=EXTRACTOR_TIMEOUT,
+                 info_kinds=None, result_cache=None):
     """
     Collects information extracted by various ``InfoExtractor``
     classes and returns them as a dictionary.
+
+    The extractors are the ones returned by ``get_registered_extractors``
+    which find any of the requested kinds of information. An extractor is
+    only imported if the project has files it reads.
+
+    The extractors which have large files to read run at the same time,
+    each in its own process. An extractor still running ``timeout`` seconds
+    after its process started is stopped and its information is left out
+    with a warning. The extractors with less than ``IN_PROCESS_MAX_SIZE``
+    bytes to read run in the calling process meanwhile, without a timeout,
+    as they can't be stopped there. The result doesn't depend on the order
+    in which the extractors finish.
+
+    :param project_dir:   Full path of the user's project directory.
+    :param project_index: The ``ProjectIndex`` of the project, used to find
+                          the files the extractors read. The project
+                          directory is searched if it isn't given.
+    :param timeout:       Seconds each extractor running in a child
+                          process may run.
+    :param info_kinds:    The ``Info`` classes to collect. All the
+                          extractors run if it isn't given.
+    :param result_cache:  An ``ExtractorResultCache`` holding the
+                          information found in the files before.
     """
-    editorconfig_info = EditorconfigInfoExtractor(
-        ['.editorconfig'], project_dir).extract_information()
+    registrations = get_registered_extractors()
+    if info_kinds is not None:
+        registrations = plan_extraction(registrations, info_kinds)
+    in_process = []
+    in_child_process = []
+    for registration in registrations:
+        target_globs = list(registration.supported_file_globs)
+        if project_index is None:
+            target_files = InfoExtractor.retrieve_files(target_globs,
+                                                        project_dir)
+        else:
+            target_files = registration.find_target_files(project_dir,
+                                                          project_index)
+        if not target_files:
+            continue
+
+        extractor_class = registration.load()
+        size = 0
+        for target_file in target_files:
+            path = os.path.join(project_dir, target_file)
+            record_file_access(path)
+            size += os.path.getsize(path)
+        extractor = (registration, extractor_class, target_globs)
+        if size < IN_PROCESS_MAX_SIZE:
+            in_process.append(extractor)
+        else:
+            in_child_process.append(extractor)
 
-    package_json_info = PackageJSONInfoExtractor(
-        ['package.json'], project_dir).extract_information()
+    processes = []
+    extracted_info = {}
+    sys_path = get_process_sys_path() if in_child_process else None
+    try:
+        for registration, extractor_class, target_globs in in_child_process:
+            receiver, sender = _PROCESS_CONTEXT.Pipe(duplex=False)
+            job = pickle.dumps((extractor_class, target_globs, project_dir,
+                                result_cache))
+            process = _PROCESS_CONTEXT.Process(
+                target=send_extracted_info,
+                args=(sender, sys_path, job),
+                daemon=True)
+            process.start()
+            sender.close()
+            # Every extractor gets its own deadline, counted from the start
+            # of its process.
+            processes.append((registration, extractor_class, process,
+                              receiver, time.monotonic() + timeout))
 
-    gemfile_info = GemfileInfoExtractor(
-        ['Gemfile'], project_dir).extract_information()
+        for registration, extractor_class, target_globs in in_process:
+            extracted_info[registration] = run_extractor(
+                extractor_class, target_globs, project_dir, result_cache)
 
-    gruntfile_info = GruntfileInfoExtractor(
-        ['Gruntfile.js'], project_dir).extract_information()
+        for (registration, extractor_class, process, receiver,
+                deadline) in processes:
+            try:
+                if not receiver.poll(max(0, deadline - time.monotonic())):
+                    logging.warning(
+                        '{} did not finish within {} seconds, its '
+                        'information is ignored.'.format(
+                            extractor_class.__name__, timeout))
+                    continue
+                succeeded, result = receiver.recv()
+            except EOFError:
+                logging.warning('{} stopped unexpectedly, its information '
+                                'is ignored.'.format(extractor_class.__name__))
+                continue
+            if not succeeded:
+                raise result
+            extracted_info[registration] = result
+    finally:
+        for _, _, process, receiver, _ in processes:
+            receiver.close()
+            if process.is_alive():
+                process.terminate()
+            process.join()
 
-    extracted_info = aggregate_info([
-        editorconfig_info, package_json_info, gemfile_info, gruntfile_info])
+    return aggregate_info(extracted_info[registration]
+                          for registration in registrations
+                          if registration in extracted_info)
 
-    return extracted_info
+
+def collect_required_info(catalog, languages, project_dir,
+                          project_index=None, timeout=EXTRACTOR_TIMEOUT,
+                          result_cache=None):
+    """
+    Collects the information which can be used to select the bears of the
+    given languages and to fill their non-optional settings.
+
+    :param catalog:       The ``BearCatalog`` to take the bears from.
+    :param languages:     A list of language names.
+    :param project_dir:   Full path of the user's project directory.
+    :param project_index: The ``ProjectIndex`` of the project.
+    :param timeout:       Seconds each extractor running in a child
+                          process may run.
+    :param result_cache:  An ``ExtractorResultCache`` holding the
+                          information found in the files before.
+    :return:              The information, as returned by ``collect_info``.
+    """
+    return collect_info(
+        project_dir, project_index, timeout,
+        info_kinds=get_required_info_kinds(catalog.get_bears(languages)),
+        result_cache=result_cache)
 
 
 def aggregate_info(infoextractors):
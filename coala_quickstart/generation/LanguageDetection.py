@@ -0,0 +1,133 @@
+import os
+import re
+
+from coala_utils.Extensions import exts
+
+
+# Extension -> sorted tuple of the languages using it.
+EXTENSION_LANGUAGES = {ext: tuple(sorted(languages))
+                       for ext, languages in exts.items()}
+
+# Lower case language name -> canonical language name.
+CANONICAL_LANGUAGES = {language.lower(): language
+                       for languages in exts.values()
+                       for language in languages}
+CANONICAL_LANGUAGES['shell'] = 'Shell'
+
+# Interpreters whose name isn't the lower case name of their language.
+INTERPRETER_ALIASES = {
+    'ash': 'Shell',
+    'bash': 'Shell',
+    'coffee': 'CoffeeScript',
+    'dash': 'Shell',
+    'ksh': 'Shell',
+    'node': 'JavaScript',
+    'nodejs': 'JavaScript',
+    'php-cgi': 'PHP',
+    'pypy': 'Python',
+    'rscript': 'R',
+    'runghc': 'Haskell',
+    'runhaskell': 'Haskell',
+    'sh': 'Shell',
+    'ts-node': 'TypeScript',
+    'zsh': 'Shell',
+}
+
+# Normalized interpreter name -> canonical language name.
+INTERPRETER_LANGUAGES = dict(CANONICAL_LANGUAGES)
+INTERPRETER_LANGUAGES.update(INTERPRETER_ALIASES)
+
+_VERSION_SUFFIX_REGEX = re.compile(r'[\d.]+$')
+
+
+def normalize_interpreter(interpreter):
+    """
+    Strips the directory and the version from an interpreter name.
+
+    >>> normalize_interpreter('/usr/bin/python3.11')
+    'python'
+    >>> normalize_interpreter('Rscript')
+    'rscript'
+
+    :param interpreter: The interpreter as found in a hashbang.
+    :return:            The lower case name of the interpreter.
+    """
+    name = os.path.basename(interpreter).lower()
+    return _VERSION_SUFFIX_REGEX.sub('', name) or name
+
+
+def get_interpreter(hashbang):
+    """
+    Extracts the interpreter from a hashbang, looking through ``env``.
+
+    >>> get_interpreter('#!/usr/bin/env -S python3 -u')
+    'python3'
+    >>> get_interpreter('#! /bin/sh -e')
+    'sh'
+
+    :param hashbang: The first line of a file.
+    :return:         The interpreter without its directory, or ``None``
+                     if the line isn't a hashbang.
+    """
+    if not hashbang.startswith('#!'):
+        return None
+    words = hashbang[2:].split()
+    if not words:
+        return None
+
+    interpreter = os.path.basename(words[0])
+    if interpreter == 'env':
+        for word in words[1:]:
+            # Skips the options and variable assignments of env.
+            if not word.startswith('-') and '=' not in word:
+                return os.path.basename(word)
+        return None
+    return interpreter
+
+
+def get_canonical_language(name):
+    """
+    Returns the canonical name of a language, given any capitalization of
+    its name or the name of its interpreter.
+
+    >>> get_canonical_language('javascript')
+    'JavaScript'
+    >>> get_canonical_language('bash')
+    'Shell'
+
+    :param name: A language or interpreter name.
+    :return:     The canonical language name or ``None`` if the language
+                 is unknown.
+    """
+    return (CANONICAL_LANGUAGES.get(name.lower()) or
+            INTERPRETER_LANGUAGES.get(normalize_interpreter(name)))
+
+
+def get_hashbang_language(hashbang):
+    """
+    Detects the language of a file from its hashbang.
+
+    >>> get_hashbang_language('#!/usr/bin/env node')
+    'JavaScript'
+    >>> get_hashbang_language('#!/usr/bin/python3.11')
+    'Python'
+
+    :param hashbang: The first line of a file.
+    :return:         The canonical language name or ``None`` if the
+                     interpreter is unknown.
+    """
+    interpreter = get_interpreter(hashbang)
+    if interpreter is None:
+        return None
+    return INTERPRETER_LANGUAGES.get(normalize_interpreter(interpreter))
+
+
+def get_extension_languages(extension):
+    """
+    Returns the languages using the given file extension.
+
+    :param extension: The extension including the dot, e.g. ``'.py'``.
+    :return:          A tuple of canonical language names, empty if the
+                      extension is unknown.
+    """
+    return EXTENSION_LANGUAGES.get(extension, ())
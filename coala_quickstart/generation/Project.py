@@ -1,12 +1,11 @@
 import os
 import operator
 from collections import defaultdict
-import re
 
 from coala_utils.string_processing.StringConverter import StringConverter
-from coala_utils.Extensions import exts
-from coala_quickstart.generation.Utilities import get_language_from_hashbang
-from coala_quickstart.Constants import HASHBANG_REGEX
+from coala_quickstart.generation.LanguageDetection import (
+    get_extension_languages, get_hashbang_language)
+from coala_quickstart.generation.ProjectIndex import as_project_index
 
 
 def valid_path(path: StringConverter):
@@ -33,52 +32,54 @@ def valid_path(path: StringConverter):
     return path
 
 
-def language_percentage(file_paths):
+def language_percentage(file_paths, jobs=1):
     """
     Computes the percentage composition of each language, with unknown
     extensions tagged with the ``Unknown`` key.
 
-    :param file_paths: A list of file paths.
+    :param file_paths: A ``ProjectIndex`` or a list of file paths.
+    :param jobs:       The number of threads sniffing the files with
+                       unknown extensions.
     :return:           A dict with file name as key and the percentage
                        of occurences as the value.
     """
-    if file_paths:
-        delta = 100 / len(file_paths)
+    project_index = as_project_index(file_paths)
+    if project_index:
+        delta = 100 / len(project_index)
+    project_index.sniff(jobs)
 
     results = defaultdict(lambda: 0)
-    for file_path in file_paths:
-        ext = os.path.splitext(file_path)[1]
+    for indexed_file in project_index.files:
+        languages = get_extension_languages(indexed_file.extension)
 
-        if ext in exts:
-            for lang in exts[ext]:
+        if languages:
+            for lang in languages:
                 results[lang] += delta
 
-        elif os.path.exists(file_path):
-            with open(file_path, 'r') as data:
-                hashbang = data.readline()
-                if re.match(HASHBANG_REGEX, hashbang):
-                    language = get_language_from_hashbang(hashbang).lower()
-                    for ext in exts:
-                        for lang in exts[ext]:
-                            if language == lang.lower():
-                                results[lang.lower()] += delta
+        elif indexed_file.hashbang:
+            language = get_hashbang_language(indexed_file.hashbang)
+            if language:
+                results[language] += delta
 
     return results
 
 
-def get_used_languages(file_paths):
+def get_used_languages(file_paths, jobs=1):
     """
     Identifies the most used languages in the user's project directory
     from the files matched from the given glob expression.
 
     :param file_paths:
-        A list of absolute file paths in the user's project directory.
+        A ``ProjectIndex`` or a list of absolute file paths in the user's
+        project directory.
+    :param jobs:
+        The number of threads sniffing the files with unknown extensions.
     :return:
         A tuple iterator containing a language name as the first value
         and percentage usage in the project as the second value.
     """
     return sorted(
-        language_percentage(file_paths).items(),
+        language_percentage(file_paths, jobs).items(),
         key=operator.itemgetter(1),
         reverse=True)
 
@@ -0,0 +1,321 @@
+import os
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+from coalib.parsing.Globbing import fnmatch
+from coala_quickstart.Profiling import count_file_accesses, record_file_access
+from coala_quickstart.generation.FileSniffer import sniff_hashbang
+from coala_quickstart.generation.LanguageDetection import EXTENSION_LANGUAGES
+from coala_quickstart.generation.ScanCache import scan_dir
+
+# The files marking the root directory of a subproject of a monorepo.
+SUBPROJECT_MARKERS = frozenset(('package.json', 'Gemfile', 'setup.py',
+                                '.editorconfig'))
+
+
+class IndexedFile:
+    """
+    A file recorded in a ``ProjectIndex``.
+
+    The hashbang is only sniffed for files with an unknown extension and
+    only the first time it is asked for.
+    """
+
+    __slots__ = ('path', 'extension', 'size', 'mtime', '_hashbang')
+
+    _NOT_SNIFFED = object()
+
+    def __init__(self, path, size=None, mtime=None):
+        """
+        :param path:  Absolute path of the file.
+        :param size:  Size of the file in bytes, ``None`` if unknown.
+        :param mtime: Modification time of the file, ``None`` if unknown.
+        """
+        self.path = path
+        self.extension = os.path.splitext(path)[1]
+        self.size = size
+        self.mtime = mtime
+        self._hashbang = self._NOT_SNIFFED
+
+    @classmethod
+    def from_path(cls, path):
+        """
+        Creates an ``IndexedFile`` by stat-ing the given path. Paths that
+        can't be stat-ed are recorded without size and modification time.
+        """
+        record_file_access(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return cls(path)
+        return cls(path, stat.st_size, stat.st_mtime)
+
+    @property
+    def needs_sniffing(self):
+        """
+        Whether the language of the file can only be found from its
+        hashbang.
+        """
+        return self.extension not in EXTENSION_LANGUAGES
+
+    @property
+    def sniffed(self):
+        """
+        Whether the hashbang of the file is already known.
+        """
+        return self._hashbang is not self._NOT_SNIFFED
+
+    @property
+    def hashbang(self):
+        """
+        The hashbang line of the file or ``None``. Files with a known
+        extension are never opened.
+        """
+        if self._hashbang is self._NOT_SNIFFED:
+            self._hashbang = (sniff_hashbang(self.path)
+                              if self.needs_sniffing else None)
+        return self._hashbang
+
+    @hashbang.setter
+    def hashbang(self, hashbang):
+        self._hashbang = hashbang
+
+    def __repr__(self):
+        return '<{} {!r}>'.format(self.__class__.__name__, self.path)
+
+
+class ProjectIndex:
+    """
+    An index of the files in a project directory, built with a single walk
+    of the directory tree and shared by every stage of the generation.
+
+    Iterating over the index yields the file paths, so it can be used
+    wherever a list of file paths is expected.
+    """
+
+    def __init__(self, project_dir, files=(), gitignore_dirs=(),
+                 subproject_dirs=()):
+        """
+        :param project_dir:     Absolute path of the project directory.
+        :param files:           Iterable of ``IndexedFile`` objects.
+        :param gitignore_dirs:  List of the directories containing a
+                                ``.gitignore`` file.
+        :param subproject_dirs: List of the directories below the project
+                                directory containing one of the
+                                ``SUBPROJECT_MARKERS``.
+        """
+        self.project_dir = project_dir
+        self.gitignore_dirs = list(gitignore_dirs)
+        self.subproject_dirs = list(subproject_dirs)
+        self._files = {f.path: f for f in files}
+        self._paths = sorted(self._files)
+
+    @classmethod
+    def build(cls,
+              project_dir,
+              excluded_dirs=('.git',),
+              ignore_matcher=None,
+              cache=None,
+              cancel_event=None):
+        """
+        Walks the project directory once and indexes every file in it.
+        The directories of the subprojects are recorded on the way.
+
+        :param project_dir:    Absolute path of the project directory.
+        :param excluded_dirs:  Names of directories directly inside the
+                               project directory which are not descended.
+        :param ignore_matcher: An optional object like
+                               ``GitignoreMatcher`` whose ``enter`` method is
+                               called for every directory containing a
+                               ``.gitignore`` file and whose ``is_ignored``
+                               method decides which files and directories
+                               are left out. Ignored directories are never
+                               listed.
+        :param cache:          An optional ``ScanCache`` providing the
+                               listings of unchanged directories and the
+                               hashbangs of unchanged files.
+        :param cancel_event:   An optional ``threading.Event`` stopping the
+                               walk when it is set.
+        :raises CancelledError: If ``cancel_event`` was set.
+        :return:               A ``ProjectIndex`` object.
+        """
+        files = []
+        gitignore_dirs = []
+        subproject_dirs = []
+        to_visit = [(project_dir, ignore_matcher)]
+
+        while to_visit:
+            if cancel_event is not None and cancel_event.is_set():
+                raise CancelledError
+            dir_name, matcher = to_visit.pop()
+            try:
+                if cache is None:
+                    entries, from_cache = scan_dir(dir_name), False
+                else:
+                    entries, from_cache = cache.list_dir(dir_name)
+            except OSError:
+                continue
+
+            if any(name == '.gitignore' for name, *_ in entries):
+                gitignore_dirs.append(dir_name)
+                if matcher is not None:
+                    matcher = matcher.enter(dir_name)
+
+            if dir_name != project_dir and any(
+                    name in SUBPROJECT_MARKERS and not is_dir
+                    for name, is_dir, *_ in entries):
+                subproject_dirs.append(dir_name)
+
+            for name, is_dir, size, mtime in entries:
+                path = os.path.join(dir_name, name)
+                if matcher is not None and matcher.is_ignored(path, is_dir):
+                    continue
+                if is_dir:
+                    if not (dir_name == project_dir and
+                            name in excluded_dirs):
+                        to_visit.append((path, matcher))
+                    continue
+
+                if not from_cache:
+                    indexed_file = IndexedFile(path, size, mtime)
+                else:
+                    # The listing of an unchanged directory doesn't
+                    # reflect changes to the contents of its files. The
+                    # files which are sniffed are stat-ed again, the
+                    # others are recorded without their stale size and
+                    # modification time.
+                    indexed_file = IndexedFile(path)
+                    if indexed_file.needs_sniffing:
+                        indexed_file = IndexedFile.from_path(path)
+                if cache is not None and indexed_file.needs_sniffing:
+                    found, hashbang = cache.get_hashbang(
+                        path, indexed_file.size, indexed_file.mtime)
+                    if found:
+                        indexed_file.hashbang = hashbang
+                files.append(indexed_file)
+
+        return cls(project_dir, files, sorted(gitignore_dirs),
+                   sorted(subproject_dirs))
+
+    @classmethod
+    def from_paths(cls, file_paths, project_dir=None):
+        """
+        Creates an index from a list of file paths.
+
+        :param file_paths:  A list of file paths, which need not exist.
+        :param project_dir: The project directory, defaults to the common
+                            directory of all the paths.
+        :return:            A ``ProjectIndex`` object.
+        """
+        file_paths = list(file_paths)
+        if project_dir is None and file_paths:
+            project_dir = os.path.dirname(os.path.commonprefix(file_paths))
+        return cls(project_dir,
+                   (IndexedFile.from_path(path) for path in file_paths))
+
+    def filter(self, ignore_globs):
+        """
+        Returns a new index without the files matching any of the given
+        globs.
+
+        :param ignore_globs: A list of absolute glob expressions.
+        :return:             A ``ProjectIndex`` object.
+        """
+        if not ignore_globs:
+            return self
+        return ProjectIndex(
+            self.project_dir,
+            (f for f in self.files if not fnmatch(f.path, ignore_globs)),
+            self.gitignore_dirs,
+            self.subproject_dirs)
+
+    def split_subprojects(self):
+        """
+        Splits the index into one index per subproject, without accessing
+        the file system. Every file belongs to the innermost subproject
+        directory containing it, and the files outside of all of them to
+        the project directory.
+
+        :return: A list of ``ProjectIndex`` objects: the one of the project
+                 directory first if it has files of its own or there are no
+                 subprojects, followed by the ones of the subprojects
+                 sorted by directory. The ``subproject_dirs`` of every
+                 index are the subproject directories nested in it.
+        """
+        subproject_files = {subproject_dir: []
+                            for subproject_dir in self.subproject_dirs}
+        own_files = []
+        for indexed_file in self.files:
+            dir_name = os.path.dirname(indexed_file.path)
+            while (dir_name not in subproject_files and
+                   dir_name != self.project_dir and
+                   dir_name != os.path.dirname(dir_name)):
+                dir_name = os.path.dirname(dir_name)
+            subproject_files.get(dir_name, own_files).append(indexed_file)
+
+        indexes = []
+        if own_files or not self.subproject_dirs:
+            indexes.append(ProjectIndex(
+                self.project_dir, own_files, self.gitignore_dirs,
+                self.subproject_dirs))
+        for subproject_dir in self.subproject_dirs:
+            prefix = os.path.join(subproject_dir, '')
+            indexes.append(ProjectIndex(
+                subproject_dir,
+                subproject_files[subproject_dir],
+                [dir_name for dir_name in self.gitignore_dirs
+                 if os.path.join(dir_name, '').startswith(prefix)],
+                [dir_name for dir_name in self.subproject_dirs
+                 if dir_name.startswith(prefix)]))
+        return indexes
+
+    def sniff(self, jobs=1):
+        """
+        Sniffs the hashbangs of all the files which need it and weren't
+        sniffed yet.
+
+        :param jobs: The number of threads reading the files. The results
+                     are the same as with a single thread.
+        """
+        unsniffed = [f for f in self.files
+                     if f.needs_sniffing and not f.sniffed]
+        paths = [f.path for f in unsniffed]
+        if jobs <= 1 or len(paths) <= 1:
+            hashbangs = list(map(sniff_hashbang, paths))
+        else:
+            # executor.map returns the results in the order of the paths,
+            # whichever thread finishes first.
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                hashbangs = list(executor.map(
+                    count_file_accesses(sniff_hashbang), paths))
+
+        for indexed_file, hashbang in zip(unsniffed, hashbangs):
+            indexed_file.hashbang = hashbang
+
+    @property
+    def files(self):
+        """
+        The ``IndexedFile`` objects of the index, sorted by path.
+        """
+        return [self._files[path] for path in self._paths]
+
+    def __getitem__(self, path):
+        return self._files[path]
+
+    def __contains__(self, path):
+        return path in self._files
+
+    def __iter__(self):
+        return iter(self._paths)
+
+    def __len__(self):
+        return len(self._paths)
+
+
+def as_project_index(project_files):
+    """
+    Returns the given object if it is a ``ProjectIndex``, otherwise an
+    index created from the file paths it contains.
+    """
+    if isinstance(project_files, ProjectIndex):
+        return project_files
+    return ProjectIndex.from_paths(project_files)
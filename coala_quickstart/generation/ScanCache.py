@@ -0,0 +1,176 @@
+import hashlib
+import json
+import logging
+import os
+import time
+
+from coala_quickstart.Profiling import record_file_access
+
+CACHE_VERSION = 2
+
+# Seconds within which a directory modification may not be reflected by
+# its mtime, depending on the file system's timestamp granularity.
+RACY_INTERVAL = 2
+
+
+def get_cache_root():
+    """
+    Returns the directory in which coala-quickstart stores its caches,
+    honouring ``XDG_CACHE_HOME``.
+    """
+    return os.path.join(
+        os.environ.get('XDG_CACHE_HOME') or
+        os.path.join(os.path.expanduser('~'), '.cache'),
+        'coala-quickstart')
+
+
+def scan_dir(dir_name):
+    """
+    Lists the given directory.
+
+    :param dir_name: Path of the directory.
+    :return:         A list of ``(name, is_dir, size, mtime)`` tuples for
+                     the subdirectories and regular files in the directory.
+                     Size and mtime are ``None`` for subdirectories.
+    """
+    entries = []
+    record_file_access(dir_name)
+    for entry in os.scandir(dir_name):
+        if entry.is_dir(follow_symlinks=False):
+            entries.append((entry.name, True, None, None))
+        elif entry.is_file():
+            record_file_access(entry.path)
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((entry.name, False, stat.st_size, stat.st_mtime))
+    return entries
+
+
+class ScanCache:
+    """
+    An on-disk cache of the directory listings and hashbangs found while
+    scanning a project, stored under
+    ``~/.cache/coala-quickstart/<project-hash>``.
+
+    A directory is only listed again when its mtime changed, and a
+    hashbang is only sniffed again when the size or mtime of its file
+    changed.
+    """
+
+    def __init__(self, project_dir, cache_root=None, rebuild=False):
+        """
+        :param project_dir: The user's project directory.
+        :param cache_root:  The directory holding the caches of all the
+                            projects, defaults to ``get_cache_root()``.
+        :param rebuild:     Whether to ignore the existing cache contents.
+        """
+        self.project_dir = project_dir
+        project_hash = hashlib.sha1(
+            os.path.abspath(project_dir).encode('utf-8')).hexdigest()
+        self.path = os.path.join(cache_root or get_cache_root(),
+                                 project_hash)
+        self._dirs = {}
+        self._hashbangs = {}
+        self._new_dirs = {}
+        self._new_hashbangs = {}
+        if not rebuild:
+            self._load()
+
+    def _load(self):
+        record_file_access(self.path)
+        try:
+            with open(self.path, 'r') as cache_file:
+                data = json.load(cache_file)
+        except (OSError, ValueError):
+            return
+        if (not isinstance(data, dict) or
+                data.get('version') != CACHE_VERSION or
+                data.get('project_dir') != self.project_dir):
+            return
+        self._dirs = data['dirs']
+        self._hashbangs = data['hashbangs']
+
+    def list_dir(self, dir_name):
+        """
+        Lists the given directory, reusing the cached listing if the
+        directory didn't change since it was cached.
+
+        :param dir_name: Path of the directory.
+        :return:         A tuple of the entries as returned by ``scan_dir``
+                         and whether they were taken from the cache.
+        """
+        record_file_access(dir_name)
+        mtime = os.stat(dir_name).st_mtime
+        cached = self._dirs.get(dir_name)
+        # A directory modified shortly before or during the scan that
+        # cached it may have been listed before the modification.
+        if (cached and cached['mtime'] == mtime and
+                mtime < cached['scanned'] - RACY_INTERVAL):
+            self._new_dirs[dir_name] = cached
+            return [tuple(entry) for entry in cached['entries']], True
+
+        scanned = time.time()
+        entries = scan_dir(dir_name)
+        self._new_dirs[dir_name] = {'mtime': mtime,
+                                    'scanned': scanned,
+                                    'entries': entries}
+        return entries, False
+
+    def get_hashbang(self, path, size, mtime):
+        """
+        Returns the cached sniff of the given file.
+
+        :return: A tuple of whether the file was sniffed before with the
+                 same size and mtime, and the hashbang found.
+        """
+        cached = self._hashbangs.get(path)
+        if cached and cached[0] == size and cached[1] == mtime:
+            return True, cached[2]
+        return False, None
+
+    def store_hashbangs(self, indexed_files):
+        """
+        Remembers the hashbangs sniffed for the given ``IndexedFile``
+        objects.
+        """
+        for indexed_file in indexed_files:
+            if indexed_file.needs_sniffing and indexed_file.sniffed:
+                self._new_hashbangs[indexed_file.path] = (
+                    indexed_file.size,
+                    indexed_file.mtime,
+                    indexed_file.hashbang)
+
+    def save(self):
+        """
+        Writes the listings and hashbangs used since the cache was loaded
+        to disk. Entries of directories and files which weren't seen are
+        dropped. Failures to write are only logged.
+        """
+        data = {'version': CACHE_VERSION,
+                'project_dir': self.project_dir,
+                'dirs': self._new_dirs,
+                'hashbangs': self._new_hashbangs}
+        temp_path = self.path + '.tmp'
+        record_file_access(self.path)
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(temp_path, 'w') as cache_file:
+                json.dump(data, cache_file, separators=(',', ':'))
+            os.replace(temp_path, self.path)
+        except OSError:
+            logging.warning('Unable to write the scan cache {}'.format(
+                self.path))
+        self.commit()
+
+    def commit(self):
+        """
+        Makes the listings and hashbangs used since the cache was loaded
+        the ones the next scan with this object reuses, without writing them
+        to disk. ``save`` commits them as well.
+        """
+        self._dirs = self._new_dirs
+        self._hashbangs = self._new_hashbangs
+        self._new_dirs = {}
+        self._new_hashbangs = {}
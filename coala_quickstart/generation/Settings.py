@@ -3,16 +3,18 @@ from collections import OrderedDict
 from datetime import date
 
 from coalib.settings.SectionFilling import fill_settings
+from coala_quickstart.Profiling import record_file_access
 from coala_quickstart.generation.SettingsFilling import (
     fill_section, acquire_settings)
+from coala_quickstart.generation.ProjectIndex import as_project_index
 from coala_quickstart.generation.Utilities import (
     split_by_language, get_extensions)
 from coalib.settings.Section import Section
 from coalib.output.ConfWriter import ConfWriter
-from coalib.collecting.Collectors import collect_files
+from coalib.parsing.Globbing import glob_escape
 
 
-def generate_section(section_name, extensions_used, bears):
+def generate_section(section_name, extensions_used, bears, file_globs=()):
     """
     Generates a section for a particular language (or default).
 
@@ -22,17 +24,45 @@ def generate_section(section_name, extensions_used, bears):
         A list of extensions associated with this section.
     :param bears:
         A list of bear classes.
+    :param file_globs:
+        A list of globs of the files of this section which can't be matched
+        by their extension, e.g. scripts only recognized by their hashbang.
     :return:
         A ``Section`` object containing the section.
     """
     section = Section(section_name, None)
 
     section['bears'] = ', '.join(bear.name for bear in bears)
-    section['files'] = ', '.join('**' + ext for ext in set(extensions_used))
+    section['files'] = ', '.join(
+        ['**' + ext for ext in set(extensions_used)] +
+        list(OrderedDict.fromkeys(file_globs)))
 
     return section
 
 
+def get_hashbang_globs(project_dir, lang_files, extset):
+    """
+    Generates the globs of the files whose language was only found from
+    their hashbang, as their extension doesn't match it.
+
+    :param project_dir:
+        Full path of the user's project directory.
+    :param lang_files:
+        A dict with language name as key and a set of files as value, as
+        returned by ``split_by_language``.
+    :param extset:
+        A dict with language name as key and a set of extensions as
+        value, as returned by ``get_extensions``.
+    :return:
+        A dict with language name as key and a sorted list of globs
+        relative to the project directory as value.
+    """
+    return {lang: sorted(glob_escape(os.path.relpath(file, project_dir))
+                         for file in files
+                         if os.path.splitext(file)[1] not in extset[lang])
+            for lang, files in lang_files.items() if lang != 'all'}
+
+
 def generate_ignore_field(project_dir,
                           languages,
                           extset,
@@ -41,6 +71,10 @@ def generate_ignore_field(project_dir,
     """
     Generate the ignore field for the ``default`` section.
 
+    The ignored files were already left out when the project was indexed,
+    so the field is derived from the ignore globs alone and the file
+    system is not accessed.
+
     :param project_dir:
         Full path of the user's project directory.
     :param languages:
@@ -48,20 +82,14 @@ def generate_ignore_field(project_dir,
     :param extset:
         A dict with language name as key and a set of extensions as
         value. This includes only those extensions used by the project.
+    :param ignore_globs:
+        The list of absolute ignore glob expressions.
     :return:
-        A comma-separated string containing the globs to ignore.
+        A comma-separated string containing the globs to ignore, relative
+        to the project directory and without duplicates.
     """
-
-    all_files = set(collect_files(
-        '**',
-        null_printer,
-        ignored_file_paths=ignore_globs))
-
-    ignores = []
-    for glob in ignore_globs:
-        gitignore_files = {file
-                           for file in collect_files([glob], null_printer)}
-        ignores.append(os.path.relpath(glob, project_dir))
+    ignores = OrderedDict.fromkeys(
+        os.path.relpath(glob, project_dir) for glob in ignore_globs)
 
     return ', '.join(ignores)
 
@@ -79,7 +107,8 @@ def generate_settings(project_dir,
     :param project_dir:
         Full path of the user's project directory.
     :param project_files:
-        A list of file paths matched in the user's project directory.
+        A ``ProjectIndex`` or a list of file paths matched in the user's
+        project directory.
     :param ignore_globs:
         The list of ignore glob expressions.
     :param relevant_bears:
@@ -102,15 +131,18 @@ def generate_settings(project_dir,
         A dict with section name as key and a ``Section`` object as value.
     """
     lang_map = {lang.lower(): lang for lang in relevant_bears}
-    lang_files = split_by_language(project_files)
-    extset = get_extensions(project_files)
+    project_index = as_project_index(project_files)
+    lang_files = split_by_language(project_index)
+    extset = get_extensions(project_index)
+    hashbang_globs = get_hashbang_globs(project_dir, lang_files, extset)
 
     settings = OrderedDict()
 
     settings['all'] = generate_section(
         'all',
         [ext for lang in lang_files for ext in extset[lang]],
-        relevant_bears[lang_map['all']])
+        relevant_bears[lang_map['all']],
+        sorted(glob for globs in hashbang_globs.values() for glob in globs))
 
     ignored_files = generate_ignore_field(project_dir, lang_files.keys(),
                                           extset, ignore_globs)
@@ -119,11 +151,14 @@ def generate_settings(project_dir,
         settings['all']['ignore'] = ignored_files
 
     for lang in lang_files:
-        if lang != 'unknown' and lang != 'all':
+        # Languages without any file globs get no section.
+        if (lang != 'unknown' and lang != 'all' and
+                (extset[lang] or hashbang_globs[lang])):
             settings['all.' + lang_map[lang]] = generate_section(
                 'all.' + lang,
                 extset[lang],
-                relevant_bears[lang_map[lang]])
+                relevant_bears[lang_map[lang]],
+                hashbang_globs[lang])
 
     if not incomplete_sections:
         fill_settings(settings,
@@ -158,13 +193,17 @@ def write_coafile(printer, project_dir, settings):
         Full path of the user's project directory.
     :param settings:
         A dict with section name as key and a ``Section`` object as value.
+    :return:
+        The path of the written coafile.
     """
     coafile = os.path.join(project_dir, '.coafile')
+    record_file_access(coafile)
     if os.path.isfile(coafile):
         printer.print("'" + coafile + "' already exists.\nThe settings will be"
                       " written to '" + coafile + ".new'",
                       color='yellow')
         coafile = coafile + '.new'
+        record_file_access(coafile)
 
     writer = ConfWriter(coafile)
     write_info(writer)
@@ -172,3 +211,4 @@ def write_coafile(printer, project_dir, settings):
     writer.close()
 
     printer.print("'" + coafile + "' successfully generated.", color='green')
+    return coafile
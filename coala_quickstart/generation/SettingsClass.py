@@ -113,6 +113,21 @@ class SettingTypes:
         self.settings_others = []
         self.fillup_settings(functions, settings, bear, trigger)
 
+    @classmethod
+    def from_lists(cls, settings_bool, settings_others):
+        """
+        Creates a ``SettingTypes`` object from already categorized settings.
+
+        :param settings_bool:
+            List of the names of the settings of Type bool.
+        :param settings_others:
+            List of the names of the other settings.
+        """
+        setting_types = cls.__new__(cls)
+        setting_types.settings_bool = list(settings_bool)
+        setting_types.settings_others = list(settings_others)
+        return setting_types
+
     def fillup_settings(self, functions, settings, bear, trigger):
         """
         Fill settings_bool and settings_others depending upon whether the
@@ -322,6 +337,25 @@ class BearSettings:
         self.create_setting_types_obj(optional_settings, non_optional_settings,
                                       functions, bear)
 
+    @classmethod
+    def from_catalog(cls, bear, settings):
+        """
+        Creates a ``BearSettings`` object from the settings recorded in a
+        ``BearCatalog`` without inspecting the bear.
+
+        :param bear:
+            A bear class object.
+        :param settings:
+            The ``settings`` of the ``CatalogBear`` of the bear.
+        """
+        bear_settings = cls.__new__(cls)
+        bear_settings.bear = bear
+        bear_settings.non_optional_settings = SettingTypes.from_lists(
+            *settings['non_optional'])
+        bear_settings.optional_settings = SettingTypes.from_lists(
+            *settings['optional'])
+        return bear_settings
+
     def create_setting_types_obj(self, optional_settings,
                                  non_optional_settings, functions, bear):
         """
@@ -342,15 +376,25 @@ class BearSettings:
             optional_settings, functions, bear, trigger='optional')
 
 
-def collect_bear_settings(bears):
+def collect_bear_settings(bears, catalog=None):
     """
     :param bears:
         Dict of candidate bears for the project for each language.
+    :param catalog:
+        An optional ``BearCatalog`` whose recorded settings are used
+        instead of inspecting the bears.
     :return:
         A BearSettings object.
     """
     bear_settings_obj = []
     for language in bears:
         for bear in bears[language]:
-            bear_settings_obj.append(BearSettings(bear))
+            settings = None
+            if catalog is not None and bear.name in catalog:
+                settings = catalog[bear.name].settings
+            if settings is not None:
+                bear_settings_obj.append(
+                    BearSettings.from_catalog(bear, settings))
+            else:
+                bear_settings_obj.append(BearSettings(bear))
     return bear_settings_obj
@@ -3,9 +3,11 @@ import os
 from collections import defaultdict
 import re
 
-from coala_utils.Extensions import exts
 from coala_utils.string_processing import unescaped_search_for
-from coala_quickstart.Constants import HASHBANG_REGEX
+from coala_quickstart.Profiling import record_file_access
+from coala_quickstart.generation.LanguageDetection import (
+    get_extension_languages, get_hashbang_language, get_interpreter)
+from coala_quickstart.generation.ProjectIndex import as_project_index
 
 
 def is_glob_exp(line):
@@ -76,37 +78,225 @@ def get_gitignore_glob(project_dir, gitignore_dir_list, filename='.gitignore'):
     """
     for dir_name in gitignore_dir_list:
         gitignore = os.path.join(dir_name, filename)
+        record_file_access(gitignore)
         with open(gitignore) as file:
             for line in file:
                 for glob in parse_gitignore_line(line):
                     yield os.path.join(dir_name, glob)
 
 
+def translate_gitignore_pattern(line):
+    """
+    Translates a line from a ``.gitignore`` file to a regular expression
+    matching the paths, relative to the directory of the ``.gitignore``
+    file, to which the line applies.
+
+    >>> translate_gitignore_pattern('# comment') is None
+    True
+    >>> translate_gitignore_pattern('/build/')
+    ('build', False, True)
+    >>> translate_gitignore_pattern('!tmp*')
+    ('(?:.*/)?tmp[^/]*', True, False)
+
+    :param line: A line from a ``.gitignore`` file.
+    :return:     ``None`` if the line contains no pattern, otherwise a
+                 tuple of the regular expression, whether the pattern is
+                 negated and whether it only matches directories.
+    """
+    line = line.rstrip('\n')
+    cur = len(line) - 1
+    # Strips whitespace from the end if it is not escaped
+    while cur >= 0 and line[cur].isspace() and line[cur - 1] != '\\':
+        cur -= 1
+    line = line[:cur + 1]
+
+    if not line or line.startswith('#'):
+        return None
+
+    negated = line.startswith('!')
+    if negated:
+        line = line[1:]
+
+    dir_only = line.endswith('/')
+    line = line.rstrip('/')
+    if not line:
+        return None
+
+    # A slash at the beginning or in the middle anchors the pattern to
+    # the directory of the .gitignore file.
+    anchored = '/' in line
+    line = line.lstrip('/')
+
+    regex = ''
+    index, length = 0, len(line)
+    while index < length:
+        char = line[index]
+        if line.startswith('**', index) and (
+                index == 0 or line[index - 1] == '/') and (
+                index + 2 == length or line[index + 2] == '/'):
+            if index + 2 == length:
+                regex += '.*'
+            else:
+                regex += '(?:.*/)?'
+            index += 3
+            continue
+        elif char == '/':
+            regex += '/'
+        elif char == '*':
+            regex += '[^/]*'
+        elif char == '?':
+            regex += '[^/]'
+        elif char == '[':
+            end = line.find(']', index + 2)
+            if end < 0:
+                regex += re.escape(char)
+            else:
+                content = line[index + 1:end].replace('\\', '\\\\')
+                if content[0] in '!^':
+                    content = '^' + content[1:]
+                regex += '[' + content + ']'
+                index = end
+        elif char == '\\' and index + 1 < length:
+            index += 1
+            regex += re.escape(line[index])
+        else:
+            regex += re.escape(char)
+        index += 1
+
+    if not anchored:
+        regex = '(?:.*/)?' + regex
+
+    return regex, negated, dir_only
+
+
+class GitignoreRules:
+    """
+    The rules of a single ``.gitignore`` file, compiled into one regular
+    expression for files and one for directories.
+    """
+
+    def __init__(self, lines):
+        """
+        :param lines: The lines of the ``.gitignore`` file.
+        """
+        rules = [rule for rule in map(translate_gitignore_pattern, lines)
+                 if rule is not None]
+        # The last matching rule decides, so the rules are tried in
+        # reverse order and each one is put in its own group.
+        rules.reverse()
+        self._file_negations, self._file_regex = self._compile(
+            [rule for rule in rules if not rule[2]])
+        self._dir_negations, self._dir_regex = self._compile(rules)
+
+    @classmethod
+    def from_file(cls, gitignore):
+        """
+        Reads and compiles the given ``.gitignore`` file. Unreadable files
+        don't contain any rules.
+        """
+        record_file_access(gitignore)
+        try:
+            with open(gitignore) as file:
+                return cls(file.readlines())
+        except (OSError, UnicodeDecodeError):
+            return cls([])
+
+    @staticmethod
+    def _compile(rules):
+        if not rules:
+            return (), None
+        regex = re.compile('|'.join('(' + rule[0] + r')\Z'
+                                    for rule in rules))
+        return tuple(rule[1] for rule in rules), regex
+
+    def match(self, relative_path, is_dir=False):
+        """
+        Matches the given path against the rules.
+
+        :param relative_path: The path relative to the directory of the
+                              ``.gitignore`` file, using ``/`` as
+                              separator.
+        :param is_dir:        Whether the path is a directory.
+        :return:              ``True`` if the path is ignored, ``False`` if
+                              it is explicitly included by a negated rule
+                              and ``None`` if no rule matches.
+        """
+        if is_dir:
+            negations, regex = self._dir_negations, self._dir_regex
+        else:
+            negations, regex = self._file_negations, self._file_regex
+        if regex is None:
+            return None
+        match = regex.match(relative_path)
+        if match is None:
+            return None
+        return not negations[match.lastindex - 1]
+
+
+class GitignoreMatcher:
+    """
+    Matches paths against all the ``.gitignore`` files found on the way
+    from the project directory to them, where the rules of deeper files
+    take precedence.
+
+    Only the paths themselves are matched, the contents of ignored
+    directories are expected to be pruned by the caller.
+    """
+
+    def __init__(self, project_dir, _rules=()):
+        """
+        :param project_dir: The user's project directory.
+        """
+        self.project_dir = project_dir
+        self._rules = _rules
+
+    def enter(self, dir_name):
+        """
+        Returns the matcher to use for the contents of the given directory,
+        which contains a ``.gitignore`` file.
+
+        :param dir_name: Absolute path of the directory.
+        :return:         A ``GitignoreMatcher`` object.
+        """
+        rules = GitignoreRules.from_file(os.path.join(dir_name, '.gitignore'))
+        return GitignoreMatcher(self.project_dir,
+                                ((dir_name, rules),) + self._rules)
+
+    def is_ignored(self, path, is_dir=False):
+        """
+        Checks whether the given path is ignored.
+
+        :param path:   An absolute path inside the project directory.
+        :param is_dir: Whether the path is a directory.
+        """
+        for dir_name, rules in self._rules:
+            relative_path = path[len(dir_name):].lstrip(os.sep)
+            if os.sep != '/':
+                relative_path = relative_path.replace(os.sep, '/')
+            result = rules.match(relative_path, is_dir)
+            if result is not None:
+                return result
+        return False
+
+
 def split_by_language(project_files):
     """
     Splits the given files based on language. This ignores unknown extensions.
 
-    :param project_files: A list of file paths.
+    :param project_files: A ``ProjectIndex`` or a list of file paths.
     :return:              A dict with language name as keys and a list of
                           files coming under that language as values.
     """
     lang_files = defaultdict(lambda: set())
-    for file in project_files:
-        name, ext = os.path.splitext(file)
-        if ext in exts:
-            for lang in exts[ext]:
-                lang_files[lang.lower()].add(file)
-                lang_files['all'].add(file)
-        else:
-            with open(file, 'r') as data:
-                hashbang = data.readline()
-                if(re.match(HASHBANG_REGEX, hashbang)):
-                    language = get_language_from_hashbang(hashbang).lower()
-                    for ext in exts:
-                        for lang in exts[ext]:
-                            if language == lang.lower():
-                                lang_files[lang.lower()].add(file)
-                                lang_files['all'].add(file)
+    for indexed_file in as_project_index(project_files).files:
+        file = indexed_file.path
+        languages = get_extension_languages(indexed_file.extension)
+        if not languages and indexed_file.hashbang:
+            language = get_hashbang_language(indexed_file.hashbang)
+            languages = (language,) if language else ()
+        for lang in languages:
+            lang_files[lang.lower()].add(file)
+            lang_files['all'].add(file)
     return lang_files
 
 
@@ -114,16 +304,15 @@ def get_extensions(project_files):
     """
     Generates the extensions available in the given project files.
 
-    :param project_files: A list of file paths.
+    :param project_files: A ``ProjectIndex`` or a list of file paths.
     :return:              The set of extensions used in the project_files
                           for which bears exist.
     """
     extset = defaultdict(lambda: set())
-    for file in project_files:
-        ext = os.path.splitext(file)[1]
-        if ext in exts:
-            for lang in exts[ext]:
-                extset[lang.lower()].add(ext)
+    for indexed_file in as_project_index(project_files).files:
+        ext = indexed_file.extension
+        for lang in get_extension_languages(ext):
+            extset[lang.lower()].add(ext)
 
     return extset
 
@@ -178,12 +367,9 @@ def search_for_orig(decorated, orig_name):
 
 
 def get_language_from_hashbang(hashbang):
-    if(re.match('(^#!(.*))', hashbang)):
-        hashbang_contents = hashbang.split(' ')
-        try:
-            # For eg: #!bin/bash python3
-            return hashbang_contents[1]
-        except IndexError:
-            # For eg: #!bin/bash
-            hashbang_element = hashbang_contents[0].split('/')
-            return (hashbang_element[len(hashbang_element)-1])
+    """
+    Returns the interpreter named in the hashbang, e.g. ``python3`` for
+    ``#!/usr/bin/env python3``. Use ``get_hashbang_language`` to get the
+    language itself.
+    """
+    return get_interpreter(hashbang)
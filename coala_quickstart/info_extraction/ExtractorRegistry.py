@@ -0,0 +1,172 @@
+import importlib
+import logging
+import os
+from collections import OrderedDict
+
+from coala_quickstart.info_extraction.Info import Info
+from coala_quickstart.info_extraction.Information import (
+    LintTaskInfo, ProjectDependencyInfo)
+from coalib.parsing.Globbing import fnmatch, glob_escape, has_wildcard
+
+# The setuptools entry point group of the ``ExtractorRegistration`` objects
+# of the extractors provided by other packages, e.g. in their setup.py:
+#
+#     entry_points={
+#         'coala_quickstart.info_extractors': [
+#             'tox = my_package.registrations:TOX_EXTRACTOR',
+#         ],
+#     }
+#
+# The extractors shipped with coala-quickstart are declared the same way,
+# see ``coala_quickstart.info_extractors.Registrations``.
+ENTRY_POINT_GROUP = 'coala_quickstart.info_extractors'
+
+DISTRIBUTION_NAME = 'coala-quickstart'
+
+
+class ExtractorRegistration:
+    """
+    Describes an ``InfoExtractor`` without importing it, so its module and
+    the parsers it needs are only imported for the projects which have
+    files it can read.
+    """
+
+    def __init__(self, name, supported_file_globs, module_name, class_name,
+                 supported_info_kinds=(Info,)):
+        """
+        :param name:                 A unique name of the extractor.
+        :param supported_file_globs: The globs of the files the extractor
+                                     reads, relative to the project
+                                     directory.
+        :param module_name:          The name of the module defining the
+                                     extractor.
+        :param class_name:           The name of the ``InfoExtractor``
+                                     class in the module.
+        :param supported_info_kinds: The ``Info`` classes the extractor
+                                     finds. An extractor which doesn't
+                                     declare them is assumed to find any
+                                     kind of information.
+        """
+        self.name = name
+        self.supported_file_globs = tuple(supported_file_globs)
+        self.module_name = module_name
+        self.class_name = class_name
+        self.supported_info_kinds = tuple(supported_info_kinds)
+
+    def provides(self, info_kinds):
+        """
+        Checks whether the extractor finds any of the given kinds of
+        information.
+
+        >>> registration = ExtractorRegistration(
+        ...     'test', ('test.txt',), 'test', 'TestInfoExtractor',
+        ...     (LintTaskInfo,))
+        >>> registration.provides({LintTaskInfo, ProjectDependencyInfo})
+        True
+        >>> registration.provides({ProjectDependencyInfo})
+        False
+
+        :param info_kinds: A collection of ``Info`` classes.
+        :return:           ``True`` if one of the supported kinds of the
+                           extractor is a subclass or a base class of one
+                           of the given kinds.
+        """
+        return any(issubclass(info_kind, supported_kind) or
+                   issubclass(supported_kind, info_kind)
+                   for info_kind in info_kinds
+                   for supported_kind in self.supported_info_kinds)
+
+    def load(self):
+        """
+        Imports the extractor.
+
+        :return: The ``InfoExtractor`` class.
+        """
+        module = importlib.import_module(self.module_name)
+        return getattr(module, self.class_name)
+
+    def find_target_files(self, project_dir, project_index):
+        """
+        Finds the files the extractor reads in a project, without accessing
+        the file system.
+
+        :param project_dir:   Full path of the project directory.
+        :param project_index: The ``ProjectIndex`` of the project.
+        :return:              A list of the paths of the files relative to
+                              the project directory.
+        """
+        found = []
+        wildcard_globs = []
+        for file_glob in self.supported_file_globs:
+            if has_wildcard(file_glob):
+                wildcard_globs.append(
+                    os.path.join(glob_escape(project_dir), file_glob))
+            elif os.path.join(project_dir, file_glob) in project_index:
+                found.append(file_glob)
+
+        if wildcard_globs:
+            for path in project_index:
+                relative_path = os.path.relpath(path, project_dir)
+                if (relative_path not in found and
+                        fnmatch(path, wildcard_globs)):
+                    found.append(relative_path)
+        return found
+
+    def __repr__(self):
+        return '<{} {!r}>'.format(self.__class__.__name__, self.name)
+
+
+_registered_extractors = None
+
+
+def get_registered_extractors():
+    """
+    Returns the extractors shipped with coala-quickstart followed by the
+    ones registered by other packages under the ``ENTRY_POINT_GROUP`` entry
+    point group. An entry point replaces the extractor of the same name.
+    None of the extractors is imported.
+
+    The extractors shipped with coala-quickstart keep the order of
+    ``BUILTIN_EXTRACTORS``, which replaces their entry points when
+    coala-quickstart isn't installed, e.g. in a source checkout.
+
+    :return: A list of ``ExtractorRegistration`` objects.
+    """
+    global _registered_extractors
+    if _registered_extractors is None:
+        import pkg_resources
+        from coala_quickstart.info_extractors.Registrations import (
+            BUILTIN_EXTRACTORS)
+
+        entry_points = list(pkg_resources.iter_entry_points(
+            ENTRY_POINT_GROUP))
+        builtins = OrderedDict()
+        others = OrderedDict()
+        for entry_point in entry_points:
+            try:
+                registration = entry_point.load()
+            except Exception:
+                logging.warning('Unable to load the info extractor '
+                                '{}.'.format(entry_point.name))
+                continue
+            registrations = builtins if _is_builtin(entry_point) else others
+            registrations[registration.name] = registration
+
+        if not any(map(_is_builtin, entry_points)):
+            builtins.update((registration.name, registration)
+                            for registration in BUILTIN_EXTRACTORS)
+        order = [registration.name for registration in BUILTIN_EXTRACTORS]
+        registrations = OrderedDict(
+            (name, builtins[name])
+            for name in sorted(builtins, key=order.index))
+        registrations.update(others)
+        _registered_extractors = list(registrations.values())
+    return _registered_extractors
+
+
+def _is_builtin(entry_point):
+    """
+    Checks whether the entry point is declared by coala-quickstart itself.
+    """
+    return (entry_point.dist is not None and
+            entry_point.dist.project_name == DISTRIBUTION_NAME)
@@ -0,0 +1,177 @@
+import copy
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import zlib
+from collections import OrderedDict
+
+from coala_quickstart.Profiling import record_file_access
+from coala_quickstart.generation.ScanCache import get_cache_root
+
+
+def get_result_key(extractor_class, fname, file_content):
+    """
+    Returns the key under which the information an extractor found in a
+    file is cached. It changes with the extractor, its ``version``, the
+    content of the file and its name, which is the ``source`` of the
+    information.
+
+    :param extractor_class: The ``InfoExtractor`` class.
+    :param fname:           The path of the file relative to the project
+                            directory.
+    :param file_content:    The content of the file, as a string.
+    :return:                A hexadecimal string.
+    """
+    content_hash = hashlib.sha256(
+        file_content.encode('utf-8', 'surrogateescape')).hexdigest()
+    return hashlib.sha256('{}.{}\0{}\0{}\0{}'.format(
+        extractor_class.__module__,
+        extractor_class.__qualname__,
+        extractor_class.version,
+        fname,
+        content_hash).encode('utf-8')).hexdigest()
+
+
+class ExtractorResultCache:
+    """
+    An on-disk cache of the ``Info`` instances found by the extractors,
+    stored under ``~/.cache/coala-quickstart/extractor-results``. Every
+    entry is a separate file named after its key, so extractors running in
+    several processes can use the cache at the same time.
+
+    Any object with the same ``get`` and ``set`` methods can be given to
+    the extractors instead.
+    """
+
+    def __init__(self, cache_root=None, rebuild=False):
+        """
+        :param cache_root: The directory holding the caches of
+                           coala-quickstart, defaults to
+                           ``get_cache_root()``.
+        :param rebuild:    Whether to ignore the existing entries.
+        """
+        self.path = os.path.join(cache_root or get_cache_root(),
+                                 'extractor-results')
+        self.rebuild = rebuild
+
+    def get(self, key):
+        """
+        :param key: A key as returned by ``get_result_key``.
+        :return:    The list of ``Info`` instances cached under the key, or
+                    ``None`` if there is none.
+        """
+        if self.rebuild:
+            return None
+        record_file_access(os.path.join(self.path, key))
+        try:
+            with open(os.path.join(self.path, key), 'rb') as entry:
+                return pickle.loads(zlib.decompress(entry.read()))
+        except (OSError, zlib.error, pickle.UnpicklingError,
+                AttributeError, EOFError, ImportError):
+            return None
+
+    def set(self, key, infos):
+        """
+        Caches a list of ``Info`` instances. The instances are stored
+        without their ``extractor``. Failures to serialize or write them
+        are only logged.
+
+        :param key:   A key as returned by ``get_result_key``.
+        :param infos: A list of ``Info`` instances.
+        """
+        stripped_infos = []
+        for info in infos:
+            info = copy.copy(info)
+            info.extractor = None
+            stripped_infos.append(info)
+        try:
+            data = zlib.compress(pickle.dumps(stripped_infos,
+                                              pickle.HIGHEST_PROTOCOL))
+        except (pickle.PicklingError, AttributeError, TypeError):
+            logging.warning('Unable to cache the information of {}'.format(
+                key))
+            return
+        record_file_access(os.path.join(self.path, key))
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            descriptor, temp_path = tempfile.mkstemp(dir=self.path)
+            with os.fdopen(descriptor, 'wb') as entry:
+                entry.write(data)
+            os.replace(temp_path, os.path.join(self.path, key))
+        except OSError:
+            logging.warning('Unable to write the extractor result cache '
+                            '{}'.format(self.path))
+
+
+class MemoryResultCache:
+    """
+    Keeps the ``Info`` instances found by the extractors in memory, in
+    front of another cache such as an ``ExtractorResultCache``, for the
+    processes generating the settings of several projects.
+
+    Only the entries of the ``max_entries`` keys used last are kept, so the
+    memory used stays bounded however many projects are generated. An
+    evicted entry is read from the fallback cache again when needed.
+    """
+
+    # The number of keys kept in memory by default, one per extracted file.
+    MAX_ENTRIES = 4096
+
+    def __init__(self, fallback=None, max_entries=MAX_ENTRIES):
+        """
+        :param fallback:    The cache used for the keys which aren't in
+                            memory yet, or ``None``.
+        :param max_entries: The number of keys kept in memory.
+        """
+        self.fallback = fallback
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def __getstate__(self):
+        # The entries in memory aren't sent to the processes running the
+        # extractors, which only use the fallback cache.
+        state = dict(self.__dict__)
+        state['_entries'] = OrderedDict()
+        return state
+
+    def get(self, key):
+        """
+        :param key: A key as returned by ``get_result_key``.
+        :return:    The list of ``Info`` instances cached under the key, or
+                    ``None`` if there is none.
+        """
+        infos = self._entries.get(key)
+        if infos is not None:
+            self._entries.move_to_end(key)
+        elif self.fallback is not None:
+            infos = self.fallback.get(key)
+            if infos is not None:
+                self._keep(key, infos)
+        return infos
+
+    def set(self, key, infos):
+        """
+        Caches a list of ``Info`` instances in memory and in the fallback
+        cache.
+
+        :param key:   A key as returned by ``get_result_key``.
+        :param infos: A list of ``Info`` instances.
+        """
+        self._keep(key, infos)
+        if self.fallback is not None:
+            self.fallback.set(key, infos)
+
+    def clear(self):
+        """
+        Drops the entries kept in memory. The fallback cache is left as it
+        is.
+        """
+        self._entries.clear()
+
+    def _keep(self, key, infos):
+        self._entries[key] = infos
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
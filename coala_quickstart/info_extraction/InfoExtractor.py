@@ -1,6 +1,9 @@
 import os
 
-from coalib.parsing.Globbing import glob, fnmatch
+from coalib.parsing.Globbing import glob, glob_escape, fnmatch
+from coala_quickstart.Profiling import record_file_access
+from coala_quickstart.info_extraction.ExtractorResultCache import (
+    get_result_key)
 from coala_quickstart.info_extraction.Info import Info
 
 
@@ -14,14 +17,23 @@ class InfoExtractor:
     # tuple of ``Info`` classes that can be extracted.
     supported_info_kinds = (Info,)
 
+    # Version of the information found in a file, to be increased whenever
+    # the extractor finds different information in the same file, so the
+    # cached information is found again.
+    version = 1
+
     def __init__(self,
                  target_globs,
-                 project_directory):
+                 project_directory,
+                 result_cache=None):
         """
         :param target_globs:      list of file globs to extract information
                                   from.
         :param project_directory: Absolute path to project directory in which
                                   the target files will be searched.
+        :param result_cache:      An ``ExtractorResultCache`` reused for the
+                                  files whose content didn't change since
+                                  their information was cached.
         """
         target_files = self.retrieve_files(target_globs, project_directory)
         for fname in target_files:
@@ -34,6 +46,7 @@ class InfoExtractor:
         self.target_files = [
             os.path.join(project_directory, f) for f in target_files]
         self.directory = project_directory
+        self.result_cache = result_cache
         self._information = dict()
 
     @property
@@ -81,12 +94,22 @@ class InfoExtractor:
         Extracts the information, saves in the object and returns it.
         """
         for fpath in self.target_files:
+            record_file_access(fpath)
             with open(fpath, 'r') as f:
-                pfile = self.parse_file(fpath, f.read())
-                fname = os.path.relpath(fpath, self.directory)
-                file_info = self.find_information(fname, pfile)
-                if file_info:
-                    self._add_info(fname, file_info)
+                file_content = f.read()
+            fname = os.path.relpath(fpath, self.directory)
+
+            file_info = None
+            if self.result_cache is not None:
+                key = get_result_key(type(self), fname, file_content)
+                file_info = self.result_cache.get(key)
+            if file_info is None:
+                pfile = self.parse_file(fpath, file_content)
+                file_info = self.find_information(fname, pfile) or []
+                if self.result_cache is not None:
+                    self.result_cache.set(key, file_info)
+            if file_info:
+                self._add_info(fname, file_info)
 
         return self.information
 
@@ -101,16 +124,20 @@ class InfoExtractor:
         """
         Returns matched filenames acoording to the list of file globs and
         supported files of the extractor.
+
+        The globs are anchored to the given directory, so the working
+        directory of the process is neither used nor changed.
+
+        :param file_globs: list of file globs relative to the directory.
+        :param directory:  Absolute path of the directory to search in.
+        :return:           list of the matched file paths relative to the
+                           directory.
         """
+        escaped_directory = glob_escape(directory)
         matches = []
 
-        cwd = os.getcwd()
-        os.chdir(directory)
-
         for g in file_globs:
-            matches += glob(g)
-
-        matched_files = [f for f in matches if not os.path.isdir(f)]
-        os.chdir(cwd)
+            matches += glob(os.path.join(escaped_directory, g))
 
-        return matched_files
+        return [os.path.relpath(f, directory)
+                for f in matches if not os.path.isdir(f)]
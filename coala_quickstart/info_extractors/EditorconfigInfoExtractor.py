@@ -2,6 +2,8 @@ import re
 
 from coala_quickstart.info_extractors.EditorconfigParsing import (
     parse_editorconfig_file, translate_editorconfig_section_to_regex)
+from coala_quickstart.info_extractors.Registrations import (
+    EDITORCONFIG_EXTRACTOR)
 from coala_quickstart.info_extraction.InfoExtractor import InfoExtractor
 from coala_quickstart.info_extraction.Information import (
     IndentStyleInfo, IndentSizeInfo, TrailingWhitespaceInfo, FinalNewlineInfo,
@@ -9,15 +11,13 @@ from coala_quickstart.info_extraction.Information import (
 
 
 class EditorconfigInfoExtractor(InfoExtractor):
-    supported_file_globs = ('.editorconfig',)
+    supported_file_globs = EDITORCONFIG_EXTRACTOR.supported_file_globs
 
     spec_references = [
         'http://editorconfig.org/#file-format-details',
         'https://gitlab.com/coala/GSoC-2017/issues/172']
 
-    supported_info_kinds = (
-        IndentStyleInfo, IndentSizeInfo, TrailingWhitespaceInfo,
-        FinalNewlineInfo, CharsetInfo, LineBreaksInfo)
+    supported_info_kinds = EDITORCONFIG_EXTRACTOR.supported_info_kinds
 
     def parse_file(self, fname, file_content):
         return parse_editorconfig_file(fname, file_content)
@@ -3,14 +3,14 @@ from gemfileparser import GemfileParser
 from coala_quickstart.info_extraction.InfoExtractor import InfoExtractor
 from coala_quickstart.info_extraction.Information import (
     ProjectDependencyInfo, VersionInfo)
+from coala_quickstart.info_extractors.Registrations import GEMFILE_EXTRACTOR
 
 
 class GemfileInfoExtractor(InfoExtractor):
-    supported_files = ('Gemfile',)
+    supported_file_globs = GEMFILE_EXTRACTOR.supported_file_globs
 
     spec_references = ['https://gitlab.com/coala/GSoC-2017/issues/167', ]
-    supported_information_kinds = (
-        ProjectDependencyInfo, VersionInfo)
+    supported_info_kinds = GEMFILE_EXTRACTOR.supported_info_kinds
 
     def parse_file(self, fname, file_content):
         parser = GemfileParser(fname)
@@ -1,28 +1,211 @@
+import copy
 import logging
+import re
 
 from pyjsparser import PyJsParser
 
 from coala_quickstart.info_extraction.InfoExtractor import InfoExtractor
 from coala_quickstart.info_extraction.Information import (
     IncludePathsInfo, IgnorePathsInfo, LintTaskInfo, MentionedTasksInfo)
+from coala_quickstart.info_extractors.Registrations import (
+    GRUNTFILE_EXTRACTOR)
 from coala_quickstart.info_extractors.Utilities import (
-    search_object_recursively)
+    search_object_patterns, search_object_recursively)
+
+
+def get_grunt_call_pattern(method):
+    """
+    Returns the ``(key, value)`` pattern of the calls of the given method
+    of the ``grunt`` object, like ``grunt.loadNpmTasks( ... )``, for
+    ``search_object_recursively``.
+    """
+    return ('callee', {
+        'computed': False,
+        'type': 'MemberExpression',
+        'property': {
+            'name': method,
+            'type': 'Identifier',
+            },
+        'object': {
+            'name': 'grunt',
+            'type': 'Identifier',
+            }
+        })
+
+
+# The grunt methods whose calls hold the information, found in a single
+# traversal of the parsed file.
+GRUNT_CALL_PATTERNS = {
+    method: get_grunt_call_pattern(method)
+    for method in ('registerTask', 'initConfig', 'loadNpmTasks')}
+
+# Matches the names of the methods anywhere in a file, so files without any
+# of them aren't parsed.
+GRUNT_METHOD_REGEX = re.compile(
+    r'\b(?:{})\b'.format('|'.join(sorted(GRUNT_CALL_PATTERNS))))
+
+STRING_LITERAL = r'(?P<quote>[\'"])(?P<{}>[^\'"\\]*)(?P=quote)'
+
+LOAD_NPM_TASKS_REGEX = re.compile(
+    r'\bgrunt\s*\.\s*loadNpmTasks\s*\(\s*' + STRING_LITERAL.format('task'))
+
+REGISTER_TASK_REGEX = re.compile(
+    r'\bgrunt\s*\.\s*registerTask\s*\(\s*' + STRING_LITERAL.format('task') +
+    r'\s*,\s*\[(?P<subtasks>[^\]]*)\]')
+
+SUBTASK_REGEX = re.compile(STRING_LITERAL.format('subtask'))
+
+
+def split_statements(file_content):
+    """
+    Splits JavaScript code into its top-level statements without parsing
+    it. Statements are assumed to end with a semicolon or with a closing
+    brace at the end of a line. Strings and comments are skipped, regular
+    expression literals aren't recognized.
+
+    >>> split_statements('a = {b: "}"};\\nf() // ;\\nfunction g() {\\n}\\n')
+    ['a = {b: "}"};', '\\nf() // ;\\nfunction g() {\\n}', '\\n']
+
+    :param file_content: The JavaScript code.
+    :return:             A list of strings which join to the code, or
+                         ``None`` if the brackets of the code don't match.
+    """
+    statements = []
+    depth = 0
+    start = 0
+    position = 0
+    length = len(file_content)
+    while position < length:
+        char = file_content[position]
+        if char in '\'"`':
+            position += 1
+            while position < length and file_content[position] != char:
+                if file_content[position] == '\\':
+                    position += 1
+                position += 1
+        elif file_content.startswith('//', position):
+            position = file_content.find('\n', position)
+            if position < 0:
+                break
+            continue
+        elif file_content.startswith('/*', position):
+            position = file_content.find('*/', position + 2)
+            if position < 0:
+                break
+            position += 1
+        elif char in '{([':
+            depth += 1
+        elif char in '})]':
+            depth -= 1
+            if depth < 0:
+                return None
+            if (depth == 0 and char == '}' and
+                    file_content[position + 1:].lstrip(' \t\r')[:1] in
+                    ('\n', '')):
+                statements.append(file_content[start:position + 1])
+                start = position + 1
+        elif char == ';' and depth == 0:
+            statements.append(file_content[start:position + 1])
+            start = position + 1
+        position += 1
+
+    if depth != 0:
+        return None
+    if start < length:
+        statements.append(file_content[start:])
+    return statements
+
+
+def scan_grunt_calls(file_content):
+    """
+    Finds the ``grunt.loadNpmTasks`` and ``grunt.registerTask`` calls with
+    literal arguments in JavaScript code with regular expressions, without
+    parsing it. The configuration given to ``grunt.initConfig`` isn't
+    found.
+
+    :param file_content: The JavaScript code.
+    :return:             A ``Program`` node holding the calls found, like
+                         the ones created by ``PyJsParser().parse``.
+    """
+    def literal(value):
+        return {'type': 'Literal', 'value': value, 'raw': None}
+
+    def call_statement(method, arguments):
+        return {'type': 'ExpressionStatement',
+                'expression': {
+                    'type': 'CallExpression',
+                    'callee': copy.deepcopy(GRUNT_CALL_PATTERNS[method][1]),
+                    'arguments': arguments}}
+
+    body = []
+    for match in LOAD_NPM_TASKS_REGEX.finditer(file_content):
+        body.append(call_statement('loadNpmTasks',
+                                   [literal(match.group('task'))]))
+    for match in REGISTER_TASK_REGEX.finditer(file_content):
+        subtasks = [literal(subtask.group('subtask')) for subtask in
+                    SUBTASK_REGEX.finditer(match.group('subtasks'))]
+        body.append(call_statement(
+            'registerTask',
+            [literal(match.group('task')),
+             {'type': 'ArrayExpression', 'elements': subtasks}]))
+    return {'type': 'Program', 'body': body}
 
 
 class GruntfileInfoExtractor(InfoExtractor):
-    supported_file_globs = ('Gruntfile.js',)
-    supported_info_kinds = (LintTaskInfo, MentionedTasksInfo)
+    supported_file_globs = GRUNTFILE_EXTRACTOR.supported_file_globs
+    supported_info_kinds = GRUNTFILE_EXTRACTOR.supported_info_kinds
+
+    version = 2
+
+    # Files larger than this number of characters aren't parsed, their
+    # grunt calls are found by ``scan_grunt_calls`` instead.
+    max_parse_size = 256 * 1024
 
     def parse_file(self, fname, file_content):
+        """
+        Parses the top-level statements of the file which mention any of
+        the grunt methods holding the information. Files without any of
+        them aren't parsed at all, and files larger than
+        ``max_parse_size`` are only scanned.
+        """
+        if not GRUNT_METHOD_REGEX.search(file_content):
+            return {'type': 'Program', 'body': []}
+
+        if len(file_content) > self.max_parse_size:
+            logging.info('{} is too large to be parsed, its grunt tasks '
+                         'are searched for without their '
+                         'configuration.'.format(fname))
+            return scan_grunt_calls(file_content)
+
+        statements = split_statements(file_content)
+        if statements is not None:
+            relevant_statements = [
+                statement for statement in statements
+                if GRUNT_METHOD_REGEX.search(statement)]
+            if len(relevant_statements) < len(statements):
+                body = []
+                try:
+                    for statement in relevant_statements:
+                        body += PyJsParser().parse(statement)['body']
+                except Exception:
+                    # The statements weren't split right, the whole file
+                    # is parsed instead.
+                    pass
+                else:
+                    return {'type': 'Program', 'body': body}
+
         js_parser = PyJsParser()
         return js_parser.parse(file_content)
 
     def find_information(self, fname, parsed_file):
         results = []
 
-        npm_tasks = self.get_npm_tasks(parsed_file)
-        linters = self.extract_lint_subtasks(parsed_file)
-        config = self.get_configurations(parsed_file, linters)
+        calls = search_object_patterns(parsed_file, GRUNT_CALL_PATTERNS)
+        npm_tasks = self.get_npm_tasks(parsed_file, calls['loadNpmTasks'])
+        linters = self.extract_lint_subtasks(parsed_file,
+                                             calls['registerTask'])
+        config = self.get_configurations(parsed_file, linters,
+                                         calls['initConfig'])
 
         if npm_tasks:
             results.append(
@@ -54,7 +237,7 @@ class GruntfileInfoExtractor(InfoExtractor):
 
         return results
 
-    def extract_lint_subtasks(self, parsed_file):
+    def extract_lint_subtasks(self, parsed_file, search_results=None):
         """
         Extract the lint subtasks from the parsed JS file.
         Looks for identifiers like:
@@ -62,6 +245,9 @@ class GruntfileInfoExtractor(InfoExtractor):
 
         :param parsed_file:
             An instance of PyJsParser().parse
+        :param search_results:
+            The ``grunt.registerTask`` calls found in the parsed file, which
+            is searched if they aren't given.
         :return:
             A list of lint subtasks
         """
@@ -69,18 +255,9 @@ class GruntfileInfoExtractor(InfoExtractor):
         keys_to_match = ['lint']
 
         # Serch for grunt.registerTask() identifiers
-        search_results = search_object_recursively(parsed_file, 'callee', {
-            'computed': False,
-            'type': 'MemberExpression',
-            'property': {
-                'name': 'registerTask',
-                'type': 'Identifier',
-                },
-            'object': {
-                'name': 'grunt',
-                'type': 'Identifier',
-                }
-            })
+        if search_results is None:
+            search_results = search_object_recursively(
+                parsed_file, *GRUNT_CALL_PATTERNS['registerTask'])
 
         lint_subtasks = []
         is_lint = False
@@ -106,7 +283,7 @@ class GruntfileInfoExtractor(InfoExtractor):
 
         return lint_subtasks
 
-    def get_configurations(self, parsed_file, tasks):
+    def get_configurations(self, parsed_file, tasks, search_results=None):
         """
         Extract the configurations from the PyJsParser instance
         of a Gruntfile and return configuration data(if any) of
@@ -123,24 +300,16 @@ class GruntfileInfoExtractor(InfoExtractor):
         :param tasks:
             list of task names for which configurations are
             to be extracted.
+        :param search_results:
+            The ``grunt.initConfig`` calls found in the parsed file, which
+            is searched if they aren't given.
         :return:
             A list of configuration dicts
         """
         result = {}
-        search_results = search_object_recursively(
-            parsed_file, 'callee',
-            {
-                'computed': False,
-                'type': 'MemberExpression',
-                'property': {
-                    'name': 'initConfig',
-                    'type': 'Identifier',
-                },
-                'object': {
-                    'name': 'grunt',
-                    'type': 'Identifier',
-                }
-            })
+        if search_results is None:
+            search_results = search_object_recursively(
+                parsed_file, *GRUNT_CALL_PATTERNS['initConfig'])
 
         for s in search_results:
             if 'object' in s and 'arguments' in s['object']:
@@ -154,26 +323,19 @@ class GruntfileInfoExtractor(InfoExtractor):
 
         return result
 
-    def get_npm_tasks(self, parsed_file):
+    def get_npm_tasks(self, parsed_file, search_results=None):
         """
         Extracts the npm tasks used in the Gruntfile.
         Searches for the identifiers like:
         ``grunt.loadNpmTasks( "grunt-contrib-concat" );``
+
+        :param search_results:
+            The ``grunt.loadNpmTasks`` calls found in the parsed file, which
+            is searched if they aren't given.
         """
-        search_results = search_object_recursively(
-            parsed_file, 'callee',
-            {
-                'computed': False,
-                'type': 'MemberExpression',
-                'property': {
-                    'name': 'loadNpmTasks',
-                    'type': 'Identifier',
-                    },
-                'object': {
-                    'name': 'grunt',
-                    'type': 'Identifier',
-                    }
-            })
+        if search_results is None:
+            search_results = search_object_recursively(
+                parsed_file, *GRUNT_CALL_PATTERNS['loadNpmTasks'])
 
         tasks_found = []
 
@@ -5,20 +5,18 @@ from coala_quickstart.info_extraction.InfoExtractor import InfoExtractor
 from coala_quickstart.info_extraction.Information import (
     LicenseUsedInfo, ProjectDependencyInfo, IncludePathsInfo, ManFilesInfo,
     VersionInfo)
+from coala_quickstart.info_extractors.Registrations import (
+    PACKAGE_JSON_EXTRACTOR)
 
 
 class PackageJSONInfoExtractor(InfoExtractor):
-    supported_file_globs = ('package.json',)
+    supported_file_globs = PACKAGE_JSON_EXTRACTOR.supported_file_globs
 
     spec_references = [
         'https://docs.npmjs.com/files/package.json',
         'https://gitlab.com/coala/GSoC-2017/issues/167']
 
-    supported_info_kinds = (
-        LicenseUsedInfo,
-        ProjectDependencyInfo,
-        IncludePathsInfo,
-        ManFilesInfo)
+    supported_info_kinds = PACKAGE_JSON_EXTRACTOR.supported_info_kinds
 
     def parse_file(self, fname, file_content):
         parsed_file = {}
@@ -0,0 +1,44 @@
+from coala_quickstart.info_extraction.ExtractorRegistry import (
+    ExtractorRegistration)
+from coala_quickstart.info_extraction.Information import (
+    CharsetInfo, FinalNewlineInfo, IncludePathsInfo, IndentSizeInfo,
+    IndentStyleInfo, LicenseUsedInfo, LineBreaksInfo, LintTaskInfo,
+    ManFilesInfo, MentionedTasksInfo, ProjectDependencyInfo,
+    TrailingWhitespaceInfo, VersionInfo)
+
+# The registrations of the extractors shipped with coala-quickstart. They
+# are declared as entry points in setup.py and the extractor classes take
+# their globs and kinds of information from them.
+
+EDITORCONFIG_EXTRACTOR = ExtractorRegistration(
+    'editorconfig', ('.editorconfig',),
+    'coala_quickstart.info_extractors.EditorconfigInfoExtractor',
+    'EditorconfigInfoExtractor',
+    (IndentStyleInfo, IndentSizeInfo, TrailingWhitespaceInfo,
+     FinalNewlineInfo, CharsetInfo, LineBreaksInfo))
+
+PACKAGE_JSON_EXTRACTOR = ExtractorRegistration(
+    'package_json', ('package.json',),
+    'coala_quickstart.info_extractors.PackageJSONInfoExtractor',
+    'PackageJSONInfoExtractor',
+    (LicenseUsedInfo, ProjectDependencyInfo, IncludePathsInfo,
+     ManFilesInfo))
+
+GEMFILE_EXTRACTOR = ExtractorRegistration(
+    'gemfile', ('Gemfile',),
+    'coala_quickstart.info_extractors.GemfileInfoExtractor',
+    'GemfileInfoExtractor',
+    (ProjectDependencyInfo, VersionInfo))
+
+GRUNTFILE_EXTRACTOR = ExtractorRegistration(
+    'gruntfile', ('Gruntfile.js',),
+    'coala_quickstart.info_extractors.GruntfileInfoExtractor',
+    'GruntfileInfoExtractor',
+    (LintTaskInfo, MentionedTasksInfo))
+
+# The extractors in the order their information is aggregated, as
+# setuptools sorts the entry points by name. Their entry points are only
+# missing when coala-quickstart runs from a source checkout, this tuple
+# is used instead then.
+BUILTIN_EXTRACTORS = (EDITORCONFIG_EXTRACTOR, PACKAGE_JSON_EXTRACTOR,
+                      GEMFILE_EXTRACTOR, GRUNTFILE_EXTRACTOR)
@@ -1,3 +1,101 @@
+SUPPORTED_TYPES = (list, tuple, dict)
+
+
+def _iter_list_items(search_list, path, idx, patterns):
+    for offset, item in enumerate(search_list, 1):
+        yield None, None, item, path, idx + offset, patterns
+
+
+def _iter_dict_items(search_dict, path, idx, patterns):
+    for key, value in search_dict.items():
+        yield search_dict, key, value, path, idx, patterns
+
+
+def _get_path(link):
+    """
+    Returns the path of a link of the ``(parent link, path components)``
+    chain built by ``iter_search_object``.
+    """
+    components = []
+    while link is not None:
+        link, link_components = link
+        components.append(link_components)
+    return tuple(component for link_components in reversed(components)
+                 for component in link_components)
+
+
+def iter_search_object(search_object, patterns, prepath=(), idx=-1):
+    """
+    Searches for several key and value patterns in an object containing
+    nested lists, tuples and dicts, in a single traversal. The object is
+    traversed with an explicit stack, so deeply nested objects don't hit
+    the recursion limit.
+
+    >>> obj = {'a': [{'b': 1}, {'b': 2, 'c': {'b': 1}}]}
+    >>> for index, result in iter_search_object(obj, [('b', 1), ('c', None)]):
+    ...     print(index, result['path'])
+    0 ('a', 0, 'b')
+    1 ('a', 1, 'c')
+    0 ('a', 1, 'c', 'b')
+
+    :param search_object:
+        object to be searched
+    :param patterns:
+        A list of ``(key, value)`` tuples, matched like the ``key`` and
+        ``value`` parameters of ``search_object_recursively``.
+    :param prepath:
+        path of the ``search_object`` from the root object.
+    :param idx:
+        index of the ``search_object`` in its parent list, if any.
+    :return:
+        A generator of tuples of the index of the matching pattern and a
+        result as returned by ``search_object_recursively``, in the order
+        they are found.
+    """
+    # Every frame of the stack iterates over the children of a list or a
+    # dict. The paths are chains of ``(parent link, path components)``
+    # links, only turned into tuples for the results. The patterns matching
+    # the key of a dict item aren't searched for any further in its value.
+    stack = [iter([(None, None, search_object, (None, prepath), idx,
+                    tuple(enumerate(patterns)))])]
+    while stack:
+        item = next(stack[-1], None)
+        if item is None:
+            stack.pop()
+            continue
+
+        parent, key, obj, path, idx, active_patterns = item
+        if parent is not None:
+            path = (path, (key,) if idx < 0 else (idx, key))
+            if any(pattern_key == key
+                   for _, (pattern_key, _) in active_patterns):
+                remaining_patterns = []
+                for index, (pattern_key, pattern_value) in active_patterns:
+                    if pattern_key != key:
+                        remaining_patterns.append(
+                            (index, (pattern_key, pattern_value)))
+                    elif pattern_value is None:
+                        yield index, {'object': obj,
+                                      'path': _get_path(path)}
+                    elif obj == pattern_value:
+                        yield index, {'object': parent,
+                                      'path': _get_path(path)}
+                if not remaining_patterns:
+                    continue
+                active_patterns = tuple(remaining_patterns)
+            if not isinstance(obj, SUPPORTED_TYPES):
+                continue
+            idx = -1
+
+        if isinstance(obj, (list, tuple)):
+            stack.append(_iter_list_items(obj, path, idx, active_patterns))
+        elif isinstance(obj, dict):
+            stack.append(_iter_dict_items(obj, path, idx, active_patterns))
+        else:
+            raise TypeError(
+                'The object to be searched should only contain these '
+                'types: {}'.format(','.join([str(t)
+                                             for t in SUPPORTED_TYPES])))
 
 
 def search_object_recursively(search_object,
@@ -30,38 +128,35 @@ def search_object_recursively(search_object,
                     `search_object`
         }
     """
-    results = []
-    supported_types = (list, tuple, dict)
-
-    if isinstance(search_object, (list, tuple)):
-        for i in search_object:
-            idx += 1
-            results += search_object_recursively(
-                i, key, value=value, prepath=prepath, idx=idx)
-
-    elif isinstance(search_object, dict):
-        for k, v in search_object.items():
-            path = prepath + (k,) if idx < 0 else prepath + (idx, k,)
-            if k == key:
-                if value is not None and v == value:
-                    results.append({
-                        'object': search_object,
-                        'path': path,
-                    })
-                elif value is None:
-                    results.append({
-                        'object': v,
-                        'path': path,
-                    })
-            elif isinstance(v, supported_types):
-                results += search_object_recursively(v,
-                                                     key,
-                                                     value=value,
-                                                     prepath=path,
-                                                     idx=-1)
-    else:
-        raise TypeError(
-            'The object to be searched should only contain these types: {}'
-            .format(','.join([str(t) for t in supported_types])))
+    return [result for _, result in iter_search_object(
+        search_object, [(key, value)], prepath, idx)]
+
+
+def search_object_patterns(search_object, patterns):
+    """
+    Searches for several patterns like ``search_object_recursively``, in a
+    single traversal of the object.
 
+    >>> results = search_object_patterns(
+    ...     {'a': {'b': 1}, 'c': [{'b': 2}]},
+    ...     {'a': ('a', None), 'b': ('b', None)})
+    >>> [result['path'] for result in results['a']]
+    [('a',)]
+    >>> [result['path'] for result in results['b']]
+    [('a', 'b'), ('c', 0, 'b')]
+
+    :param search_object:
+        object to be searched
+    :param patterns:
+        A dict with names as keys and ``(key, value)`` tuples as values.
+    :return:
+        A dict with the names of the patterns as keys and the lists of
+        their results, as returned by ``search_object_recursively``, as
+        values.
+    """
+    names = list(patterns)
+    results = {name: [] for name in names}
+    for index, result in iter_search_object(
+            search_object, [patterns[name] for name in names]):
+        results[names[index]].append(result)
     return results
@@ -5,7 +5,10 @@ import os
 import platform
 import sys
 
-from setuptools import find_packages, setup
+import distutils.log
+from distutils.errors import DistutilsError
+
+from setuptools import Command, find_packages, setup
 from setuptools.command.test import test as TestCommand
 
 try:
@@ -56,6 +59,47 @@ class PyTestCommand(TestCommand):
 SETUP_COMMANDS['test'] = PyTestCommand
 
 
+class BuildBearSnapshotCommand(Command):
+    """
+    Writes the metadata of the bears of the installed coala-bears to
+    ``coala_quickstart/bear_snapshot.json``, so coala-quickstart doesn't
+    have to import the bears on its first run.
+    """
+    description = 'build the snapshot of the pinned coala-bears metadata'
+    user_options = []
+
+    def initialize_options(self):
+        pass
+
+    def finalize_options(self):
+        pass
+
+    def run(self):
+        import pkg_resources
+        from coala_quickstart.generation.BearCatalog import (
+            BearCatalog, SNAPSHOT_PATH)
+
+        for line in read_requirements('requirements.txt'):
+            requirement = pkg_resources.Requirement.parse(line)
+            if requirement.key == 'coala-bears':
+                break
+        else:
+            raise DistutilsError('coala-bears is not pinned in '
+                                 'requirements.txt')
+        installed = pkg_resources.get_distribution(requirement.key)
+        if installed not in requirement:
+            raise DistutilsError('coala-bears {} is installed, the snapshot '
+                                 'must be built with {}'.format(
+                                     installed.version, requirement))
+
+        catalog = BearCatalog.save_snapshot()
+        self.announce('wrote the metadata of {} bears to {}'.format(
+            len(catalog), SNAPSHOT_PATH), level=distutils.log.INFO)
+
+
+SETUP_COMMANDS['build_bear_snapshot'] = BuildBearSnapshotCommand
+
+
 __dir__ = os.path.dirname(__file__)
 
 
@@ -338,12 +382,14 @@ if __name__ == '__main__':
                             'c.adhityaa@gmail.com'),
           url='https://github.com/coala/coala-quickstart',
           platforms='any',
-          packages=find_packages(exclude=('build.*', 'tests', 'tests.*')),
+          packages=find_packages(exclude=('build.*', 'tests', 'tests.*',
+                                          'benchmarks', 'benchmarks.*')),
           install_requires=required,
           extras_require=EXTRAS_REQUIRE,
           tests_require=test_required,
           dependency_links=DEPENDENCY_LINKS,
-          package_data={'coala_quickstart': ['VERSION']},
+          package_data={'coala_quickstart': ['VERSION',
+                                             'bear_snapshot.json']},
           license='AGPL-3.0',
           data_files=data_files,
           long_description=long_description,
@@ -351,6 +397,18 @@ if __name__ == '__main__':
               'console_scripts': [
                   'coala-quickstart = coala_quickstart.coala_quickstart:main',
               ],
+              # The extractors shipped with coala-quickstart, aggregated in
+              # the order of BUILTIN_EXTRACTORS.
+              'coala_quickstart.info_extractors': [
+                  'editorconfig = coala_quickstart.info_extractors.'
+                  'Registrations:EDITORCONFIG_EXTRACTOR',
+                  'package_json = coala_quickstart.info_extractors.'
+                  'Registrations:PACKAGE_JSON_EXTRACTOR',
+                  'gemfile = coala_quickstart.info_extractors.'
+                  'Registrations:GEMFILE_EXTRACTOR',
+                  'gruntfile = coala_quickstart.info_extractors.'
+                  'Registrations:GRUNTFILE_EXTRACTOR',
+              ],
           },
           # from http://pypi.python.org/pypi?%3Aaction=list_classifiers
           classifiers=[
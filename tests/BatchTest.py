@@ -0,0 +1,154 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import unittest.mock
+
+from coala_utils.ContextManagers import retrieve_stdout
+
+from coala_quickstart.Batch import (
+    get_subproject_ignore_globs, main, read_repos_file)
+from coala_quickstart.coala_quickstart import main as quickstart_main
+
+
+class BatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.project_dirs = []
+        for name, file_name in (('python', 'test.py'),
+                                ('javascript', 'test.js')):
+            project_dir = os.path.join(self.work_dir, name)
+            os.mkdir(project_dir)
+            with open(os.path.join(project_dir, file_name), 'w'):
+                pass
+            self.project_dirs.append(project_dir)
+        self.missing_dir = os.path.join(self.work_dir, 'missing')
+        self.repos_file = os.path.join(self.work_dir, 'repos.txt')
+        with open(self.repos_file, 'w') as repos_file:
+            repos_file.write('# The projects to generate the coafiles of\n'
+                             '{}\n\n{}\n{}\n'.format(self.project_dirs[0],
+                                                     self.missing_dir,
+                                                     self.project_dirs[1]))
+        self.summary_path = os.path.join(self.work_dir, 'summary.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def test_read_repos_file(self):
+        self.assertEqual(read_repos_file(self.repos_file),
+                         [self.project_dirs[0], self.missing_dir,
+                          self.project_dirs[1]])
+
+    def run_batch(self, jobs):
+        old_argv = sys.argv
+        with retrieve_stdout() as stdout:
+            summary = main(['--repos-file', self.repos_file,
+                            '--jobs', str(jobs),
+                            '--summary', self.summary_path,
+                            '--no-cache',
+                            '--allow-incomplete-sections'])
+            output = stdout.getvalue()
+        self.assertIs(sys.argv, old_argv)
+        self.assertIn('2 coafiles generated, 1 failed.', output)
+
+        with open(self.summary_path) as summary_file:
+            self.assertEqual(json.load(summary_file), summary)
+        self.assertEqual(summary['jobs'], jobs)
+        self.assertEqual(
+            [(result['project_dir'], result['status'])
+             for result in summary['repos']],
+            [(self.project_dirs[0], 'generated'),
+             (self.missing_dir, 'failed'),
+             (self.project_dirs[1], 'generated')])
+        self.assertIn('does not exist', summary['repos'][1]['error'])
+        self.assertIn('write_coafile', summary['repos'][0]['stages'])
+
+        for project_dir, section in zip(self.project_dirs,
+                                        ('[all.python]',
+                                         '[all.javascript]')):
+            with open(os.path.join(project_dir, '.coafile')) as coafile:
+                self.assertIn(section, coafile.read())
+
+    def test_in_process(self):
+        self.run_batch(1)
+
+    def test_worker_processes(self):
+        self.run_batch(2)
+
+    def test_batch_command(self):
+        with unittest.mock.patch.object(
+                sys, 'argv', ['coala-quickstart', 'batch', '--repos-file',
+                              self.repos_file]), \
+                unittest.mock.patch('coala_quickstart.Batch.main') as batch:
+            quickstart_main()
+        batch.assert_called_once_with(['--repos-file', self.repos_file])
+
+    def test_monorepo(self):
+        os.mkdir(os.path.join(self.work_dir, 'services'))
+        for name in ('python', 'javascript'):
+            shutil.move(os.path.join(self.work_dir, name),
+                        os.path.join(self.work_dir, 'services', name))
+        for fname in (os.path.join('services', 'python', 'setup.py'),
+                      os.path.join('services', 'javascript',
+                                   'package.json')):
+            with open(os.path.join(self.work_dir, fname), 'w') as file:
+                file.write('{}' if fname.endswith('.json') else '')
+        with open(os.path.join(self.work_dir, '.gitignore'), 'w') as file:
+            file.write('node_modules\n/services/python/dist\n/build\n')
+        old_cwd = os.getcwd()
+        os.chdir(self.work_dir)
+        try:
+            with unittest.mock.patch.object(
+                    sys, 'argv', ['coala-quickstart', '--ci', '--no-cache',
+                                  '--monorepo', '--jobs', '2',
+                                  '--allow-incomplete-sections']), \
+                    retrieve_stdout() as stdout:
+                quickstart_main()
+                output = stdout.getvalue()
+        finally:
+            os.chdir(old_cwd)
+
+        # The root project's coafile excludes the nested subprojects, which
+        # get coafiles of their own.
+        self.assertIn('3 coafiles generated, 0 failed.', output)
+        with open(os.path.join(self.work_dir, '.coafile')) as coafile:
+            content = coafile.read()
+        self.assertIn(os.path.join('services', 'python', '**'), content)
+        self.assertIn(os.path.join('services', 'javascript', '**'), content)
+        for name, section, other_section in (
+                ('python', '[all.python]', 'javascript'),
+                ('javascript', '[all.javascript]', 'python')):
+            with open(os.path.join(self.work_dir, 'services', name,
+                                   '.coafile')) as coafile:
+                content = coafile.read()
+            self.assertIn(section, content)
+            self.assertNotIn('[all.' + other_section, content)
+            ignores = self.get_ignore_field(content)
+            self.assertIn(os.path.join('**', 'node_modules', '**'), ignores)
+            self.assertNotIn('build', ignores)
+            self.assertFalse(any(glob.startswith('..') for glob in ignores))
+            self.assertEqual(name == 'python',
+                             os.path.join('dist', '**') in ignores)
+
+    def get_ignore_field(self, content):
+        for line in content.splitlines():
+            if line.startswith('ignore = '):
+                return line[len('ignore = '):].split(', ')
+        return []
+
+    def test_subproject_ignore_globs(self):
+        root = os.path.join(self.work_dir, 'repo')
+        sub = os.path.join(root, 'services', 'python')
+        self.assertEqual(
+            get_subproject_ignore_globs(
+                [os.path.join(root, '**', 'build', '**'),
+                 os.path.join(root, 'build', '**'),
+                 os.path.join(sub, 'dist', '**'),
+                 os.path.join(root, 'services', '**', 'build', '**'),
+                 os.path.join(root, 'other', '**', 'tmp')],
+                sub),
+            [os.path.join(sub, '**', 'build', '**'),
+             os.path.join(sub, 'dist', '**')])
@@ -0,0 +1,150 @@
+import builtins
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+
+from pyprint.ConsolePrinter import ConsolePrinter
+
+from coala_quickstart.coala_quickstart import main
+from coala_quickstart.Profiling import (
+    Profiler, count_file_accesses, record_file_access)
+from coala_quickstart.generation.ProjectIndex import ProjectIndex
+from coala_utils.ContextManagers import retrieve_stdout
+
+
+class ProfilerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_disabled(self):
+        profiler = Profiler(enabled=False)
+        with profiler.stage('stage') as profile:
+            self.assertIsNone(profile)
+        self.assertEqual(profiler.stages, [])
+
+    def test_stage(self):
+        path = os.path.join(self.temp_dir, 'file')
+        profiler = Profiler()
+        with profiler.stage('write'):
+            for _ in range(3):
+                record_file_access(path)
+                with open(path, 'w') as file:
+                    file.write('data')
+            record_file_access(self.temp_dir)
+
+        stage, = profiler.stages
+        self.assertEqual(stage.name, 'write')
+        self.assertEqual(stage.files_touched, 2)
+        self.assertGreaterEqual(stage.wall_time, 0)
+        self.assertGreaterEqual(stage.cpu_time, 0)
+        # Nothing is patched.
+        self.assertIs(builtins.open, io.open)
+
+    def test_timing_only(self):
+        profiler = Profiler(count_files=False)
+        with profiler.stage('stage'):
+            record_file_access(self.temp_dir)
+
+        stage, = profiler.stages
+        self.assertIsNone(stage.files_touched)
+        self.assertGreaterEqual(stage.wall_time, 0)
+        self.assertIsNone(profiler.as_dict()['total']['files_touched'])
+        with retrieve_stdout() as custom_stdout:
+            profiler.print_report(ConsolePrinter())
+            self.assertIn('stage', custom_stdout.getvalue())
+
+    def test_project_index(self):
+        for name in ('main.py', 'run', 'tool'):
+            with open(os.path.join(self.temp_dir, name), 'w') as file:
+                file.write('#!/bin/sh\n')
+        profiler = Profiler()
+        with profiler.stage('index'):
+            project_index = ProjectIndex.build(self.temp_dir)
+            project_index.sniff(jobs=2)
+
+        stage, = profiler.stages
+        self.assertEqual(stage.files_touched, 4)
+
+    def test_worker_threads(self):
+        paths = [os.path.join(self.temp_dir, str(i)) for i in range(4)]
+        profiler = Profiler()
+        with profiler.stage('threads'), ThreadPoolExecutor(2) as executor:
+            list(executor.map(count_file_accesses(record_file_access),
+                              paths))
+            # Threads which aren't given the counters aren't counted.
+            executor.submit(record_file_access, self.temp_dir).result()
+
+        stage, = profiler.stages
+        self.assertEqual(stage.files_touched, 4)
+
+    def test_report(self):
+        profiler = Profiler()
+        with profiler.stage('first'):
+            pass
+        with profiler.stage('second'):
+            pass
+
+        with retrieve_stdout() as custom_stdout:
+            profiler.print_report(ConsolePrinter())
+            report = custom_stdout.getvalue()
+        self.assertIn('first', report)
+        self.assertIn('second', report)
+        self.assertIn('Total', report)
+
+        json_path = os.path.join(self.temp_dir, 'profile.json')
+        profiler.write_json(json_path)
+        with open(json_path) as json_file:
+            data = json.load(json_file)
+        self.assertEqual([stage['name'] for stage in data['stages']],
+                         ['first', 'second'])
+        self.assertEqual(data['total']['files_touched'], 0)
+
+
+class ProfileOptionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.old_argv = deepcopy(sys.argv)
+        del sys.argv[1:]
+        self.orig_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        sys.argv = self.old_argv
+        os.chdir(self.orig_cwd)
+        shutil.rmtree(self.temp_dir)
+
+    def test_profile_json(self):
+        json_path = os.path.join(self.temp_dir, 'profile.json')
+        sys.argv.extend(['--ci', '--no-cache', '--profile',
+                         '--profile-json', json_path])
+        os.chdir(os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                              'generation', 'bears_ci_testfiles'))
+        with retrieve_stdout() as custom_stdout:
+            main()
+            self.assertIn('Time and resources used by each stage',
+                          custom_stdout.getvalue())
+        os.remove('.coafile')
+
+        with open(json_path) as json_file:
+            data = json.load(json_file)
+        self.assertCountEqual([stage['name'] for stage in data['stages']],
+                              ['get_project_files',
+                               'get_used_languages',
+                               'collect_info',
+                               'load_bear_catalog',
+                               'filter_relevant_bears',
+                               'get_non_optional_settings_bears',
+                               'generate_settings',
+                               'write_coafile'])
+        stages = {stage['name']: stage for stage in data['stages']}
+        self.assertGreater(stages['get_project_files']['files_touched'], 0)
@@ -0,0 +1,124 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import unittest.mock
+
+from coala_quickstart.Session import QuickstartSession
+from coala_quickstart.generation.BearCatalog import BearCatalog
+from coala_quickstart.generation.ScanCache import ScanCache
+
+
+class QuickstartSessionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.project_dir = tempfile.mkdtemp()
+        self.cache_root = tempfile.mkdtemp()
+        for file_name in ('main.py', 'index.js'):
+            with open(os.path.join(self.project_dir, file_name), 'w'):
+                pass
+        # Directories modified right before the scan are never trusted.
+        os.utime(self.project_dir, (1000000000, 1000000000))
+
+    def tearDown(self):
+        shutil.rmtree(self.project_dir)
+        shutil.rmtree(self.cache_root)
+
+    def test_generate(self):
+        session = QuickstartSession(incomplete_sections=True,
+                                    use_cache=False)
+
+        # The command line isn't parsed.
+        with unittest.mock.patch.object(
+                sys, 'argv', ['tool', '--unknown-option']):
+            result = session.generate(self.project_dir)
+
+        self.assertEqual(result.project_dir, self.project_dir)
+        self.assertEqual(sorted(language for language, _ in result.languages),
+                         ['JavaScript', 'Python'])
+        self.assertEqual(sorted(result.bears),
+                         ['all', 'all.JavaScript', 'all.Python'])
+        self.assertIn('PycodestyleBear', result.bears['all.Python'])
+        self.assertEqual(str(result.settings['all.Python']['files']),
+                         '**.py')
+        self.assertEqual(result.ignore_globs, [])
+        self.assertIn('filter_relevant_bears',
+                      [stage['name'] for stage in result.timings['stages']])
+        # Only the times are measured by default.
+        self.assertIsNone(result.timings['total']['files_touched'])
+        self.assertIsNone(result.coafile)
+        self.assertFalse(os.path.exists(
+            os.path.join(self.project_dir, '.coafile')))
+
+        data = json.loads(json.dumps(result.as_dict()))
+        self.assertEqual(data['bears']['all.Python'],
+                         result.bears['all.Python'])
+        self.assertEqual(data['settings']['all.Python']['files'], '**.py')
+
+    def test_write(self):
+        session = QuickstartSession(incomplete_sections=True,
+                                    use_cache=False)
+        result = session.generate(self.project_dir, write=True)
+
+        self.assertEqual(result.coafile,
+                         os.path.join(self.project_dir, '.coafile'))
+        with open(result.coafile) as coafile:
+            self.assertIn('[all.python]', coafile.read())
+
+    def test_warm_caches(self):
+        session = QuickstartSession(incomplete_sections=True,
+                                    cache_root=self.cache_root)
+        with unittest.mock.patch.object(
+                BearCatalog, 'load', wraps=BearCatalog.load) as load:
+            first = session.generate(self.project_dir)
+            with unittest.mock.patch(
+                    'coala_quickstart.generation.ScanCache.scan_dir') as scan:
+                second = session.generate(self.project_dir)
+                self.assertFalse(scan.called)
+        load.assert_called_once_with(
+            cache_root=self.cache_root, use_cache=True, rebuild=False,
+            args=unittest.mock.ANY)
+        self.assertEqual(list(first.settings), list(second.settings))
+        # The listings are only written to disk on request.
+        self.assertFalse(os.path.exists(
+            ScanCache(self.project_dir, self.cache_root).path))
+
+    def test_bounded_memory(self):
+        session = QuickstartSession(incomplete_sections=True,
+                                    use_cache=False)
+        other_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, other_dir)
+        with unittest.mock.patch.object(
+                QuickstartSession, 'MAX_SCAN_CACHES', 1):
+            session.generate(self.project_dir)
+            session.generate(other_dir)
+            with unittest.mock.patch(
+                    'coala_quickstart.generation.ScanCache.scan_dir',
+                    return_value=[]) as scan:
+                session.generate(self.project_dir)
+                # The listings of the first project were dropped.
+                self.assertTrue(scan.called)
+
+        session.clear()
+        with unittest.mock.patch(
+                'coala_quickstart.generation.ScanCache.scan_dir',
+                return_value=[]) as scan:
+            session.generate(self.project_dir)
+            self.assertTrue(scan.called)
+
+    def test_scan_cache(self):
+        session = QuickstartSession(incomplete_sections=True,
+                                    scan_cache=True,
+                                    cache_root=self.cache_root)
+        session.generate(self.project_dir)
+        self.assertTrue(os.path.exists(
+            ScanCache(self.project_dir, self.cache_root).path))
+
+    def test_count_files(self):
+        session = QuickstartSession(incomplete_sections=True,
+                                    use_cache=False, count_files=True)
+        result = session.generate(self.project_dir)
+        stages = {stage['name']: stage for stage in result.timings['stages']}
+        self.assertGreater(stages['get_project_files']['files_touched'], 0)
@@ -0,0 +1,92 @@
+import threading
+import unittest
+
+from coala_quickstart.Profiling import Profiler
+from coala_quickstart.StageScheduler import StageScheduler
+
+
+class StageSchedulerTest(unittest.TestCase):
+
+    def test_dependencies(self):
+        order = []
+
+        def stage(*results, label):
+            order.append(label)
+            return results + (label,)
+
+        with StageScheduler() as scheduler:
+            scheduler.add('a', stage, label='a')
+            scheduler.add('b', stage, label='b', requires=('a',))
+            scheduler.add('c', stage, label='c', requires=('b', 'a'))
+            self.assertEqual(scheduler.result('c'),
+                             ((('a',), 'b'), ('a',), 'c'))
+        self.assertEqual(order, ['a', 'b', 'c'])
+
+    def test_overlap(self):
+        # Both stages wait for each other, so they only end if they run
+        # at the same time.
+        barrier = threading.Barrier(3, timeout=5)
+        with StageScheduler() as scheduler:
+            scheduler.add('first', barrier.wait)
+            scheduler.add('second', barrier.wait)
+            scheduler.run('caller', barrier.wait)
+            scheduler.result('first')
+            scheduler.result('second')
+
+    def test_run_in_caller(self):
+        with StageScheduler() as scheduler:
+            self.assertEqual(scheduler.run('ident', threading.get_ident),
+                             threading.get_ident())
+            scheduler.add('ident', threading.get_ident)
+            self.assertNotEqual(scheduler.result('ident'),
+                                threading.get_ident())
+
+    def test_failure(self):
+        def fail():
+            raise ValueError('failed')
+
+        with StageScheduler() as scheduler:
+            scheduler.add('fail', fail)
+            scheduler.add('dependent', lambda result: result,
+                          requires=('fail',))
+            with self.assertRaisesRegex(ValueError, 'failed'):
+                scheduler.result('dependent')
+            with self.assertRaisesRegex(ValueError, 'failed'):
+                scheduler.result('fail')
+
+    def test_duplicate_stage(self):
+        with StageScheduler() as scheduler:
+            scheduler.add('stage', int)
+            with self.assertRaises(ValueError):
+                scheduler.add('stage', int)
+
+    def test_profiler(self):
+        profiler = Profiler()
+        with StageScheduler(profiler) as scheduler:
+            scheduler.add('background', int)
+            scheduler.run('caller', int)
+            scheduler.result('background')
+        self.assertCountEqual([stage.name for stage in profiler.stages],
+                              ['background', 'caller'])
+
+    def test_cancel(self):
+        started = threading.Event()
+
+        def wait_for_cancel(cancel_event):
+            started.set()
+            return cancel_event.wait(5)
+
+        with StageScheduler() as scheduler:
+            scheduler.add('wait', wait_for_cancel, cancellable=True)
+            started.wait(5)
+            scheduler.cancel('wait')
+            self.assertTrue(scheduler.result('wait'))
+
+    def test_cancel_pending(self):
+        with StageScheduler(max_workers=1) as scheduler:
+            blocker = threading.Event()
+            scheduler.add('blocker', blocker.wait, 5)
+            future = scheduler.add('pending', int)
+            scheduler.cancel('pending')
+            blocker.set()
+            self.assertTrue(future.cancelled())
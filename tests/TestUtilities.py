@@ -2,6 +2,8 @@ import os
 import unittest.mock
 from contextlib import contextmanager
 
+from coala_quickstart.generation.BearCatalog import _loaded_catalogs
+
 
 @contextmanager
 def generate_files(fnames, file_contents, directory=os.getcwd()):
@@ -34,7 +36,8 @@ def bear_test_module():
     """
     This function mocks the ``pkg_resources.iter_entry_points()``
     to use the testing bear module we have. Hence, it doesn't test
-    the collection of entry points.
+    the collection of entry points. The bear catalogs loaded before
+    are hidden meanwhile, as they hold the installed bears.
     """
     bears_test_module = os.path.join(os.path.dirname(__file__),
                                      'test_bears', '__init__.py')
@@ -48,5 +51,6 @@ def bear_test_module():
             return PseudoPlugin()
 
     with unittest.mock.patch('pkg_resources.iter_entry_points',
-                             return_value=[EntryPoint()]) as mocked:
+                             return_value=[EntryPoint()]) as mocked, \
+            unittest.mock.patch.dict(_loaded_catalogs, clear=True):
         yield
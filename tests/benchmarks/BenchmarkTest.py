@@ -0,0 +1,92 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from coala_utils.ContextManagers import retrieve_stdout
+
+from benchmarks.Benchmark import main, run_stages
+from benchmarks.SyntheticProject import generate_project
+from coala_quickstart.generation.BearCatalog import BearCatalog
+from coala_quickstart.generation.Project import get_used_languages
+from coala_quickstart.generation.ProjectIndex import ProjectIndex
+from coala_quickstart.generation.Utilities import GitignoreMatcher
+
+STAGES = ['get_project_files',
+          'get_used_languages',
+          'collect_info',
+          'filter_relevant_bears',
+          'get_non_optional_settings_bears',
+          'generate_settings']
+
+
+class SyntheticProjectTest(unittest.TestCase):
+
+    def setUp(self):
+        self.project_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.project_dir)
+
+    def test_generate_project(self):
+        project = generate_project(self.project_dir, files=230, depth=2,
+                                   languages=('Python', 'Shell'),
+                                   gitignores=3)
+        self.assertEqual(project['directories'], 5)
+        self.assertEqual(sum(project['languages'].values()), 230)
+        self.assertEqual(project['ignored_files'], 6)
+        self.assertEqual(project['context_files'],
+                         ['.editorconfig', 'package.json', 'Gemfile',
+                          'Gruntfile.js'])
+
+        index = ProjectIndex.build(
+            self.project_dir,
+            ignore_matcher=GitignoreMatcher(self.project_dir))
+        self.assertEqual(len(index), 230 + 3 + 4)
+        self.assertAlmostEqual(dict(get_used_languages(index))['Shell'],
+                               100 * project['languages']['Shell'] / 237)
+
+    def test_deterministic(self):
+        other_dir = tempfile.mkdtemp()
+        try:
+            self.assertEqual(generate_project(self.project_dir, files=100,
+                                              seed=3),
+                             generate_project(other_dir, files=100, seed=3))
+        finally:
+            shutil.rmtree(other_dir)
+
+    def test_run_stages(self):
+        generate_project(self.project_dir, files=100)
+        stages = run_stages(self.project_dir, BearCatalog())
+        self.assertEqual(list(stages), STAGES)
+        self.assertFalse(os.path.exists(
+            os.path.join(self.project_dir, '.coafile')))
+
+
+class BenchmarkTest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def test_main(self):
+        output = os.path.join(self.work_dir, 'results.json')
+        with retrieve_stdout() as custom_stdout:
+            main(['--sizes', '10', '50', '--work-dir', self.work_dir,
+                  '--output', output])
+            self.assertIn('50 files:', custom_stdout.getvalue())
+
+        with open(output) as results_file:
+            results = json.load(results_file)
+        self.assertEqual([result['files'] for result in results['results']],
+                         [10, 50])
+        self.assertEqual(list(results['results'][0]['stages']), STAGES)
+        self.assertEqual(os.listdir(self.work_dir), ['results.json'])
+
+        with retrieve_stdout() as custom_stdout:
+            main(['--sizes', '10', '--work-dir', self.work_dir,
+                  '--compare', output])
+            self.assertIn('Compared with', custom_stdout.getvalue())
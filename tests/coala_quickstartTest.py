@@ -0,0 +1,145 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+import unittest.mock
+from copy import deepcopy
+
+from coala_utils.ContextManagers import (
+    retrieve_stdout, simulate_console_inputs)
+
+from coala_quickstart.coala_quickstart import main
+from coala_quickstart.generation.BearCatalog import BearCatalog
+from coala_quickstart.generation.ProjectIndex import ProjectIndex
+from coala_quickstart.StageScheduler import StageScheduler
+
+
+class InteractivePrefetchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.old_argv = deepcopy(sys.argv)
+        sys.argv[1:] = ['--no-cache', '--allow-incomplete-sections']
+        self.orig_cwd = os.getcwd()
+        self.default_dir = tempfile.mkdtemp()
+        self.other_dir = tempfile.mkdtemp()
+        for project_dir, name in ((self.default_dir, 'default.py'),
+                                  (self.other_dir, 'other.js')):
+            for file_name, content in ((name, ''),
+                                       ('.gitignore', '*.pyc\n')):
+                with open(os.path.join(project_dir, file_name), 'w') as file:
+                    file.write(content)
+        os.chdir(self.default_dir)
+
+    def tearDown(self):
+        sys.argv = self.old_argv
+        os.chdir(self.orig_cwd)
+        shutil.rmtree(self.default_dir)
+        shutil.rmtree(self.other_dir)
+
+    def run_main(self, project_dir_answer):
+        with retrieve_stdout(), \
+                simulate_console_inputs(project_dir_answer, '', ''), \
+                unittest.mock.patch.object(
+                    ProjectIndex, 'build',
+                    wraps=ProjectIndex.build) as build, \
+                unittest.mock.patch.object(
+                    BearCatalog, 'import_bears', return_value=0), \
+                unittest.mock.patch.object(
+                    StageScheduler, 'add', autospec=True,
+                    side_effect=StageScheduler.add) as add:
+            main()
+        return build, [call[0][1] for call in add.call_args_list]
+
+    def test_default_project_dir(self):
+        build, stages = self.run_main('')
+
+        # The scan started during the prompt is used.
+        build.assert_called_once_with(
+            self.default_dir, ignore_matcher=unittest.mock.ANY, cache=None,
+            cancel_event=unittest.mock.ANY)
+        self.assertEqual(stages, ['load_bear_catalog',
+                                  'prefetch_project_index',
+                                  'collect_info',
+                                  'import_bears'])
+        with open(os.path.join(self.default_dir, '.coafile')) as coafile:
+            self.assertIn('[all.python]', coafile.read())
+
+    def test_other_project_dir(self):
+        build, _ = self.run_main(self.other_dir)
+
+        # The scan of the default directory is discarded.
+        self.assertEqual(build.call_args[0], (self.other_dir,))
+        self.assertFalse(os.path.exists(
+            os.path.join(self.default_dir, '.coafile')))
+        with open(os.path.join(self.other_dir, '.coafile')) as coafile:
+            content = coafile.read()
+        self.assertIn('[all.javascript]', content)
+        self.assertNotIn('python', content)
+
+
+class LazyImportTest(unittest.TestCase):
+
+    # Seconds importing coala_quickstart.coala_quickstart may take. The
+    # budget is generous as the time depends on the machine, the import
+    # takes far longer when it pulls in any of the ``HEAVY_PACKAGES``.
+    IMPORT_TIME_BUDGET = 1
+
+    HEAVY_PACKAGES = ('coalib', 'coala_utils', 'pyprint', 'pyjsparser',
+                      'gemfileparser', 'termcolor', 'pkg_resources')
+
+    def run_python(self, *args):
+        root_dir = os.path.dirname(os.path.dirname(os.path.abspath(
+            __file__)))
+        return subprocess.run(
+            (sys.executable,) + args, cwd=root_dir,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            universal_newlines=True, check=True)
+
+    def get_heavy_modules(self, modules):
+        return [module for module in modules
+                if module.split('.')[0] in self.HEAVY_PACKAGES]
+
+    def test_version(self):
+        output = self.run_python('-c', """
+import json, sys
+sys.argv[1:] = ['--version']
+from coala_quickstart.coala_quickstart import main
+try:
+    main()
+except SystemExit:
+    pass
+print(json.dumps(sorted(sys.modules)))
+""").stdout
+        version, modules = output.splitlines()
+        self.assertRegex(version, r'^\d+\.\d+')
+        self.assertEqual(self.get_heavy_modules(json.loads(modules)), [])
+
+    def test_import_time(self):
+        if sys.version_info < (3, 7):
+            # -X importtime needs Python 3.7. Timing the import otherwise
+            # depends too much on the load of the machine, so only the
+            # modules it pulls in are checked.
+            modules = json.loads(self.run_python('-c', '''
+import json, sys
+import coala_quickstart.coala_quickstart
+print(json.dumps(sorted(sys.modules)))
+''').stdout)
+            self.assertIn('coala_quickstart.coala_quickstart', modules)
+            self.assertEqual(self.get_heavy_modules(modules), [])
+            return
+
+        stderr = self.run_python(
+            '-X', 'importtime', '-c',
+            'import coala_quickstart.coala_quickstart').stderr
+        cumulative_times = {}
+        for line in stderr.splitlines():
+            if line.startswith('import time:') and '|' in line:
+                _, cumulative, module = line.split('|')
+                if cumulative.strip().isdigit():
+                    cumulative_times[module.strip()] = int(cumulative)
+        self.assertLess(
+            cumulative_times['coala_quickstart.coala_quickstart'] / 1e6,
+            self.IMPORT_TIME_BUDGET)
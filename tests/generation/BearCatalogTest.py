@@ -0,0 +1,256 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+import unittest.mock
+from copy import deepcopy
+
+from coala_quickstart.coala_quickstart import _get_arg_parser
+from coala_quickstart.generation import BearCatalog as BearCatalogModule
+from coala_quickstart.generation.BearCatalog import (
+    BearCatalog, SNAPSHOT_PATH)
+from coala_quickstart.generation.SettingsClass import (
+    BearSettings, collect_bear_settings)
+from coalib.collecting.Collectors import get_all_bears
+from tests.TestUtilities import bear_test_module
+
+
+class BearCatalogTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_root = tempfile.mkdtemp()
+        self.arg_parser = _get_arg_parser()
+        self.old_argv = deepcopy(sys.argv)
+        del sys.argv[1:]
+        self.loaded_catalogs = unittest.mock.patch.dict(
+            BearCatalogModule._loaded_catalogs, clear=True)
+        self.loaded_catalogs.start()
+
+    def tearDown(self):
+        self.loaded_catalogs.stop()
+        sys.argv = self.old_argv
+        shutil.rmtree(self.cache_root)
+
+    def load(self, **kwargs):
+        return BearCatalog.load(self.arg_parser,
+                                cache_root=self.cache_root,
+                                **kwargs)
+
+    def test_load_from_cache(self):
+        with bear_test_module():
+            catalog = self.load()
+            self.assertIn('SomeLinterBear', catalog)
+            self.assertEqual(len(os.listdir(self.cache_root)), 1)
+
+            BearCatalogModule._loaded_catalogs.clear()
+            with unittest.mock.patch(
+                    'coala_quickstart.generation.BearCatalog.collect_bears'
+                    ) as mocked:
+                cached_catalog = self.load()
+                self.assertFalse(mocked.called)
+                self.assertIsNot(cached_catalog, catalog)
+
+            self.assertEqual(sorted(bear.name for bear in cached_catalog),
+                             sorted(bear.name for bear in catalog))
+
+            bear = cached_catalog['NonOptionalSettingBear']
+            self.assertEqual(bear.LANGUAGES, {'All'})
+            self.assertEqual(bear.executable, 'some_linter')
+            self.assertEqual(
+                [(r.package, r.version, r.type) for r in bear.REQUIREMENTS],
+                [('some_linter', '2', 'npm')])
+            self.assertEqual(sorted(bear.non_optional_settings),
+                             ['another_setting', 'non_optional_setting'])
+            self.assertIsNone(cached_catalog['BearA'].executable)
+
+            all_bears = {bear.name: bear for bear in get_all_bears()}
+            self.assertIs(bear.load(),
+                          all_bears['NonOptionalSettingBear'])
+
+    def test_rebuild(self):
+        with bear_test_module():
+            self.load()
+            with unittest.mock.patch(
+                    'coala_quickstart.generation.BearCatalog.'
+                    'get_distribution_version',
+                    return_value='99.0'):
+                self.assertIn('BearA', self.load())
+            with unittest.mock.patch(
+                    'coala_quickstart.generation.BearCatalog.collect_bears',
+                    return_value=([], [])) as mocked:
+                self.assertEqual(len(self.load(rebuild=True)), 0)
+                self.assertTrue(mocked.called)
+
+    def test_corrupt_cache(self):
+        with bear_test_module():
+            self.load()
+            path = os.path.join(self.cache_root,
+                                os.listdir(self.cache_root)[0])
+            with open(path, 'w') as catalog_file:
+                catalog_file.write('{"key": ')
+            BearCatalogModule._loaded_catalogs.clear()
+            self.assertIn('BearA', self.load())
+
+    def test_collected_once_per_process(self):
+        with bear_test_module():
+            catalog = self.load(use_cache=False)
+            with unittest.mock.patch(
+                    'coala_quickstart.generation.BearCatalog.collect_bears'
+                    ) as mocked:
+                self.assertIs(self.load(use_cache=False), catalog)
+                self.assertFalse(mocked.called)
+
+    def test_get_bears(self):
+        with bear_test_module():
+            catalog = self.load(use_cache=False)
+            self.assertEqual(os.listdir(self.cache_root), [])
+
+            names = {bear.name for bear in catalog.get_bears(['javascript'])}
+            self.assertIn('SomeLinterBear', names)
+            self.assertIn('NonOptionalSettingBear', names)
+
+            names = {bear.name for bear in catalog.get_bears(['C'])}
+            self.assertNotIn('SomeLinterBear', names)
+            self.assertIn('NonOptionalSettingBear', names)
+
+            self.assertEqual(
+                {bear.name for bear in catalog.get_language_bears('all')},
+                {'LanguageSettingBear', 'NonOptionalSettingBear',
+                 'SmellCapabilityBear'})
+            self.assertIsInstance(catalog.get_language_bears('JavaScript'),
+                                  frozenset)
+            self.assertEqual(catalog.get_language_bears('Unknown'),
+                             frozenset())
+
+    def test_import_bears(self):
+        with bear_test_module():
+            catalog = self.load(use_cache=False)
+            bears = catalog.get_bears(['Javascript'])
+            self.assertEqual(catalog.import_bears(['Javascript']),
+                             len(bears))
+            with unittest.mock.patch(
+                    'coala_quickstart.generation.BearCatalog.iimport_objects'
+                    ) as mocked:
+                for bear in bears:
+                    bear.load()
+                self.assertFalse(mocked.called)
+
+    def test_collect_bear_settings(self):
+        with bear_test_module():
+            catalog = self.load()
+            bear = catalog['AllKindsOfSettingsDependentBear'].load()
+            from_catalog = collect_bear_settings({'All': [bear]}, catalog)[0]
+            inspected = BearSettings(bear)
+
+            for kind in ('non_optional_settings', 'optional_settings'):
+                self.assertEqual(
+                    getattr(from_catalog, kind).settings_bool,
+                    getattr(inspected, kind).settings_bool)
+                self.assertEqual(
+                    getattr(from_catalog, kind).settings_others,
+                    getattr(inspected, kind).settings_others)
+
+    def test_snapshot(self):
+        bears_dir = os.path.join(os.path.dirname(os.path.dirname(
+            os.path.abspath(__file__))), 'test_bears')
+        snapshot_path = os.path.join(self.cache_root, 'bear_snapshot.json')
+        bear_dirs = [os.path.join(bears_dir, '**')]
+
+        with unittest.mock.patch(
+                'coala_quickstart.generation.BearCatalog.get_coala_bears_dir',
+                return_value=bears_dir):
+            catalog = BearCatalog.save_snapshot(snapshot_path)
+            self.assertIn('SomeLinterBear', catalog)
+
+            with unittest.mock.patch(
+                    'coala_quickstart.generation.BearCatalog.collect_bears'
+                    ) as mocked:
+                snapshot = BearCatalog.load_snapshot(bear_dirs,
+                                                     snapshot_path)
+                self.assertFalse(mocked.called)
+            self.assertEqual(sorted(bear.name for bear in snapshot),
+                             sorted(bear.name for bear in catalog))
+            bear = snapshot['NonOptionalSettingBear']
+            self.assertEqual(bear.source,
+                             catalog['NonOptionalSettingBear'].source)
+            self.assertEqual(bear.load().name, 'NonOptionalSettingBear')
+
+            # Other bear directories aren't in the snapshot.
+            self.assertIsNone(BearCatalog.load_snapshot(
+                bear_dirs + [os.path.join(self.cache_root, '**')],
+                snapshot_path))
+
+            with unittest.mock.patch(
+                    'coala_quickstart.generation.BearCatalog.'
+                    'get_distribution_version',
+                    return_value='99.0'):
+                self.assertIsNone(BearCatalog.load_snapshot(bear_dirs,
+                                                            snapshot_path))
+
+    def test_shipped_snapshot(self):
+        root_dir = os.path.dirname(os.path.dirname(os.path.dirname(
+            os.path.abspath(__file__))))
+        subprocess.run(
+            (sys.executable, 'setup.py', '-q', 'build_py', '--build-lib',
+             self.cache_root),
+            cwd=root_dir, stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL, check=True)
+        with open(os.path.join(self.cache_root, 'coala_quickstart',
+                               'bear_snapshot.json')) as built, \
+                open(SNAPSHOT_PATH) as shipped:
+            self.assertEqual(built.read(), shipped.read())
+
+        # The snapshot matches the installed coala-bears, which isn't
+        # imported.
+        with unittest.mock.patch(
+                'coala_quickstart.generation.BearCatalog.collect_bears'
+                ) as collect_bears, \
+                unittest.mock.patch(
+                'coala_quickstart.generation.BearCatalog.get_catalog_key'
+                ) as get_catalog_key:
+            catalog = self.load(use_cache=False)
+            self.assertFalse(collect_bears.called)
+            self.assertFalse(get_catalog_key.called)
+        self.assertIn('SpaceConsistencyBear', catalog)
+        self.assertIsNone(catalog['SpaceConsistencyBear']._bear_class)
+
+    def test_load_snapshot(self):
+        with bear_test_module():
+            catalog = self.load(use_cache=False)
+            BearCatalogModule._loaded_catalogs.clear()
+            with unittest.mock.patch.object(
+                    BearCatalog, 'load_snapshot',
+                    return_value=catalog) as load_snapshot:
+                self.assertIs(self.load(), catalog)
+                self.assertTrue(load_snapshot.called)
+                self.assertEqual(os.listdir(self.cache_root), [])
+
+                BearCatalogModule._loaded_catalogs.clear()
+                self.assertIsNot(self.load(rebuild=True), catalog)
+
+    def test_memo_without_bear_files(self):
+        with bear_test_module():
+            catalog = self.load(use_cache=False)
+            with unittest.mock.patch(
+                    'coala_quickstart.generation.BearCatalog.get_bear_dirs'
+                    ) as get_bear_dirs, \
+                    unittest.mock.patch(
+                    'coala_quickstart.generation.BearCatalog.'
+                    'get_catalog_key') as get_catalog_key:
+                self.assertIs(self.load(use_cache=False), catalog)
+                self.assertFalse(get_bear_dirs.called)
+                self.assertFalse(get_catalog_key.called)
+
+    def test_snapshot_without_bear_files(self):
+        with bear_test_module():
+            catalog = self.load(use_cache=False)
+            BearCatalogModule._loaded_catalogs.clear()
+            with unittest.mock.patch.object(
+                    BearCatalog, 'load_snapshot', return_value=catalog), \
+                    unittest.mock.patch(
+                    'coala_quickstart.generation.BearCatalog.'
+                    'get_catalog_key') as get_catalog_key:
+                self.assertIs(self.load(), catalog)
+                self.assertFalse(get_catalog_key.called)
@@ -1,6 +1,9 @@
 import os
+import shutil
 import sys
+import tempfile
 import unittest
+import unittest.mock
 from copy import deepcopy
 
 
@@ -117,9 +120,16 @@ class TestBears(unittest.TestCase):
         self.log_printer = None
         self.old_argv = deepcopy(sys.argv)
         del sys.argv[1:]
+        # The bear catalog is cached away from the user's cache.
+        self.cache_home = tempfile.mkdtemp()
+        self.environ_patch = unittest.mock.patch.dict(
+            os.environ, {'XDG_CACHE_HOME': self.cache_home})
+        self.environ_patch.start()
 
     def tearDown(self):
         sys.argv = self.old_argv
+        self.environ_patch.stop()
+        shutil.rmtree(self.cache_home)
 
     def test_filter_relevant_bears_simple(self):
         res = filter_relevant_bears([('Python', 70), ('C', 20)],
@@ -0,0 +1,47 @@
+import unittest
+
+from coala_quickstart.generation.BearCatalog import CatalogBear
+from coala_quickstart.generation.ExtractionPlanner import (
+    get_required_info_kinds, plan_extraction)
+from coala_quickstart.info_extraction.ExtractorRegistry import (
+    ExtractorRegistration)
+from coala_quickstart.info_extraction.Information import (
+    IndentStyleInfo, LintTaskInfo, ProjectDependencyInfo)
+from coala_quickstart.info_extractors.Registrations import (
+    BUILTIN_EXTRACTORS)
+from tests.test_bears.BearA import BearA
+from tests.test_bears.SpaceConsistencyTestBear import (
+    SpaceConsistencyTestBear)
+
+
+class ExtractionPlannerTest(unittest.TestCase):
+
+    def get_names(self, registrations):
+        return [registration.name for registration in registrations]
+
+    def test_get_required_info_kinds(self):
+        self.assertEqual(get_required_info_kinds([]),
+                         {LintTaskInfo, ProjectDependencyInfo})
+
+        bears = [CatalogBear(CatalogBear.create_record(bear))
+                 for bear in (BearA, SpaceConsistencyTestBear)]
+        self.assertEqual(get_required_info_kinds(bears),
+                         {LintTaskInfo, ProjectDependencyInfo,
+                          IndentStyleInfo})
+
+    def test_plan_extraction(self):
+        self.assertEqual(
+            self.get_names(plan_extraction(
+                BUILTIN_EXTRACTORS, {LintTaskInfo, ProjectDependencyInfo})),
+            ['package_json', 'gemfile', 'gruntfile'])
+        self.assertEqual(
+            self.get_names(plan_extraction(BUILTIN_EXTRACTORS,
+                                           {IndentStyleInfo})),
+            ['editorconfig'])
+
+        # Extractors which don't declare what they find always run.
+        registrations = [ExtractorRegistration('any', ['tox.ini'],
+                                               'tox_ext', 'ToxIE')]
+        self.assertEqual(
+            self.get_names(plan_extraction(registrations, {LintTaskInfo})),
+            ['any'])
@@ -0,0 +1,68 @@
+import os
+import shutil
+import tempfile
+import unittest
+import unittest.mock
+
+from coala_quickstart.generation.FileSniffer import (
+    SNIFF_SIZE, sniff_file, sniff_hashbang)
+from coala_quickstart.generation.Project import language_percentage
+from coala_quickstart.generation.ProjectIndex import IndexedFile
+
+
+class FileSnifferTest(unittest.TestCase):
+
+    def setUp(self):
+        self.project_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.project_dir)
+
+    def write(self, name, content):
+        path = os.path.join(self.project_dir, name)
+        with open(path, 'wb') as file:
+            file.write(content)
+        return path
+
+    def test_text(self):
+        path = self.write('run', b'#!/usr/bin/env python\r\nprint(1)\n')
+        self.assertEqual(sniff_file(path), ('#!/usr/bin/env python', False))
+        self.assertEqual(sniff_hashbang(path), '#!/usr/bin/env python')
+
+        path = self.write('README', b'Hello\n')
+        self.assertIsNone(sniff_hashbang(path))
+
+    def test_binary(self):
+        path = self.write('blob', b'#!\x00\x01\x02')
+        self.assertEqual(sniff_file(path), (None, True))
+        self.assertIsNone(sniff_hashbang(path))
+
+    def test_undecodable(self):
+        path = self.write('latin1', b'#!/bin/sh \xe9t\xe9\n')
+        self.assertEqual(sniff_hashbang(path), '#!/bin/sh �t�')
+
+    def test_bounded_read(self):
+        path = self.write('bundle', b'x' * (SNIFF_SIZE * 10))
+        self.assertEqual(len(sniff_file(path).first_line), SNIFF_SIZE)
+
+    def test_missing_file(self):
+        self.assertEqual(sniff_file(os.path.join(self.project_dir, 'no')),
+                         (None, False))
+
+    def test_sniffed_once(self):
+        path = self.write('run', b'#!/bin/sh\n')
+        indexed_file = IndexedFile.from_path(path)
+        self.assertEqual(indexed_file.hashbang, '#!/bin/sh')
+        with unittest.mock.patch('builtins.open') as mocked:
+            self.assertEqual(indexed_file.hashbang, '#!/bin/sh')
+            self.assertFalse(mocked.called)
+
+        path = self.write('run', b'#!/usr/bin/python\n')
+        self.assertEqual(IndexedFile.from_path(path).hashbang,
+                         '#!/usr/bin/python')
+
+    def test_language_percentage(self):
+        paths = [self.write('a.py', b''),
+                 self.write('blob', b'\xff\xfe\x00\x00'),
+                 self.write('data', b'\xe9' * (SNIFF_SIZE * 2))]
+        self.assertEqual(language_percentage(paths), {'Python': 100 / 3})
@@ -1,8 +1,24 @@
 import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
 import unittest
+import unittest.mock
 
+from coala_quickstart.generation.ExtractorProcess import (
+    get_process_sys_path)
 from coala_quickstart.generation.InfoCollector import (
     collect_info)
+from coala_quickstart.info_extraction.ExtractorRegistry import (
+    ExtractorRegistration)
+from coala_quickstart.info_extraction.Information import (
+    IndentSizeInfo, LintTaskInfo)
+from coala_quickstart.info_extractors.GemfileInfoExtractor import (
+    GemfileInfoExtractor)
+from coala_quickstart.info_extractors.PackageJSONInfoExtractor import (
+    PackageJSONInfoExtractor)
 from tests.TestUtilities import generate_files
 
 
@@ -59,6 +75,40 @@ end
 """
 
 
+class SlowPackageJSONInfoExtractor(PackageJSONInfoExtractor):
+
+    def parse_file(self, fname, file_content):
+        time.sleep(0.5)
+        return super().parse_file(fname, file_content)
+
+
+class HangingGemfileInfoExtractor(GemfileInfoExtractor):
+
+    def parse_file(self, fname, file_content):
+        time.sleep(60)
+
+
+# Set once the module importing slowly may finish its import.
+import_released = threading.Event()
+
+SLOW_IMPORT_MODULE = '''
+import os
+import sys
+
+# Only the import of the test process waits, not the one of the extractor
+# processes.
+if os.getpid() == {pid}:
+    sys.modules[{test_module!r}].import_released.wait()
+'''
+
+
+class SlowImportGemfileInfoExtractor(GemfileInfoExtractor):
+
+    def parse_file(self, fname, file_content):
+        import slow_import_module  # noqa: F401
+        return super().parse_file(fname, file_content)
+
+
 class InfoCollectorTest(unittest.TestCase):
 
     def setUp(self):
@@ -98,3 +148,108 @@ class InfoCollectorTest(unittest.TestCase):
                 isources = [os.path.normcase(i) for i in isources]
                 for info in collected_info[iname]:
                     self.assertIn(info.source, isources)
+
+    def test_info_kinds(self):
+        with generate_files(['package.json', '.editorconfig'],
+                            [package_json, editorconfig],
+                            self.test_dir), \
+                unittest.mock.patch(
+                    'coala_quickstart.info_extraction.ExtractorRegistry.'
+                    'ExtractorRegistration.load') as load:
+            collected_info = self.uut(self.test_dir,
+                                      info_kinds={LintTaskInfo})
+        self.assertEqual(collected_info, {})
+        self.assertFalse(load.called)
+
+        with generate_files(['package.json', '.editorconfig'],
+                            [package_json, editorconfig],
+                            self.test_dir):
+            collected_info = self.uut(self.test_dir,
+                                      info_kinds={IndentSizeInfo})
+        self.assertEqual(
+            {info.source for infos in collected_info.values()
+             for info in infos},
+            {'.editorconfig'})
+
+    def collect_dependencies(self, extractors=None, **kwargs):
+        """
+        Collects the information of the package.json and Gemfile files,
+        running the given extractors in child processes.
+        """
+        with generate_files(['package.json', 'Gemfile'],
+                            [package_json, gemfile],
+                            self.test_dir):
+            if extractors is None:
+                collected_info = self.uut(self.test_dir, **kwargs)
+            else:
+                registrations = [
+                    ExtractorRegistration(class_name, [file_name],
+                                          __name__, class_name)
+                    for class_name, file_name in extractors]
+                with unittest.mock.patch(
+                        'coala_quickstart.generation.InfoCollector.'
+                        'get_registered_extractors',
+                        return_value=registrations), \
+                        unittest.mock.patch(
+                        'coala_quickstart.generation.InfoCollector.'
+                        'IN_PROCESS_MAX_SIZE', 0):
+                    collected_info = self.uut(self.test_dir, **kwargs)
+        return [(info.source, info.value)
+                for info in collected_info.get('ProjectDependencyInfo', [])]
+
+    def test_child_processes(self):
+        # The slow extractor finishes last but its information still comes
+        # first.
+        self.assertEqual(
+            self.collect_dependencies(
+                (('SlowPackageJSONInfoExtractor', 'package.json'),
+                 ('GemfileInfoExtractor', 'Gemfile'))),
+            self.collect_dependencies())
+
+    def test_timeout(self):
+        start = time.monotonic()
+        with self.assertLogs(level='WARNING') as logs:
+            dependencies = self.collect_dependencies(
+                (('PackageJSONInfoExtractor', 'package.json'),
+                 ('HangingGemfileInfoExtractor', 'Gemfile')),
+                timeout=1)
+        self.assertLess(time.monotonic() - start, 30)
+        self.assertIn('HangingGemfileInfoExtractor did not finish',
+                      logs.output[0])
+        self.assertEqual({source for source, _ in dependencies},
+                         {'package.json'})
+
+    def test_import_lock_held(self):
+        module_dir = tempfile.mkdtemp()
+        with open(os.path.join(module_dir, 'slow_import_module.py'),
+                  'w') as module_file:
+            module_file.write(SLOW_IMPORT_MODULE.format(
+                pid=os.getpid(), test_module=__name__))
+        sys.path.insert(0, module_dir)
+        import_released.clear()
+        # The thread holds the import lock of the module until the
+        # information is collected.
+        importer = threading.Thread(
+            target=__import__, args=('slow_import_module',))
+        importer.start()
+        try:
+            while 'slow_import_module' not in sys.modules:
+                time.sleep(0.01)
+            dependencies = self.collect_dependencies(
+                (('SlowImportGemfileInfoExtractor', 'Gemfile'),),
+                timeout=10)
+        finally:
+            import_released.set()
+            importer.join()
+            sys.path.remove(module_dir)
+            sys.modules.pop('slow_import_module', None)
+            shutil.rmtree(module_dir)
+        self.assertEqual({source for source, _ in dependencies},
+                         {'Gemfile'})
+
+    def test_process_sys_path(self):
+        # The directories of the bears coala imported are packages.
+        bears_dir = os.path.dirname(os.path.abspath(__file__))
+        self.assertEqual(
+            get_process_sys_path([bears_dir, '/usr/lib/python3', '']),
+            ['/usr/lib/python3', '', bears_dir])
@@ -0,0 +1,67 @@
+import shutil
+import tempfile
+import unittest
+
+from coala_quickstart.generation.LanguageDetection import (
+    CANONICAL_LANGUAGES, get_canonical_language, get_extension_languages,
+    get_hashbang_language, get_interpreter)
+from coala_quickstart.generation.Project import language_percentage
+from coala_quickstart.generation.Utilities import split_by_language
+from tests.TestUtilities import generate_files
+
+
+class LanguageDetectionTest(unittest.TestCase):
+
+    def test_extension_languages(self):
+        self.assertEqual(get_extension_languages('.py'), ('Python',))
+        self.assertEqual(get_extension_languages('.h'), ('C', 'C++'))
+        self.assertEqual(get_extension_languages('.unknown'), ())
+
+    def test_canonical_languages(self):
+        self.assertEqual(CANONICAL_LANGUAGES['c++'], 'C++')
+        self.assertEqual(get_canonical_language('RESTRUCTUREDTEXT'),
+                         'reStructuredText')
+        self.assertIsNone(get_canonical_language('All'))
+
+    def test_get_interpreter(self):
+        self.assertEqual(get_interpreter('#!/usr/bin/env python'), 'python')
+        self.assertEqual(get_interpreter('#!/usr/bin/env FOO=1 ruby -w'),
+                         'ruby')
+        self.assertIsNone(get_interpreter('#!/usr/bin/env'))
+        self.assertIsNone(get_interpreter('#!'))
+        self.assertIsNone(get_interpreter('# comment'))
+
+    def test_hashbang_language(self):
+        hashbangs = {'#!/usr/bin/python3.11': 'Python',
+                     '#!/usr/bin/env python2': 'Python',
+                     '#!/usr/bin/env node': 'JavaScript',
+                     '#!/bin/bash -e': 'Shell',
+                     '#!/bin/sh': 'Shell',
+                     '#!/usr/bin/perl -w': 'Perl',
+                     '#!/usr/bin/env Rscript': 'R',
+                     '#!/usr/bin/awk -f': None}
+        for hashbang, language in hashbangs.items():
+            self.assertEqual(get_hashbang_language(hashbang), language,
+                             hashbang)
+
+
+class HashbangClassificationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.project_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.project_dir)
+
+    def test_hashbang_files(self):
+        fnames = ['main.py', 'run', 'build', 'serve']
+        contents = ['', '#!/usr/bin/env python3\n', '#!/bin/sh\n',
+                    '#!/usr/bin/env node\n']
+        with generate_files(fnames, contents, self.project_dir) as paths:
+            self.assertEqual(dict(language_percentage(paths)),
+                             {'Python': 50, 'Shell': 25, 'JavaScript': 25})
+
+            lang_files = split_by_language(paths)
+            self.assertEqual(lang_files['python'], set(paths[:2]))
+            self.assertEqual(lang_files['shell'], {paths[2]})
+            self.assertEqual(lang_files['all'], set(paths))
@@ -0,0 +1,159 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from concurrent.futures import CancelledError
+
+from coala_quickstart.generation.ProjectIndex import (
+    IndexedFile, ProjectIndex, as_project_index)
+from coala_quickstart.generation.Project import language_percentage
+from tests.TestUtilities import generate_files
+
+
+class ProjectIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.project_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.project_dir)
+
+    def test_build(self):
+        os.makedirs(os.path.join(self.project_dir, 'src', 'lib'))
+        os.makedirs(os.path.join(self.project_dir, '.git'))
+        fnames = [os.path.join('src', 'main.c'),
+                  os.path.join('src', 'lib', '.gitignore'),
+                  os.path.join('.git', 'HEAD'),
+                  'run',
+                  '.gitignore']
+        contents = ['int main;', '*.o', 'ref', '#!/bin/sh\n', 'build']
+
+        with generate_files(fnames, contents, self.project_dir):
+            index = ProjectIndex.build(self.project_dir)
+
+            self.assertEqual(
+                list(index),
+                sorted(os.path.join(self.project_dir, f)
+                       for f in fnames if not f.startswith('.git' + os.sep)))
+            self.assertEqual(index.gitignore_dirs,
+                             [self.project_dir,
+                              os.path.join(self.project_dir, 'src', 'lib')])
+
+            main_c = index[os.path.join(self.project_dir, 'src', 'main.c')]
+            self.assertEqual(main_c.extension, '.c')
+            self.assertEqual(main_c.size, len('int main;'))
+            self.assertIsNotNone(main_c.mtime)
+            self.assertIsNone(main_c.hashbang)
+
+            run = index[os.path.join(self.project_dir, 'run')]
+            self.assertEqual(run.hashbang, '#!/bin/sh')
+
+    def test_filter(self):
+        fnames = ['a.py', 'b.c']
+        with generate_files(fnames, ['', ''], self.project_dir):
+            index = ProjectIndex.build(self.project_dir)
+            filtered = index.filter([os.path.join(self.project_dir, '*.py')])
+
+            self.assertEqual(len(index), 2)
+            self.assertEqual(list(filtered),
+                             [os.path.join(self.project_dir, 'b.c')])
+            self.assertIs(index.filter([]), index)
+
+    def test_split_subprojects(self):
+        for dir_name in (os.path.join('services', 'api', 'client'),
+                         os.path.join('services', 'web')):
+            os.makedirs(os.path.join(self.project_dir, dir_name))
+        fnames = ['setup.py',
+                  'README.md',
+                  os.path.join('services', 'api', 'Gemfile'),
+                  os.path.join('services', 'api', 'app.rb'),
+                  os.path.join('services', 'api', '.gitignore'),
+                  os.path.join('services', 'api', 'client', 'package.json'),
+                  os.path.join('services', 'api', 'client', 'index.js'),
+                  os.path.join('services', 'web', 'index.html')]
+
+        with generate_files(fnames, [''] * len(fnames), self.project_dir):
+            index = ProjectIndex.build(self.project_dir)
+
+        def path(*names):
+            return os.path.join(self.project_dir, *names)
+
+        api_dir = path('services', 'api')
+        client_dir = path('services', 'api', 'client')
+        self.assertEqual(index.subproject_dirs, [api_dir, client_dir])
+
+        root, api, client = index.split_subprojects()
+        self.assertEqual(
+            (root.project_dir, list(root), root.subproject_dirs),
+            (self.project_dir,
+             [path('README.md'), path('services', 'web', 'index.html'),
+              path('setup.py')],
+             [api_dir, client_dir]))
+        self.assertEqual(
+            (api.project_dir, list(api), api.gitignore_dirs,
+             api.subproject_dirs),
+            (api_dir,
+             [path('services', 'api', '.gitignore'),
+              path('services', 'api', 'Gemfile'),
+              path('services', 'api', 'app.rb')],
+             [api_dir],
+             [client_dir]))
+        self.assertEqual(
+            (client.project_dir, list(client), client.gitignore_dirs,
+             client.subproject_dirs),
+            (client_dir,
+             [path('services', 'api', 'client', 'index.js'),
+              path('services', 'api', 'client', 'package.json')],
+             [],
+             []))
+
+        without_subprojects = ProjectIndex.from_paths(
+            [path('a.py')], self.project_dir).split_subprojects()
+        self.assertEqual([list(subproject)
+                          for subproject in without_subprojects],
+                         [[path('a.py')]])
+
+    def test_from_paths(self):
+        index = as_project_index(['/repo/hello.html', '/repo/unknown'])
+
+        self.assertIn('/repo/hello.html', index)
+        self.assertEqual(index.project_dir, '/repo')
+        self.assertIsNone(index['/repo/unknown'].size)
+        self.assertIsNone(index['/repo/unknown'].hashbang)
+        self.assertIs(as_project_index(index), index)
+
+    def test_indexed_file(self):
+        indexed_file = IndexedFile('/repo/file.py', 10, 0.0)
+        self.assertEqual(indexed_file.extension, '.py')
+        self.assertEqual(repr(indexed_file), "<IndexedFile '/repo/file.py'>")
+
+    def test_sniff(self):
+        interpreters = ['python', 'ruby', 'node', 'perl']
+        fnames = ['script{}'.format(i) for i in range(20)] + ['main.c']
+        contents = ['#!/usr/bin/env {}\n'.format(interpreters[i % 4])
+                    for i in range(20)] + ['']
+
+        with generate_files(fnames, contents, self.project_dir):
+            serial = ProjectIndex.build(self.project_dir)
+            serial.sniff()
+            parallel = ProjectIndex.build(self.project_dir)
+            parallel.sniff(jobs=4)
+
+            self.assertTrue(all(f.sniffed for f in parallel.files
+                                if f.needs_sniffing))
+            self.assertEqual([f.hashbang for f in parallel.files],
+                             [f.hashbang for f in serial.files])
+            self.assertEqual(
+                language_percentage(parallel, jobs=4),
+                language_percentage(ProjectIndex.build(self.project_dir)))
+
+    def test_cancel(self):
+        cancel_event = threading.Event()
+        with generate_files(['main.c'], [''], self.project_dir):
+            self.assertEqual(len(ProjectIndex.build(
+                self.project_dir, cancel_event=cancel_event)), 1)
+            cancel_event.set()
+            with self.assertRaises(CancelledError):
+                ProjectIndex.build(self.project_dir,
+                                   cancel_event=cancel_event)
@@ -0,0 +1,115 @@
+import os
+import shutil
+import tempfile
+import unittest
+import unittest.mock
+
+from coala_quickstart.generation.ProjectIndex import ProjectIndex
+from coala_quickstart.generation.ScanCache import ScanCache
+
+
+class ScanCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.project_dir = tempfile.mkdtemp()
+        self.cache_root = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.project_dir, 'bin'))
+        self.script = os.path.join(self.project_dir, 'bin', 'run')
+        with open(self.script, 'w') as f:
+            f.write('#!/usr/bin/env python\n')
+        open(os.path.join(self.project_dir, 'main.c'), 'w').close()
+        self.age_dirs()
+
+    def tearDown(self):
+        shutil.rmtree(self.project_dir)
+        shutil.rmtree(self.cache_root)
+
+    def age_dirs(self):
+        # Directories modified right before the scan are never trusted.
+        for dir_name in (self.project_dir,
+                         os.path.join(self.project_dir, 'bin')):
+            os.utime(dir_name, (1000000000, 1000000000))
+
+    def build(self, **kwargs):
+        cache = ScanCache(self.project_dir, self.cache_root, **kwargs)
+        index = ProjectIndex.build(self.project_dir, cache=cache)
+        for indexed_file in index.files:
+            indexed_file.hashbang
+        cache.store_hashbangs(index.files)
+        cache.save()
+        return index
+
+    def test_unchanged_tree(self):
+        first = self.build()
+        self.assertEqual(first[self.script].hashbang,
+                         '#!/usr/bin/env python')
+
+        with unittest.mock.patch(
+                'coala_quickstart.generation.ScanCache.scan_dir') as scan, \
+                unittest.mock.patch(
+                'coala_quickstart.generation.ProjectIndex.sniff_hashbang'
+                ) as sniff:
+            second = self.build()
+            self.assertFalse(scan.called)
+            self.assertFalse(sniff.called)
+
+        self.assertEqual(list(first), list(second))
+        self.assertEqual(second[self.script].hashbang,
+                         '#!/usr/bin/env python')
+
+    def test_changed_directory(self):
+        self.build()
+
+        new_file = os.path.join(self.project_dir, 'bin', 'new.py')
+        open(new_file, 'w').close()
+        os.utime(os.path.join(self.project_dir, 'bin'),
+                 (1000000100, 1000000100))
+
+        self.assertIn(new_file, self.build())
+
+    def test_changed_file(self):
+        self.build()
+
+        with open(self.script, 'w') as f:
+            f.write('#!/bin/bash\n')
+        os.utime(self.script, (1000000100, 1000000100))
+        self.age_dirs()
+
+        self.assertEqual(self.build()[self.script].hashbang, '#!/bin/bash')
+
+    def test_changed_known_file(self):
+        main_c = os.path.join(self.project_dir, 'main.c')
+        self.assertEqual(self.build()[main_c].size, 0)
+
+        with open(main_c, 'w') as f:
+            f.write('int main;')
+        self.age_dirs()
+
+        # The cached size of the file is stale, so it isn't kept.
+        self.assertIsNone(self.build()[main_c].size)
+
+    def test_rebuild(self):
+        self.build()
+        with unittest.mock.patch(
+                'coala_quickstart.generation.ScanCache.scan_dir',
+                return_value=[]) as scan:
+            self.build(rebuild=True)
+            self.assertTrue(scan.called)
+
+    def test_corrupt_cache(self):
+        cache = ScanCache(self.project_dir, self.cache_root)
+        with open(cache.path, 'w') as f:
+            f.write('{not json')
+        self.assertEqual(len(self.build()), 2)
+
+    def test_commit(self):
+        cache = ScanCache(self.project_dir, self.cache_root)
+        ProjectIndex.build(self.project_dir, cache=cache)
+        cache.commit()
+        self.assertFalse(os.path.exists(cache.path))
+
+        with unittest.mock.patch(
+                'coala_quickstart.generation.ScanCache.scan_dir') as scan:
+            index = ProjectIndex.build(self.project_dir, cache=cache)
+            self.assertFalse(scan.called)
+        self.assertEqual(len(index), 2)
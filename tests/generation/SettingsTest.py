@@ -1,7 +1,9 @@
 import os
+import shutil
 import sys
 import tempfile
 import unittest
+import unittest.mock
 from datetime import date
 from copy import deepcopy
 
@@ -12,6 +14,9 @@ from coala_quickstart.coala_quickstart import _get_arg_parser
 from coala_quickstart.generation.Settings import write_info, generate_settings
 from coala_quickstart.generation.Bears import filter_relevant_bears
 from coala_quickstart.generation.Project import get_used_languages
+from coala_quickstart.generation.ProjectIndex import ProjectIndex
+from coala_quickstart.generation.Utilities import get_gitignore_glob
+from tests.TestUtilities import generate_files
 
 
 class SettingsTest(unittest.TestCase):
@@ -31,11 +36,18 @@ class SettingsTest(unittest.TestCase):
         self.arg_parser = _get_arg_parser()
         self.old_argv = deepcopy(sys.argv)
         del sys.argv[1:]
+        # The bear catalog is cached away from the user's cache.
+        self.cache_home = tempfile.mkdtemp()
+        self.environ_patch = unittest.mock.patch.dict(
+            os.environ, {'XDG_CACHE_HOME': self.cache_home})
+        self.environ_patch.start()
 
     def tearDown(self):
         self.writer.close()
         os.remove(self.coafile)
         sys.argv = self.old_argv
+        self.environ_patch.stop()
+        shutil.rmtree(self.cache_home)
 
     def test_write_info(self):
         result_date = date.today().strftime("%d %b %Y")
@@ -98,3 +110,61 @@ class SettingsTest(unittest.TestCase):
             bears_list.sort())
 
         self.assertEqual(['**.html'], files_list)
+
+    def test_ignore_field_without_walks(self):
+        project_dir = tempfile.mkdtemp()
+        gitignore_lines = ['build{}/\n'.format(i) for i in range(100)]
+        gitignore_lines += ['*.pyc\n', '*.pyc\n']
+        try:
+            with generate_files(['.gitignore', 'hello.py'],
+                                [''.join(gitignore_lines), ''],
+                                project_dir):
+                project_index = ProjectIndex.build(project_dir)
+                ignore_globs = list(get_gitignore_glob(
+                    project_dir, project_index.gitignore_dirs))
+                relevant_bears = filter_relevant_bears(
+                    list(get_used_languages(project_index)),
+                    self.printer, self.arg_parser, {})
+
+                with unittest.mock.patch('os.scandir') as scandir, \
+                        unittest.mock.patch('os.listdir') as listdir, \
+                        unittest.mock.patch('os.walk') as walk:
+                    res = generate_settings(project_dir, project_index,
+                                            ignore_globs, relevant_bears,
+                                            {}, True)
+                    self.assertFalse(scandir.called)
+                    self.assertFalse(listdir.called)
+                    self.assertFalse(walk.called)
+
+            ignores = res['all']['ignore'].value.split(', ')
+            self.assertEqual(len(ignores), 100 * 4 + 2)
+            self.assertIn(os.path.join('**', '*.pyc'), ignores)
+            self.assertIn(os.path.join('**', 'build99', '**'), ignores)
+        finally:
+            os.rmdir(project_dir)
+
+    def test_hashbang_files(self):
+        project_dir = tempfile.mkdtemp()
+        os.mkdir(os.path.join(project_dir, 'bin'))
+        try:
+            with generate_files(
+                    ['main.py', os.path.join('bin', 'run'),
+                     os.path.join('bin', 'tool')],
+                    ['', '#!/bin/bash\n', '#!/usr/bin/env python3\n'],
+                    project_dir):
+                project_index = ProjectIndex.build(project_dir)
+                relevant_bears = filter_relevant_bears(
+                    list(get_used_languages(project_index)),
+                    self.printer, self.arg_parser, {})
+                res = generate_settings(project_dir, project_index, [],
+                                        relevant_bears, {}, True)
+        finally:
+            shutil.rmtree(project_dir)
+
+        self.assertEqual(str(res['all.Shell']['files']),
+                         os.path.join('bin', 'run'))
+        self.assertEqual(res['all.Python']['files'].value.split(', '),
+                         ['**.py', os.path.join('bin', 'tool')])
+        self.assertEqual(sorted(res['all']['files'].value.split(', ')),
+                         sorted(['**.py', os.path.join('bin', 'run'),
+                                 os.path.join('bin', 'tool')]))
@@ -1,4 +1,7 @@
 import inspect
+import os
+import shutil
+import tempfile
 import types
 import unittest
 
@@ -6,7 +9,9 @@ from tests.test_bears.AllKindsOfSettingsDependentBear import (
     AllKindsOfSettingsDependentBear)
 from coala_quickstart.generation.Utilities import (
     get_default_args, get_all_args,
-    search_for_orig, get_language_from_hashbang)
+    search_for_orig, get_language_from_hashbang,
+    translate_gitignore_pattern, GitignoreRules, GitignoreMatcher)
+from coala_quickstart.generation.ProjectIndex import ProjectIndex
 
 
 def foo():
@@ -73,3 +78,75 @@ class TestAdditionalFunctions(unittest.TestCase):
                          'python')
         self.assertEqual(get_language_from_hashbang('#!bin/bash'),
                          'bash')
+
+
+class TestGitignoreMatching(unittest.TestCase):
+
+    def test_translate_gitignore_pattern(self):
+        self.assertIsNone(translate_gitignore_pattern('\n'))
+        self.assertIsNone(translate_gitignore_pattern('# comment\n'))
+        self.assertEqual(translate_gitignore_pattern('build  \n'),
+                         ('(?:.*/)?build', False, False))
+        self.assertEqual(translate_gitignore_pattern('docs/**'),
+                         ('docs/.*', False, False))
+        self.assertEqual(translate_gitignore_pattern('**/logs/'),
+                         ('(?:.*/)?logs', False, True))
+        self.assertEqual(translate_gitignore_pattern('a/**/b'),
+                         ('a/(?:.*/)?b', False, False))
+        self.assertEqual(translate_gitignore_pattern('!/f?[!ab]'),
+                         ('f[^/][^ab]', True, False))
+
+    def test_gitignore_rules(self):
+        rules = GitignoreRules(['*.log\n',
+                                '!keep.log\n',
+                                '/tests\n',
+                                'build/\n',
+                                'src/**/gen\n'])
+
+        self.assertTrue(rules.match('debug.log'))
+        self.assertTrue(rules.match('sub/debug.log'))
+        self.assertFalse(rules.match('sub/keep.log'))
+        self.assertIsNone(rules.match('sub/keep.c'))
+        self.assertTrue(rules.match('tests', is_dir=True))
+        self.assertIsNone(rules.match('src/tests', is_dir=True))
+        self.assertTrue(rules.match('src/build', is_dir=True))
+        self.assertIsNone(rules.match('src/build'))
+        self.assertTrue(rules.match('src/gen'))
+        self.assertTrue(rules.match('src/a/b/gen', is_dir=True))
+        self.assertIsNone(GitignoreRules([]).match('anything'))
+
+    def test_gitignore_matcher_nesting(self):
+        project_dir = tempfile.mkdtemp()
+        try:
+            os.makedirs(os.path.join(project_dir, 'sub', 'node_modules'))
+            with open(os.path.join(project_dir, '.gitignore'), 'w') as f:
+                f.write('*.log\nnode_modules/\n')
+            with open(os.path.join(project_dir, 'sub', '.gitignore'),
+                      'w') as f:
+                f.write('!important.log\n')
+            for fname in ('a.log',
+                          os.path.join('sub', 'b.log'),
+                          os.path.join('sub', 'important.log'),
+                          os.path.join('sub', 'node_modules', 'x.js'),
+                          os.path.join('sub', 'main.js')):
+                open(os.path.join(project_dir, fname), 'w').close()
+
+            matcher = GitignoreMatcher(project_dir).enter(project_dir)
+            sub_matcher = matcher.enter(os.path.join(project_dir, 'sub'))
+            self.assertTrue(matcher.is_ignored(
+                os.path.join(project_dir, 'sub', 'important.log')))
+            self.assertFalse(sub_matcher.is_ignored(
+                os.path.join(project_dir, 'sub', 'important.log')))
+            self.assertTrue(sub_matcher.is_ignored(
+                os.path.join(project_dir, 'sub', 'node_modules'), True))
+
+            index = ProjectIndex.build(
+                project_dir, ignore_matcher=GitignoreMatcher(project_dir))
+            self.assertEqual(
+                list(index),
+                [os.path.join(project_dir, '.gitignore'),
+                 os.path.join(project_dir, 'sub', '.gitignore'),
+                 os.path.join(project_dir, 'sub', 'important.log'),
+                 os.path.join(project_dir, 'sub', 'main.js')])
+        finally:
+            shutil.rmtree(project_dir)
@@ -0,0 +1,123 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import unittest.mock
+
+from coala_quickstart.generation.InfoCollector import collect_info
+from coala_quickstart.generation.ProjectIndex import ProjectIndex
+from coala_quickstart.info_extraction import (
+    ExtractorRegistry as ExtractorRegistryModule)
+from coala_quickstart.info_extraction.ExtractorRegistry import (
+    ExtractorRegistration, get_registered_extractors)
+from coala_quickstart.info_extractors.Registrations import (
+    BUILTIN_EXTRACTORS, GEMFILE_EXTRACTOR, PACKAGE_JSON_EXTRACTOR)
+from tests.TestUtilities import generate_files
+
+
+class Distribution:
+
+    def __init__(self, project_name):
+        self.project_name = project_name
+
+
+class EntryPoint:
+
+    def __init__(self, name, registration=None, dist=None):
+        self.name = name
+        self.registration = registration
+        self.dist = dist
+
+    def load(self):
+        if self.registration is None:
+            raise ImportError('No module named {}'.format(self.name))
+        return self.registration
+
+
+class ExtractorRegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.project_dir = tempfile.mkdtemp()
+        self.registered = unittest.mock.patch.object(
+            ExtractorRegistryModule, '_registered_extractors', None)
+        self.registered.start()
+
+    def tearDown(self):
+        self.registered.stop()
+        shutil.rmtree(self.project_dir)
+
+    def test_builtin_extractors(self):
+        for registration in BUILTIN_EXTRACTORS:
+            extractor_class = registration.load()
+            self.assertEqual(registration.supported_file_globs,
+                             extractor_class.supported_file_globs)
+            self.assertEqual(registration.supported_info_kinds,
+                             extractor_class.supported_info_kinds)
+
+    def test_entry_points(self):
+        tox = ExtractorRegistration('tox', ['tox.ini'], 'tox_ext', 'ToxIE')
+        gemfile = ExtractorRegistration('gemfile', ['Gemfile', 'gems.rb'],
+                                        'gems_ext', 'GemsIE')
+        entry_points = [EntryPoint('tox', tox),
+                        EntryPoint('broken'),
+                        EntryPoint('gemfile', gemfile)]
+        with unittest.mock.patch('pkg_resources.iter_entry_points',
+                                 return_value=entry_points), \
+                self.assertLogs(level='WARNING') as logs:
+            registrations = get_registered_extractors()
+        self.assertIn('broken', logs.output[0])
+        self.assertEqual([registration.name
+                          for registration in registrations],
+                         ['editorconfig', 'package_json', 'gemfile',
+                          'gruntfile', 'tox'])
+        self.assertIs(registrations[2], gemfile)
+        self.assertIs(get_registered_extractors(), registrations)
+
+    def test_installed_entry_points(self):
+        quickstart = Distribution('coala-quickstart')
+        tox = ExtractorRegistration('tox', ['tox.ini'], 'tox_ext', 'ToxIE')
+        # setuptools lists the entry points sorted by name, and only the
+        # extractors declared in setup.py are registered.
+        entry_points = [EntryPoint('gemfile', GEMFILE_EXTRACTOR, quickstart),
+                        EntryPoint('package_json', PACKAGE_JSON_EXTRACTOR,
+                                   quickstart),
+                        EntryPoint('tox', tox, Distribution('tox-ext'))]
+        with unittest.mock.patch('pkg_resources.iter_entry_points',
+                                 return_value=entry_points):
+            registrations = get_registered_extractors()
+        self.assertEqual(registrations,
+                         [PACKAGE_JSON_EXTRACTOR, GEMFILE_EXTRACTOR, tox])
+
+    def test_find_target_files(self):
+        registration = ExtractorRegistration(
+            'test', ['setup.cfg', '**.ini'], 'test_ext', 'TestIE')
+        fnames = ['setup.cfg', 'tox.ini', os.path.join('sub', 'setup.cfg'),
+                  os.path.join('sub', 'pytest.ini'), 'main.c']
+        index = ProjectIndex.from_paths(
+            [os.path.join(self.project_dir, fname) for fname in fnames],
+            self.project_dir)
+        with unittest.mock.patch('os.scandir') as scandir, \
+                unittest.mock.patch('os.stat') as stat:
+            found = registration.find_target_files(self.project_dir, index)
+            self.assertFalse(scandir.called)
+            self.assertFalse(stat.called)
+        self.assertEqual(sorted(found),
+                         sorted(['setup.cfg', 'tox.ini',
+                                 os.path.join('sub', 'pytest.ini')]))
+
+    def test_lazy_import(self):
+        modules = [registration.module_name
+                   for registration in BUILTIN_EXTRACTORS]
+        with generate_files(['main.c', 'package.json'], ['', '{}'],
+                            self.project_dir), \
+                unittest.mock.patch.dict(sys.modules):
+            for module in modules:
+                sys.modules.pop(module, None)
+            index = ProjectIndex.build(self.project_dir)
+
+            collect_info(self.project_dir, index)
+            self.assertEqual([module for module in modules
+                              if module in sys.modules],
+                             ['coala_quickstart.info_extractors.'
+                              'PackageJSONInfoExtractor'])
@@ -0,0 +1,155 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from coala_quickstart.info_extraction.ExtractorResultCache import (
+    ExtractorResultCache, MemoryResultCache, get_result_key)
+from coala_quickstart.info_extraction.Info import Info
+from coala_quickstart.info_extraction.InfoExtractor import InfoExtractor
+from tests.TestUtilities import generate_files
+
+
+class LineCountInfo(Info):
+    description = 'Number of lines of the file.'
+    value_type = (int,)
+
+
+class LineCountInfoExtractor(InfoExtractor):
+    supported_file_globs = ('**.txt',)
+    supported_info_kinds = (LineCountInfo,)
+
+    parsed_files = []
+
+    def parse_file(self, fname, file_content):
+        self.parsed_files.append(os.path.basename(fname))
+        return file_content.splitlines()
+
+    def find_information(self, fname, parsed_file):
+        return [LineCountInfo(fname, len(parsed_file), extractor=self)]
+
+
+class NewLineCountInfoExtractor(LineCountInfoExtractor):
+    version = 2
+
+
+class ExtractorResultCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_root = tempfile.mkdtemp()
+        self.project_dir = tempfile.mkdtemp()
+        self.uut = ExtractorResultCache(self.cache_root)
+        LineCountInfoExtractor.parsed_files = []
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_root)
+        shutil.rmtree(self.project_dir)
+
+    def extract(self, extractor_class=LineCountInfoExtractor,
+                result_cache=None):
+        information = extractor_class(
+            ['**.txt'], self.project_dir,
+            result_cache or self.uut).extract_information()
+        return {fname: [(info.source, info.value, info.extractor)
+                        for info in infos['LineCountInfo']]
+                for fname, infos in information.items()}
+
+    def test_get_result_key(self):
+        key = get_result_key(LineCountInfoExtractor, 'a.txt', 'content')
+        self.assertEqual(len(key), 64)
+        self.assertEqual(
+            key, get_result_key(LineCountInfoExtractor, 'a.txt', 'content'))
+        self.assertNotEqual(
+            key, get_result_key(LineCountInfoExtractor, 'a.txt', 'other'))
+        self.assertNotEqual(
+            key, get_result_key(LineCountInfoExtractor, 'b.txt', 'content'))
+        self.assertNotEqual(
+            key, get_result_key(NewLineCountInfoExtractor, 'a.txt',
+                                'content'))
+
+    def test_get_set(self):
+        self.assertIsNone(self.uut.get('key'))
+
+        info = LineCountInfo('a.txt', 3, extractor=object())
+        self.uut.set('key', [info])
+        cached, = self.uut.get('key')
+        self.assertIsInstance(cached, LineCountInfo)
+        self.assertEqual((cached.source, cached.value), ('a.txt', 3))
+        self.assertIsNone(cached.extractor)
+        self.assertIsNotNone(info.extractor)
+
+        self.assertIsNone(
+            ExtractorResultCache(self.cache_root, rebuild=True).get('key'))
+
+        with open(os.path.join(self.uut.path, 'key'), 'wb') as entry:
+            entry.write(b'corrupt')
+        self.assertIsNone(self.uut.get('key'))
+
+    def test_unpicklable_information(self):
+        class LocalInfo(Info):
+            pass
+
+        with self.assertLogs(level='WARNING'):
+            self.uut.set('key', [LocalInfo('a.txt', 1)])
+        self.assertIsNone(self.uut.get('key'))
+
+    def test_memory_result_cache(self):
+        info = LineCountInfo('a.txt', 3)
+        self.uut.set('disk', [info])
+
+        memory_cache = MemoryResultCache(self.uut)
+        memory_cache.set('memory', [info])
+        self.assertIs(memory_cache.get('memory')[0], info)
+        self.assertIsNotNone(self.uut.get('memory'))
+
+        cached = memory_cache.get('disk')
+        self.assertEqual(cached[0].value, 3)
+        shutil.rmtree(self.uut.path)
+        self.assertIs(memory_cache.get('disk'), cached)
+
+        self.assertIsNone(MemoryResultCache().get('disk'))
+
+    def test_memory_result_cache_bound(self):
+        infos = [LineCountInfo('a.txt', 3)]
+        memory_cache = MemoryResultCache(max_entries=2)
+        memory_cache.set('first', infos)
+        memory_cache.set('second', infos)
+        memory_cache.get('first')
+        memory_cache.set('third', infos)
+
+        # The key used least recently is dropped.
+        self.assertIsNone(memory_cache.get('second'))
+        self.assertIs(memory_cache.get('first'), infos)
+        self.assertIs(memory_cache.get('third'), infos)
+
+        memory_cache.clear()
+        self.assertIsNone(memory_cache.get('first'))
+
+    def test_extract_information(self):
+        with generate_files(['a.txt', 'b.txt'], ['1\n2\n', '1\n'],
+                            self.project_dir):
+            first = self.extract()
+            self.assertEqual(sorted(LineCountInfoExtractor.parsed_files),
+                             ['a.txt', 'b.txt'])
+
+            second = self.extract()
+            self.assertEqual(len(LineCountInfoExtractor.parsed_files), 2)
+            self.assertEqual(
+                {fname: [(source, value) for source, value, _ in infos]
+                 for fname, infos in second.items()},
+                {'a.txt': [('a.txt', 2)], 'b.txt': [('b.txt', 1)]})
+            # The cached information gets the extractor which found it.
+            for fname, infos in second.items():
+                for _, _, extractor in infos:
+                    self.assertIsInstance(extractor, LineCountInfoExtractor)
+            self.assertEqual(first.keys(), second.keys())
+
+            with open(os.path.join(self.project_dir, 'a.txt'), 'w') as file:
+                file.write('1\n2\n3\n')
+            third = self.extract()
+            self.assertEqual(LineCountInfoExtractor.parsed_files[2:],
+                             ['a.txt'])
+            self.assertEqual(third['a.txt'][0][1], 3)
+
+            self.extract(NewLineCountInfoExtractor)
+            self.assertEqual(len(LineCountInfoExtractor.parsed_files), 5)
@@ -1,5 +1,9 @@
 import os
+import shutil
+import tempfile
 import unittest
+import unittest.mock
+from concurrent.futures import ThreadPoolExecutor
 
 from coala_quickstart.info_extraction.Info import Info
 from coala_quickstart.info_extraction.InfoExtractor import InfoExtractor
@@ -276,3 +280,38 @@ class InfoExtractorTest(unittest.TestCase):
 
         uut = self.DummyMultiInfoExtractor
         self.assertEqual(uut.spec_references, [])
+
+    def test_retrieve_files_keeps_cwd(self):
+        project_dir = tempfile.mkdtemp(suffix='[glob]')
+        try:
+            os.mkdir(os.path.join(project_dir, 'target_dir'))
+            with generate_files(['target_file_1', 'another_file'],
+                                ['Some content.', 'More content'],
+                                project_dir), \
+                    unittest.mock.patch('os.chdir') as chdir:
+                self.assertEqual(
+                    sorted(InfoExtractor.retrieve_files(
+                        ['target_**', 'another_file'], project_dir)),
+                    ['another_file', 'target_file_1'])
+                self.assertFalse(chdir.called)
+                self.assertEqual(os.getcwd(), self.current_dir)
+        finally:
+            shutil.rmtree(project_dir)
+
+    def test_retrieve_files_concurrently(self):
+        project_dirs = [tempfile.mkdtemp() for _ in range(4)]
+        try:
+            for index, project_dir in enumerate(project_dirs):
+                with open(os.path.join(project_dir,
+                                       'file{}'.format(index)), 'w'):
+                    pass
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                retrieved = list(executor.map(
+                    InfoExtractor.retrieve_files,
+                    [['file*']] * 4 * 25, project_dirs * 25))
+            self.assertEqual(retrieved,
+                             [['file{}'.format(index)]
+                              for index in range(4)] * 25)
+        finally:
+            for project_dir in project_dirs:
+                shutil.rmtree(project_dir)
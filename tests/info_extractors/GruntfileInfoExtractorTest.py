@@ -1,5 +1,8 @@
 import os
 import unittest
+import unittest.mock
+
+from pyjsparser import PyJsParser
 
 from coala_quickstart.info_extractors.GruntfileInfoExtractor import (
     GruntfileInfoExtractor)
@@ -216,3 +219,85 @@ class GruntfileInfoExtractorTest(unittest.TestCase):
                 tasks_to_match += tasks
             for task in tasks_used:
                 self.assertIn(task, tasks_to_match)
+
+    def extract(self, file_content, extractor_class=GruntfileInfoExtractor):
+        """
+        Extracts the information of a Gruntfile with the given content.
+
+        :return: A tuple of the extracted information as
+                 ``(info name, value, config)`` tuples and the lengths of
+                 the code parsed.
+        """
+        parsed_lengths = []
+        parse = PyJsParser.parse
+
+        def parse_and_record(parser, code):
+            parsed_lengths.append(len(code))
+            return parse(parser, code)
+
+        with generate_files(['Gruntfile.js'], [file_content],
+                            self.current_dir), \
+                unittest.mock.patch.object(PyJsParser, 'parse',
+                                           parse_and_record):
+            extracted_info = extractor_class(
+                ['Gruntfile.js'], self.current_dir).extract_information()
+        return ([(info.name, info.value, getattr(info, 'config', None))
+                 for infos in extracted_info.get('Gruntfile.js', {}).values()
+                 for info in infos],
+                parsed_lengths)
+
+    def test_without_grunt_calls(self):
+        self.assertEqual(
+            self.extract("module.exports = function (grunt) {\n"
+                         "    grunt.log.writeln('nothing to do');\n"
+                         "};\n"),
+            ([], []))
+
+    def test_parse_relevant_statements(self):
+        vendored = ''.join('function vendored{}(x) {{\n'
+                           '    return "}}" + x;\n'
+                           '}}\n'.format(index) for index in range(100))
+        information, parsed_lengths = self.extract(vendored + test_file)
+        self.assertEqual(information, self.extract(test_file)[0])
+        self.assertIn(('MentionedTasksInfo', ['grunt-contrib-concat',
+                                              'grunt-contrib-copy',
+                                              'grunt-contrib-csslint',
+                                              'grunt-contrib-cssmin',
+                                              'grunt-contrib-jshint',
+                                              'grunt-contrib-qunit',
+                                              'grunt-contrib-uglify',
+                                              'grunt-contrib-watch',
+                                              'grunt-jscs'], None),
+                      information)
+        self.assertLess(sum(parsed_lengths), len(test_file))
+
+    def test_unsplittable_statements(self):
+        # The statements are split after the first closing brace, which
+        # can't be parsed on its own.
+        file_content = ('if (process.env.CI) {\n'
+                        '}\n'
+                        'else {\n'
+                        "    grunt.loadNpmTasks('grunt-contrib-jshint');\n"
+                        '}\n'
+                        'function unused() {\n'
+                        '}\n')
+        information, parsed_lengths = self.extract(file_content)
+        self.assertEqual(information, [('MentionedTasksInfo',
+                                        ['grunt-contrib-jshint'], None)])
+        self.assertEqual(parsed_lengths[-1], len(file_content))
+
+    def test_max_parse_size(self):
+        class SmallGruntfileInfoExtractor(GruntfileInfoExtractor):
+            max_parse_size = 1024
+
+        information, parsed_lengths = self.extract(
+            test_file, SmallGruntfileInfoExtractor)
+        self.assertEqual(parsed_lengths, [])
+        lint_tasks = sorted(value for name, value, config in information
+                            if name == 'LintTaskInfo' and config is None)
+        self.assertEqual(lint_tasks,
+                         ['csslint', 'jscs', 'jshint', 'some_lint_task'])
+        self.assertEqual(
+            [info for info in information if info[0] == 'MentionedTasksInfo'],
+            [info for info in self.extract(test_file)[0]
+             if info[0] == 'MentionedTasksInfo'])
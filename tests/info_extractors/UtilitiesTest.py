@@ -139,3 +139,40 @@ class UtititiesTest(unittest.TestCase):
                                 }
                               ],
                               [("key2", "key1.1"), ("key1", "key1.1")])
+
+    def test_search_deeply_nested_object(self):
+        deep_dict = leaf = {}
+        for _ in range(10000):
+            leaf['child'] = [{}]
+            leaf = leaf['child'][0]
+        leaf['key'] = 'value'
+
+        result, = Utilities.search_object_recursively(deep_dict, 'key')
+        self.assertEqual(result['object'], 'value')
+        self.assertEqual(len(result['path']), 20001)
+
+    def test_search_unsupported_type(self):
+        with self.assertRaises(TypeError):
+            Utilities.search_object_recursively(['value'], 'key')
+
+        results = Utilities.iter_search_object(
+            [{'key': 'value'}, 'value'], [('key', None)])
+        self.assertEqual(next(results)[1]['path'], (0, 'key'))
+        with self.assertRaises(TypeError):
+            next(results)
+
+    def test_search_object_patterns(self):
+        patterns = {'key1.1': ('key1.1', None),
+                    'repeated': ('key1.1', 'value1.1'),
+                    'key1': ('key1', None),
+                    'key_b_1': ('key_b_1', 'value_b_1')}
+        for search_object in (self.nested_dict,
+                              self.nested_dict_with_list,
+                              self.dict_with_repeated_structure):
+            results = Utilities.search_object_patterns(search_object,
+                                                       patterns)
+            for name, (key, value) in patterns.items():
+                self.assertEqual(
+                    results[name],
+                    Utilities.search_object_recursively(search_object, key,
+                                                        value))